@@ -1,17 +1,29 @@
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Query, HTTPException, Header
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from typing import Dict, Any
-from datetime import datetime
+import hashlib
+from datetime import date, datetime
 from sqlalchemy import text
 
-from config import ASSETS, ASSETS_DICT
+from config import ASSETS, ASSETS_DICT, API_KEYS, BACKFILL_YEARS
 from managers.assets_manager import (
     get_current_price_db,
-    update_prices_efficiently,
-    calculate_variations,
+    update_prices_async,
     get_asset_prices_and_variations,
     update_single_price
 )
-from services.yahoo_finance import get_current_price as yahoo_get_current_price
+from managers.alerts_manager import count_alerts_by_bucket, get_alerts_page
+from managers.backfill_manager import backfill_prices
+from managers.candles_manager import get_candles
+from managers.export_manager import EXPORT_FORMATS, iter_price_history
+from managers.intraday_manager import get_intraday_prices
+from managers.price_cache import price_cache
+from managers.price_matrix import calculate_correlations, calculate_variations_range
+from managers.variations_manager import get_materialized_variations, rebuild_variations
+from managers.rolling_stats import rolling_stats
+from managers.rules_manager import add_rule, delete_rule, list_rules
+from services.price_providers import get_price_provider
 from db.database import SessionLocal
 
 # Define the router with the specific name 'router'
@@ -24,11 +36,12 @@ router = APIRouter(
 
 @router.get("/assets", response_model=Dict[str, Any])
 async def get_assets(
-        force_update: bool = Query(True, description="Force price update from Yahoo Finance"),
+        force_update: bool = Query(False, description="Force price update from Yahoo Finance"),
 ):
     """
     Gets all asset prices and their variations.
-    Updates prices every time it's called if force_update=True (default).
+    Prices are served from the database, which the background scheduler keeps
+    up to date; force_update=True refreshes them first.
 
     Args:
     ----
@@ -38,17 +51,49 @@ async def get_assets(
     -------
         Dictionary containing current prices and variations for all assets.
     """
-    # This endpoint automatically updates prices from Yahoo Finance
-    return get_asset_prices_and_variations(force_update=force_update)
+    return await run_in_threadpool(get_asset_prices_and_variations, force_update)
+
+
+def _fetch_and_store_price(symbol: str) -> float | None:
+    # Fetches the current price of an asset from the provider and stores it for today
+    price = get_price_provider().get_current_price(symbol)
+    if price is not None:
+        update_single_price(symbol, price, datetime.now().strftime('%Y-%m-%d'))
+    return price
+
+
+def _current_prices(force_update: bool) -> Dict[str, Dict[str, Any]]:
+    result = {}
+    provider = get_price_provider()
+
+    for symbol in ASSETS:
+        name = ASSETS_DICT.get(symbol, symbol)
+        asset_data = {"name": name}
+
+        # If we should update, get direct price from the price provider
+        price = _fetch_and_store_price(symbol) if force_update else None
+        if price is not None:
+            asset_data["price"] = price
+            asset_data["source"] = provider.name
+            asset_data["updated"] = True
+        else:
+            # Get directly from database, also as fallback of a failed update
+            asset_data["price"] = get_current_price_db(symbol)
+            asset_data["source"] = "database"
+            asset_data["updated"] = False
+
+        result[symbol] = asset_data
+
+    return result
 
 
 @router.get("/prices", response_model=Dict[str, Dict[str, Any]])
 async def get_current_prices(
-        force_update: bool = Query(True, description="Force price update from Yahoo Finance"),
+        force_update: bool = Query(False, description="Force price update from Yahoo Finance"),
 ):
     """
-    Gets current asset prices, querying them directly from Yahoo Finance
-    if force_update is True.
+    Gets current asset prices from the database, querying them directly
+    from the price provider if force_update is True.
 
     Args:
     ----
@@ -58,38 +103,72 @@ async def get_current_prices(
     -------
         Dictionary containing current prices for all assets with metadata.
     """
-    result = {}
+    # Upstream requests (with retry backoff) and writes run off the event loop
+    return await run_in_threadpool(_current_prices, force_update)
 
-    for symbol in ASSETS:
-        name = ASSETS_DICT.get(symbol, symbol)
-        asset_data = {"name": name}
 
-        # If we should update, get direct price from Yahoo
-        if force_update:
-            price = yahoo_get_current_price(symbol)
-            if price is not None:
-                # Save to database
-                today = datetime.now().strftime('%Y-%m-%d')
-                update_single_price(symbol, price, today)
-                asset_data["price"] = price
-                asset_data["source"] = "yahoo_finance"
-                asset_data["updated"] = True
-            else:
-                # Try to get from database as fallback
-                db_price = get_current_price_db(symbol)
-                asset_data["price"] = db_price
-                asset_data["source"] = "database"
-                asset_data["updated"] = False
-        else:
-            # Get directly from database
-            db_price = get_current_price_db(symbol)
-            asset_data["price"] = db_price
-            asset_data["source"] = "database"
-            asset_data["updated"] = False
+@router.get("/variations", response_model=Dict[str, Any])
+async def get_variations_table(
+        days: str = Query("1,7,30", description="Comma-separated horizons in days (e.g. 1,7,30,90,365)"),
+        start: date | None = Query(None, alias="from", description="Start date of an explicit range (YYYY-MM-DD)"),
+        end: date | None = Query(None, alias="to", description="End date of the variations (default: today)"),
+):
+    """
+    Gets price variations of all assets for several horizons, and optionally
+    between two explicit dates, in a single response.
 
-        result[symbol] = asset_data
+    Args:
+    ----
+        days: Comma-separated numbers of days for the variation calculation.
+        start: Start date of the explicit range.
+        end: End date the horizons are measured back from.
 
-    return result
+    Returns:
+    -------
+        Dictionary containing the prices as of the end date and the variations of each asset.
+    """
+    try:
+        horizons = [int(value) for value in days.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Days must be a comma-separated list of integers")
+
+    if not horizons or any(horizon <= 0 for horizon in horizons):
+        raise HTTPException(status_code=400, detail="Number of days must be greater than zero")
+
+    end = end or datetime.now().date()
+    if start is not None and start > end:
+        raise HTTPException(status_code=400, detail="From date must be before to date")
+
+    data = await run_in_threadpool(calculate_variations_range, ASSETS, horizons, start, end)
+
+    assets = {symbol: {"name": ASSETS_DICT.get(symbol, symbol), **values} for symbol, values in data.items()}
+    return {
+        "from": start.isoformat() if start else None,
+        "to": end.isoformat(),
+        "days": horizons,
+        "assets": assets,
+    }
+
+
+@router.get("/correlations", response_model=Dict[str, Any])
+async def get_correlations(
+        days: int = Query(90, description="Number of days of daily returns to correlate"),
+):
+    """
+    Gets the pairwise correlation and covariance matrices of the daily returns of all assets.
+
+    Args:
+    ----
+        days: Number of days of history to consider.
+
+    Returns:
+    -------
+        Dictionary containing the correlation and covariance of every pair of assets.
+    """
+    if days <= 0:
+        raise HTTPException(status_code=400, detail="Number of days must be greater than zero")
+
+    return await run_in_threadpool(calculate_correlations, ASSETS, days)
 
 
 @router.get("/variations/{days}", response_model=Dict[str, Dict[str, Any]])
@@ -115,10 +194,10 @@ async def get_variations(
 
     # Update current prices if necessary
     if force_update:
-        update_prices_efficiently(force_update=True)
+        await update_prices_async(force_update=True)
 
-    # Calculate variations
-    variations_data = calculate_variations(ASSETS, days)
+    # Read precomputed variations
+    variations_data = (await run_in_threadpool(get_materialized_variations, ASSETS, [days]))[days]
 
     # Convert to dictionary with descriptive names
     variations = {}
@@ -135,6 +214,18 @@ async def get_variations(
     return variations
 
 
+@router.post("/variations/rebuild", response_model=Dict[str, Any])
+async def rebuild_materialized_variations():
+    """
+    Recomputes every materialized variation from the stored prices.
+
+    Returns:
+    -------
+        Dictionary containing rebuild operation results.
+    """
+    return await run_in_threadpool(rebuild_variations)
+
+
 @router.post("/update", response_model=Dict[str, Any])
 async def force_update_prices():
     """
@@ -144,14 +235,336 @@ async def force_update_prices():
     -------
         Dictionary containing update operation results.
     """
-    result = update_prices_efficiently(force_update=True)
+    result = await update_prices_async(force_update=True)
     return result
 
 
+@router.post("/backfill", response_model=Dict[str, Any])
+async def backfill_history(
+        symbol: str | None = Query(None, description="Symbol to backfill (default: all assets)"),
+        years: int = Query(BACKFILL_YEARS, description="Years of history for assets without stored prices"),
+):
+    """
+    Backfills daily price history, resuming from the last stored date of each asset.
+
+    Args:
+    ----
+        symbol: Asset symbol to backfill, or None for all assets.
+        years: Years of history to retrieve for assets without stored prices.
+
+    Returns:
+    -------
+        Dictionary containing backfill operation results.
+    """
+    if years <= 0:
+        raise HTTPException(status_code=400, detail="Number of years must be greater than zero")
+
+    if symbol is not None and symbol not in ASSETS:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Symbol '{symbol}' not found. Available symbols: {', '.join(ASSETS)}"
+        )
+
+    symbols = [symbol] if symbol else None
+    return await run_in_threadpool(backfill_prices, symbols, years)
+
+
+def _export_response(symbols: list[str] | None, export_format: str, start: date | None, end: date | None,
+                     filename: str) -> StreamingResponse:
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Format must be one of: {', '.join(EXPORT_FORMATS)}")
+
+    if start is not None and end is not None and start > end:
+        raise HTTPException(status_code=400, detail="From date must be before to date")
+
+    rows = iter_price_history(
+        symbols,
+        start.isoformat() if start else None,
+        end.isoformat() if end else None,
+        export_format,
+    )
+    return StreamingResponse(
+        rows,
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'},
+    )
+
+
+@router.get("/history/export")
+async def export_history(
+        export_format: str = Query("csv", alias="format", description="Export format: csv or ndjson"),
+        symbols: str | None = Query(None, description="Comma-separated symbols (default: all stored assets)"),
+        start: date | None = Query(None, alias="from", description="First date to export (YYYY-MM-DD)"),
+        end: date | None = Query(None, alias="to", description="Last date to export (YYYY-MM-DD)"),
+):
+    """
+    Streams the stored price history of several assets as CSV or NDJSON.
+
+    Args:
+    ----
+        export_format: Export format (csv or ndjson).
+        symbols: Comma-separated asset symbols, or None for every stored asset.
+        start: First date to export.
+        end: Last date to export.
+
+    Returns:
+    -------
+        Streaming response with one row per stored price, ordered by symbol and date.
+    """
+    selected = [symbol.strip() for symbol in symbols.split(",") if symbol.strip()] if symbols else None
+    return _export_response(selected, export_format, start, end, "history")
+
+
+@router.get("/history/{symbol}/export")
+async def export_symbol_history(
+        symbol: str,
+        export_format: str = Query("csv", alias="format", description="Export format: csv or ndjson"),
+        start: date | None = Query(None, alias="from", description="First date to export (YYYY-MM-DD)"),
+        end: date | None = Query(None, alias="to", description="Last date to export (YYYY-MM-DD)"),
+):
+    """
+    Streams the stored price history of a symbol as CSV or NDJSON.
+
+    Args:
+    ----
+        symbol: Asset symbol (e.g. 'BTC-USD').
+        export_format: Export format (csv or ndjson).
+        start: First date to export.
+        end: Last date to export.
+
+    Returns:
+    -------
+        Streaming response with one row per stored price, ordered by date.
+    """
+    if symbol not in ASSETS:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Symbol '{symbol}' not found. Available symbols: {', '.join(ASSETS)}"
+        )
+
+    return _export_response([symbol], export_format, start, end, f"history_{symbol}")
+
+
+@router.get("/intraday/{symbol}", response_model=Dict[str, Any])
+async def get_intraday(
+        symbol: str,
+        start: int | None = Query(None, description="Start of the range (epoch seconds, default: 24 hours ago)"),
+        end: int | None = Query(None, description="End of the range (epoch seconds, default: now)"),
+):
+    """
+    Gets the intraday price observations of a symbol within a time range.
+
+    Args:
+    ----
+        symbol: Asset symbol (e.g. 'BTC-USD').
+        start: Start of the range in epoch seconds.
+        end: End of the range in epoch seconds.
+
+    Returns:
+    -------
+        Dictionary containing the timestamped prices of the symbol.
+    """
+    if symbol not in ASSETS:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Symbol '{symbol}' not found. Available symbols: {', '.join(ASSETS)}"
+        )
+
+    end = end if end is not None else int(datetime.now().timestamp())
+    start = start if start is not None else end - 24 * 3600
+    if start > end:
+        raise HTTPException(status_code=400, detail="Start must be before end")
+
+    prices = await run_in_threadpool(get_intraday_prices, symbol, start, end)
+    return {"symbol": symbol, "start": start, "end": end, "prices": prices}
+
+
+@router.get("/candles/{symbol}", response_model=Dict[str, Any])
+async def get_symbol_candles(
+        symbol: str,
+        interval: str = Query("1w", description="Candle interval: 1w, 1mo or 1q"),
+):
+    """
+    Gets the stored prices of a symbol aggregated into open/high/low/close candles.
+
+    Args:
+    ----
+        symbol: Asset symbol (e.g. 'BTC-USD').
+        interval: Candle interval (1w=weekly, 1mo=monthly, 1q=quarterly).
+
+    Returns:
+    -------
+        Dictionary containing the candles of the symbol, ordered by bucket start date.
+    """
+    if symbol not in ASSETS:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Symbol '{symbol}' not found. Available symbols: {', '.join(ASSETS)}"
+        )
+
+    if interval not in ("1w", "1mo", "1q"):
+        raise HTTPException(status_code=400, detail="Interval must be one of: 1w, 1mo, 1q")
+
+    candles = await run_in_threadpool(get_candles, symbol, interval)
+    return {"symbol": symbol, "interval": interval, "candles": candles}
+
+
+@router.get("/stats/{symbol}", response_model=Dict[str, Any])
+async def get_rolling_stats(symbol: str):
+    """
+    Gets the rolling statistics (mean, standard deviation, volatility, min and max)
+    of a symbol over the configured windows.
+
+    Args:
+    ----
+        symbol: Asset symbol (e.g. 'BTC-USD').
+
+    Returns:
+    -------
+        Dictionary containing the statistics of each window, keyed by window length in days.
+    """
+    if symbol not in ASSETS:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Symbol '{symbol}' not found. Available symbols: {', '.join(ASSETS)}"
+        )
+
+    stats = await run_in_threadpool(rolling_stats.get_stats, symbol)
+    return {"symbol": symbol, "name": ASSETS_DICT.get(symbol, symbol), "windows": stats}
+
+
+def _rule_owner(api_key: str) -> str:
+    # Rules are owned by a hash of the key, so stored rules never reveal it
+    if not api_key or (API_KEYS and api_key not in API_KEYS):
+        raise HTTPException(status_code=401, detail="Invalid API key")
+    return f"api:{hashlib.sha256(api_key.encode()).hexdigest()[:16]}"
+
+
+@router.get("/alerts", response_model=Dict[str, Any])
+async def get_alerts(
+        since: datetime | None = Query(None, description="Earliest alert date (inclusive, UTC by default)"),
+        until: datetime | None = Query(None, description="Latest alert date (exclusive, UTC by default)"),
+        symbol: str | None = Query(None, description="Asset symbol to filter by"),
+        cursor: str | None = Query(None, description="Cursor returned with the previous page"),
+        limit: int = Query(100, ge=1, le=1000, description="Maximum number of alerts per page"),
+        bucket: str | None = Query(None, description="Count alerts per bucket instead: hour or day"),
+):
+    """
+    Gets stored alerts, newest first, one page at a time, or their number per
+    hour or day when a bucket is given.
+
+    Args:
+    ----
+        since: Earliest alert date.
+        until: Latest alert date.
+        symbol: Asset symbol to filter by.
+        cursor: Cursor of the page to get (default: first page).
+        limit: Maximum number of alerts per page.
+        bucket: Bucket size for the aggregation mode (hour or day).
+
+    Returns:
+    -------
+        Dictionary containing the alerts of the page and the next page cursor, or the
+        number of alerts of each bucket.
+    """
+    if since is not None and until is not None and since > until:
+        raise HTTPException(status_code=400, detail="Since must be before until")
+
+    if bucket is not None:
+        if bucket not in ("hour", "day"):
+            raise HTTPException(status_code=400, detail="Bucket must be one of: hour, day")
+        buckets = await run_in_threadpool(count_alerts_by_bucket, bucket, since, until, symbol)
+        return {"bucket": bucket, "buckets": buckets}
+
+    try:
+        return await run_in_threadpool(get_alerts_page, since, until, symbol, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/rules", response_model=Dict[str, Any])
+async def get_rules(api_key: str = Header("", alias="X-API-Key")):
+    """
+    Lists the alert rules subscribed with an API key.
+
+    Args:
+    ----
+        api_key: API key sent in the X-API-Key header.
+
+    Returns:
+    -------
+        Dictionary containing the rules of the API key.
+    """
+    owner = _rule_owner(api_key)
+    return {"rules": await run_in_threadpool(list_rules, owner)}
+
+
+@router.post("/rules", response_model=Dict[str, Any])
+async def create_rule(
+        symbol: str = Query(..., description="Asset symbol (e.g. 'BTC-USD')"),
+        days: int = Query(..., description="Number of days of the variation"),
+        direction: str = Query(..., description="Direction of the variation: up or down"),
+        threshold: float = Query(..., description="Percentage the variation must exceed"),
+        api_key: str = Header("", alias="X-API-Key"),
+):
+    """
+    Subscribes an API key to an alert rule.
+
+    Args:
+    ----
+        symbol: Asset symbol.
+        days: Number of days of the variation.
+        direction: Direction of the variation (up or down).
+        threshold: Percentage the variation must exceed.
+        api_key: API key sent in the X-API-Key header.
+
+    Returns:
+    -------
+        Dictionary containing the stored rule.
+    """
+    owner = _rule_owner(api_key)
+    try:
+        return await run_in_threadpool(add_rule, owner, symbol, days, direction, threshold)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.delete("/rules/{rule_id}", response_model=Dict[str, Any])
+async def remove_rule(rule_id: int, api_key: str = Header("", alias="X-API-Key")):
+    """
+    Unsubscribes an API key from one of its alert rules.
+
+    Args:
+    ----
+        rule_id: Id of the rule.
+        api_key: API key sent in the X-API-Key header.
+
+    Returns:
+    -------
+        Dictionary confirming the deletion.
+    """
+    owner = _rule_owner(api_key)
+    if not await run_in_threadpool(delete_rule, owner, rule_id):
+        raise HTTPException(status_code=404, detail=f"Rule {rule_id} not found")
+    return {"id": rule_id, "deleted": True}
+
+
+@router.get("/cache/stats", response_model=Dict[str, Any])
+async def get_cache_stats():
+    """
+    Gets the hit/miss counters of the in-memory price cache.
+
+    Returns:
+    -------
+        Dictionary containing cache effectiveness counters.
+    """
+    return price_cache.stats()
+
+
 @router.get("/latest/{symbol}", response_model=Dict[str, Any])
 async def get_latest_price(
         symbol: str,
-        force_update: bool = Query(True, description="Get price directly from Yahoo Finance"),
+        force_update: bool = Query(False, description="Get price directly from Yahoo Finance"),
 ):
     """
     Gets the most recent price for a specific symbol.
@@ -177,13 +590,10 @@ async def get_latest_price(
 
     # Get updated price if necessary
     if force_update:
-        price = yahoo_get_current_price(symbol)
+        price = await run_in_threadpool(_fetch_and_store_price, symbol)
         if price is not None:
-            # Save to database
-            today = datetime.now().strftime('%Y-%m-%d')
-            update_single_price(symbol, price, today)
             result["price"] = price
-            result["source"] = "yahoo_finance"
+            result["source"] = get_price_provider().name
             result["timestamp"] = datetime.now().isoformat()
             return result
 
@@ -1,36 +1,33 @@
-from telegram import Bot
-from telegram.error import TelegramError
 from loguru import logger
 from config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
+from bot.dispatcher import get_dispatcher
 
 
-async def send_telegram_message(message: str) -> bool:
+async def send_telegram_message(message: str, chat_id: int | str | None = None) -> bool:
     """
-    Sends a message to a Telegram chat.
-    Requires both TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID to be configured.
+    Sends a message to a Telegram chat through the shared dispatcher, which
+    batches and rate-limits delivery in the background.
+    Requires TELEGRAM_BOT_TOKEN, and TELEGRAM_CHAT_ID when no chat is given.
 
     Args:
     ----
         message: The message to send.
+        chat_id: Chat to send the message to (default: TELEGRAM_CHAT_ID).
 
     Returns:
     -------
-        True if message was sent successfully, False otherwise.
+        True if the message was queued for delivery, False otherwise.
     """
     if not TELEGRAM_BOT_TOKEN:
         logger.error("TELEGRAM_BOT_TOKEN is not configured")
         return False
 
-    if not TELEGRAM_CHAT_ID:
+    chat_id = chat_id or TELEGRAM_CHAT_ID
+    if not chat_id:
         logger.warning("TELEGRAM_CHAT_ID is not configured. Cannot send automatic alerts.")
         logger.info("Users can get their Chat ID by sending /chatid to the bot.")
         return False
 
-    try:
-        bot = Bot(token=TELEGRAM_BOT_TOKEN)
-        await bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message)
-        logger.info(f"Telegram message sent: {message[:50]}...")
-        return True
-    except TelegramError as e:
-        logger.error(f"Error sending Telegram message: {e}")
-        return False
+    get_dispatcher().send(chat_id, message)
+    logger.info(f"Telegram message queued: {message[:50]}...")
+    return True
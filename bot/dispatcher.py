@@ -0,0 +1,267 @@
+import asyncio
+import atexit
+import threading
+from collections import defaultdict
+from typing import List, Dict, Any
+
+import httpx
+from loguru import logger
+
+from config import (
+    ASSETS_DICT,
+    TELEGRAM_API_BASE,
+    TELEGRAM_BATCH_SECONDS,
+    TELEGRAM_BOT_TOKEN,
+    TELEGRAM_CHAT_ID,
+    TELEGRAM_CHAT_RATE,
+    TELEGRAM_GLOBAL_RATE,
+    TELEGRAM_MAX_RETRIES,
+)
+from utils.rate_limiter import TokenBucket
+
+# Maximum length of a Telegram message
+MAX_MESSAGE_LENGTH = 4096
+
+
+def _batch_texts(texts: List[str]) -> List[str]:
+    # Joins texts into as few messages as fit Telegram's length limit
+    batches = []
+    current = ""
+    for text in texts:
+        text = text[:MAX_MESSAGE_LENGTH]
+        if current and len(current) + 2 + len(text) > MAX_MESSAGE_LENGTH:
+            batches.append(current)
+            current = ""
+        current = f"{current}\n\n{text}" if current else text
+    if current:
+        batches.append(current)
+    return batches
+
+
+class TelegramDispatcher:
+    """
+    Asynchronous Telegram message queue running on its own event loop thread.
+
+    Messages are enqueued without blocking the caller. The messages pending for a
+    chat are gathered for `batch_seconds` and sent as one message, through a single
+    reused HTTP client, throttled by a global and a per-chat token bucket. Rate
+    limit responses are retried after the delay requested by Telegram.
+
+    Attributes:
+    ----------
+        api_base: Base URL of the Telegram Bot API.
+        batch_seconds: Time the messages of a chat are gathered before sending.
+        max_retries: Attempts per message.
+        sent: Number of messages delivered.
+        failed: Number of messages given up after all attempts.
+    """
+
+    def __init__(
+            self,
+            token: str,
+            api_base: str = TELEGRAM_API_BASE,
+            global_rate: float = TELEGRAM_GLOBAL_RATE,
+            chat_rate: float = TELEGRAM_CHAT_RATE,
+            batch_seconds: float = TELEGRAM_BATCH_SECONDS,
+            max_retries: int = TELEGRAM_MAX_RETRIES,
+    ):
+        self.api_base = api_base.rstrip("/")
+        self.batch_seconds = batch_seconds
+        self.max_retries = max_retries
+        self.sent = 0
+        self.failed = 0
+        self._token = token
+        self._global_rate = global_rate
+        self._chat_rate = chat_rate
+        self._pending: Dict[str, List[str]] = defaultdict(list)
+        self._senders: Dict[str, asyncio.Task] = {}
+        self._chat_buckets: Dict[str, TokenBucket] = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="telegram-dispatcher", daemon=True)
+        self._ready = threading.Event()
+
+    def start(self) -> None:
+        """
+        Starts the dispatcher thread and its HTTP client.
+        """
+        self._thread.start()
+        self._ready.wait()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._client = httpx.AsyncClient(base_url=f"{self.api_base}/bot{self._token}", timeout=10)
+        self._global_bucket = TokenBucket(self._global_rate, burst=max(1, int(self._global_rate)))
+        self._ready.set()
+
+        self._loop.run_forever()
+
+        self._loop.run_until_complete(self._client.aclose())
+        self._loop.close()
+
+    def send(self, chat_id: int | str, text: str) -> None:
+        """
+        Enqueues a message for a chat. Returns immediately.
+
+        Args:
+        ----
+            chat_id: Telegram chat id.
+            text: Message text.
+
+        Returns:
+        -------
+            None
+        """
+        self._loop.call_soon_threadsafe(self._enqueue, str(chat_id), text)
+
+    def _enqueue(self, chat_id: str, text: str) -> None:
+        self._pending[chat_id].append(text)
+        if chat_id not in self._senders:
+            self._senders[chat_id] = self._loop.create_task(self._drain_chat(chat_id))
+
+    async def _drain_chat(self, chat_id: str) -> None:
+        try:
+            await asyncio.sleep(self.batch_seconds)
+            bucket = self._chat_buckets.setdefault(chat_id, TokenBucket(self._chat_rate))
+
+            # Messages enqueued while waiting for a token join the next batch
+            while self._pending.get(chat_id):
+                await bucket.acquire()
+                for position, batch in enumerate(_batch_texts(self._pending.pop(chat_id))):
+                    if position:
+                        await bucket.acquire()
+                    await self._global_bucket.acquire()
+                    await self._send_message(chat_id, batch)
+        except Exception as e:
+            logger.error(f"Error dispatching Telegram messages to chat {chat_id}: {e}")
+        finally:
+            del self._senders[chat_id]
+
+    async def _send_message(self, chat_id: str, text: str) -> bool:
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                response = await self._client.post("/sendMessage", json={"chat_id": chat_id, "text": text})
+
+                if response.status_code == 429:
+                    retry_after = response.json().get("parameters", {}).get("retry_after", 1)
+                    logger.warning(f"Telegram rate limit for chat {chat_id}, retrying after {retry_after}s")
+                    await asyncio.sleep(retry_after)
+                    continue
+
+                response.raise_for_status()
+                self.sent += 1
+                return True
+            except httpx.HTTPStatusError as e:
+                # Other client errors (unknown chat, blocked bot) do not succeed on retry
+                logger.error(f"Telegram rejected message to chat {chat_id}: {e.response.text}")
+                if e.response.status_code < 500:
+                    break
+            except httpx.HTTPError as e:
+                logger.warning(f"Error sending Telegram message to chat {chat_id} (attempt {attempt}): {e}")
+
+            if attempt < self.max_retries:
+                await asyncio.sleep(2 ** (attempt - 1))
+
+        self.failed += 1
+        return False
+
+    async def _wait_idle(self) -> None:
+        while self._senders:
+            await asyncio.gather(*self._senders.values(), return_exceptions=True)
+
+    def flush(self, timeout: float | None = None) -> None:
+        """
+        Waits until every enqueued message has been sent or given up.
+
+        Args:
+        ----
+            timeout: Maximum seconds to wait (default: no limit).
+
+        Returns:
+        -------
+            None
+        """
+        asyncio.run_coroutine_threadsafe(self._wait_idle(), self._loop).result(timeout)
+
+    def stop(self, timeout: float | None = 10) -> None:
+        """
+        Sends the pending messages, then stops the dispatcher thread.
+
+        Args:
+        ----
+            timeout: Maximum seconds to wait for pending messages.
+
+        Returns:
+        -------
+            None
+        """
+        if not self._thread.is_alive():
+            return
+        try:
+            self.flush(timeout)
+        except Exception as e:
+            logger.warning(f"Telegram messages still pending at shutdown: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+
+
+_dispatcher: TelegramDispatcher | None = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> TelegramDispatcher | None:
+    """
+    Returns the shared Telegram dispatcher, starting it on first use.
+
+    Returns:
+    -------
+        The dispatcher, or None if TELEGRAM_BOT_TOKEN is not configured.
+    """
+    global _dispatcher
+
+    if not TELEGRAM_BOT_TOKEN:
+        return None
+
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = TelegramDispatcher(TELEGRAM_BOT_TOKEN)
+            _dispatcher.start()
+            atexit.register(_dispatcher.stop)
+            logger.info("Telegram dispatcher started")
+        return _dispatcher
+
+
+def dispatch_alerts(alerts: List[Dict[str, Any]], dispatcher: TelegramDispatcher | None = None) -> int:
+    """
+    Enqueues stored alerts for their subscribers: rules subscribed from a chat go to
+    that chat and default rules to TELEGRAM_CHAT_ID. Returns without waiting for delivery.
+
+    Args:
+    ----
+        alerts: Alerts returned by the alert evaluation, with the owner of their rule.
+        dispatcher: Dispatcher to use (default: the shared one).
+
+    Returns:
+    -------
+        Number of messages enqueued.
+    """
+    dispatcher = dispatcher or get_dispatcher()
+    if dispatcher is None:
+        return 0
+
+    enqueued = 0
+    for alert in alerts:
+        owner = alert.get("owner")
+        if owner is None:
+            chat_id = TELEGRAM_CHAT_ID
+        elif owner.startswith("chat:"):
+            chat_id = owner[len("chat:"):]
+        else:
+            # Rules subscribed through the API have no chat to deliver to
+            chat_id = None
+
+        if chat_id:
+            name = ASSETS_DICT.get(alert["symbol"], alert["symbol"])
+            dispatcher.send(chat_id, f"{name} ({alert['symbol']}): {alert['message']}")
+            enqueued += 1
+
+    return enqueued
@@ -3,10 +3,11 @@ from config import TELEGRAM_BOT_TOKEN, ASSETS_DICT
 from managers.assets_manager import (
     get_current_price_db,
     update_prices_efficiently,
-    calculate_variations,
     update_single_price
 )
-from services.yahoo_finance import get_current_price as yahoo_get_current_price
+from managers.rules_manager import add_rule, delete_rule, list_rules
+from managers.variations_manager import get_materialized_variations
+from services.price_providers import get_price_provider
 from loguru import logger
 from datetime import datetime
 
@@ -34,29 +35,22 @@ def setup_bot_handlers(bot: telebot.TeleBot):
                      "/monthly - Variaciones mensuales de precios.\n"
                      "/update - Actualizar precios en la base de datos.\n"
                      "/alerts - Ver alertas generadas en las últimas 24 horas.\n"
+                     "/stats SÍMBOLO - Estadísticas móviles de un activo.\n"
+                     "/subscribe SÍMBOLO DÍAS up|down UMBRAL - Crear una regla de alerta.\n"
+                     "/rules - Ver tus reglas de alerta.\n"
+                     "/unsubscribe ID - Eliminar una regla de alerta.\n"
                      )
 
     @bot.message_handler(commands=['assets'])
     def assets(message):
-        bot.reply_to(message, "Obteniendo precios actuales desde Yahoo Finance...")
-
         response = []
         for symbol, name in ASSETS_DICT.items():
-            # Get direct price from Yahoo Finance
-            price = yahoo_get_current_price(symbol)
-
-            if price is not None:
-                # Save to database
-                today = datetime.now().strftime('%Y-%m-%d')
-                update_single_price(symbol, price, today)
-                response.append(f"{name}: {price:.2f} USD")
+            # Prices are kept up to date by the background scheduler
+            db_price = get_current_price_db(symbol)
+            if db_price is not None:
+                response.append(f"{name}: {db_price:.2f} USD")
             else:
-                # Try to get from database
-                db_price = get_current_price_db(symbol)
-                if db_price is not None:
-                    response.append(f"{name}: {db_price:.2f} USD (de la base de datos)")
-                else:
-                    response.append(f"{name}: Precio no disponible.")
+                response.append(f"{name}: Precio no disponible.")
 
         bot.reply_to(message, "\n".join(response))
 
@@ -108,7 +102,7 @@ def setup_bot_handlers(bot: telebot.TeleBot):
         try:
             bot.reply_to(message, "Calculando variaciones diarias...")
 
-            variations = calculate_variations(list(ASSETS_DICT.keys()), 1)
+            variations = get_materialized_variations(list(ASSETS_DICT.keys()), [1])[1]
 
             messages = []
             for var in variations:
@@ -136,7 +130,7 @@ def setup_bot_handlers(bot: telebot.TeleBot):
         try:
             bot.reply_to(message, "Calculando variaciones semanales...")
 
-            variations = calculate_variations(list(ASSETS_DICT.keys()), 7)
+            variations = get_materialized_variations(list(ASSETS_DICT.keys()), [7])[7]
 
             messages = []
             for var in variations:
@@ -164,7 +158,7 @@ def setup_bot_handlers(bot: telebot.TeleBot):
         try:
             bot.reply_to(message, "Calculando variaciones mensuales...")
 
-            variations = calculate_variations(list(ASSETS_DICT.keys()), 30)
+            variations = get_materialized_variations(list(ASSETS_DICT.keys()), [30])[30]
 
             messages = []
             for var in variations:
@@ -187,6 +181,89 @@ def setup_bot_handlers(bot: telebot.TeleBot):
             logger.error(f"Error calculating monthly variations: {e}")
             bot.reply_to(message, f"Error al calcular variaciones: {str(e)}")
 
+    @bot.message_handler(commands=['stats'])
+    def stats_cmd(message):
+        from managers.rolling_stats import rolling_stats
+
+        parts = message.text.split()
+
+        if len(parts) < 2:
+            bot.reply_to(message, "Por favor, especifica un símbolo. Ejemplo: /stats BTC-USD")
+            return
+
+        symbol = parts[1].upper()
+
+        if symbol not in ASSETS_DICT:
+            symbols_list = ", ".join(ASSETS_DICT.keys())
+            bot.reply_to(message, f"Símbolo no reconocido. Símbolos disponibles: {symbols_list}")
+            return
+
+        try:
+            messages = [f"Estadísticas de {ASSETS_DICT[symbol]}:"]
+            for days, window in rolling_stats.get_stats(symbol).items():
+                if window["count"] == 0:
+                    messages.append(f"{days} días: Datos insuficientes.")
+                    continue
+
+                volatility = f"{window['volatility']:.2f}%" if window["volatility"] is not None else "N/A"
+                messages.append(
+                    f"{days} días: media {window['mean']:.2f} USD, volatilidad {volatility}, "
+                    f"mín {window['min']:.2f} USD, máx {window['max']:.2f} USD"
+                )
+
+            bot.reply_to(message, "\n".join(messages))
+        except Exception as e:
+            logger.error(f"Error getting rolling statistics: {e}")
+            bot.reply_to(message, f"Error al obtener estadísticas: {str(e)}")
+
+    @bot.message_handler(commands=['subscribe'])
+    def subscribe_cmd(message):
+        # Extract the rule from message (e.g. /subscribe GC=F 7 up 3)
+        parts = message.text.split()
+
+        if len(parts) != 5:
+            bot.reply_to(message, "Uso: /subscribe SÍMBOLO DÍAS up|down UMBRAL. Ejemplo: /subscribe GC=F 7 up 3")
+            return
+
+        try:
+            rule = add_rule(f"chat:{message.chat.id}", parts[1], int(parts[2]), parts[3], float(parts[4]))
+        except ValueError as e:
+            bot.reply_to(message, f"Regla no válida: {str(e)}")
+            return
+
+        direction = "subida" if rule["direction"] == "increase" else "bajada"
+        bot.reply_to(message,
+                     f"Regla {rule['id']} creada: {ASSETS_DICT.get(rule['symbol'], rule['symbol'])}, "
+                     f"{direction} de más del {rule['threshold']}% en {rule['horizon']} días.")
+
+    @bot.message_handler(commands=['rules'])
+    def rules_cmd(message):
+        rules = list_rules(f"chat:{message.chat.id}")
+
+        if not rules:
+            bot.reply_to(message, "No tienes reglas de alerta. Usa /subscribe para crear una.")
+            return
+
+        messages = ["Tus reglas de alerta:"]
+        for rule in rules:
+            direction = "subida" if rule["direction"] == "increase" else "bajada"
+            messages.append(f"{rule['id']}: {ASSETS_DICT.get(rule['symbol'], rule['symbol'])}, "
+                            f"{direction} de más del {rule['threshold']}% en {rule['horizon']} días")
+        bot.reply_to(message, "\n".join(messages))
+
+    @bot.message_handler(commands=['unsubscribe'])
+    def unsubscribe_cmd(message):
+        parts = message.text.split()
+
+        if len(parts) != 2 or not parts[1].isdigit():
+            bot.reply_to(message, "Uso: /unsubscribe ID (consulta tus reglas con /rules)")
+            return
+
+        if delete_rule(f"chat:{message.chat.id}", int(parts[1])):
+            bot.reply_to(message, f"Regla {parts[1]} eliminada.")
+        else:
+            bot.reply_to(message, f"Regla {parts[1]} no encontrada.")
+
     @bot.message_handler(commands=['price'])
     def price_cmd(message):
         # Extract symbol from message (e.g. /price BTC-USD)
@@ -205,8 +282,8 @@ def setup_bot_handlers(bot: telebot.TeleBot):
 
         bot.reply_to(message, f"Consultando precio actual de {ASSETS_DICT[symbol]}...")
 
-        # Get direct price from Yahoo Finance
-        price = yahoo_get_current_price(symbol)
+        # Get direct price from the price provider
+        price = get_price_provider().get_current_price(symbol)
 
         if price is not None:
             # Save to database
@@ -93,6 +93,10 @@ Available commands:
 /weekly - Weekly price variations
 /monthly - Monthly price variations
 /alerts - Recent price alerts
+/stats SYMBOL - Rolling statistics (e.g. /stats BTC-USD)
+/subscribe SYMBOL DAYS up|down THRESHOLD - Create an alert rule
+/rules - List your alert rules
+/unsubscribe ID - Remove an alert rule
 /update - Force price update
 
 This bot uses polling mode (no webhooks).
@@ -152,9 +156,9 @@ This bot uses polling mode (no webhooks).
             loading_msg = bot.reply_to(message, "Calculating daily variations...")
 
             try:
-                from managers.assets_manager import calculate_variations
+                from managers.variations_manager import get_materialized_variations
 
-                daily_variations = calculate_variations(list(ASSETS_DICT.keys()), 1)
+                daily_variations = get_materialized_variations(list(ASSETS_DICT.keys()), [1])[1]
 
                 if daily_variations:
                     response = "Daily Price Variations (24h):\n\n"
@@ -204,9 +208,9 @@ This bot uses polling mode (no webhooks).
             loading_msg = bot.reply_to(message, "Calculating weekly variations...")
 
             try:
-                from managers.assets_manager import calculate_variations
+                from managers.variations_manager import get_materialized_variations
 
-                weekly_variations = calculate_variations(list(ASSETS_DICT.keys()), 7)
+                weekly_variations = get_materialized_variations(list(ASSETS_DICT.keys()), [7])[7]
 
                 if weekly_variations:
                     response = "Weekly Price Variations (7 days):\n\n"
@@ -256,9 +260,9 @@ This bot uses polling mode (no webhooks).
             loading_msg = bot.reply_to(message, "Calculating monthly variations...")
 
             try:
-                from managers.assets_manager import calculate_variations
+                from managers.variations_manager import get_materialized_variations
 
-                monthly_variations = calculate_variations(list(ASSETS_DICT.keys()), 30)
+                monthly_variations = get_materialized_variations(list(ASSETS_DICT.keys()), [30])[30]
 
                 if monthly_variations:
                     response = "Monthly Price Variations (30 days):\n\n"
@@ -351,6 +355,121 @@ This bot uses polling mode (no webhooks).
             logger.error(f"Error in alerts command: {e}")
             bot.reply_to(message, "Error processing alerts command.")
 
+    @bot.message_handler(commands=['stats'])
+    def send_rolling_stats(message):
+        try:
+            logger.info(f"User {message.from_user.username or message.from_user.id} requested rolling statistics")
+
+            parts = message.text.split()
+            if len(parts) < 2 or parts[1].upper() not in ASSETS_DICT:
+                bot.reply_to(message, f"Usage: /stats SYMBOL\nAvailable symbols: {', '.join(ASSETS_DICT.keys())}")
+                return
+
+            symbol = parts[1].upper()
+
+            from managers.rolling_stats import rolling_stats
+
+            stats = rolling_stats.get_stats(symbol)
+
+            response = f"Rolling Statistics for {ASSETS_DICT[symbol]} ({symbol}):\n\n"
+            for days, window in stats.items():
+                if window["count"] == 0:
+                    response += f"{days} days: No data available\n\n"
+                    continue
+
+                response += f"{days} days ({window['count']} prices):\n"
+                response += f"   Mean: ${window['mean']:.2f}\n"
+                if window["std"] is not None:
+                    response += f"   Std dev: ${window['std']:.2f}\n"
+                if window["volatility"] is not None:
+                    response += f"   Volatility: {window['volatility']:.2f}%\n"
+                response += f"   Min / Max: ${window['min']:.2f} / ${window['max']:.2f}\n\n"
+
+            response += "Powered by CotizAPI"
+            bot.reply_to(message, response)
+
+        except Exception as e:
+            logger.error(f"Error in stats command: {e}")
+            bot.reply_to(message, "Error retrieving rolling statistics.")
+
+    @bot.message_handler(commands=['subscribe'])
+    def subscribe_rule(message):
+        try:
+            logger.info(f"User {message.from_user.username or message.from_user.id} requested a rule subscription")
+
+            parts = message.text.split()
+            if len(parts) != 5:
+                bot.reply_to(
+                    message,
+                    "Usage: /subscribe SYMBOL DAYS up|down THRESHOLD\n"
+                    "Example: /subscribe GC=F 7 up 3 (alert when gold rises more than 3% in 7 days)"
+                )
+                return
+
+            from managers.rules_manager import add_rule
+
+            try:
+                rule = add_rule(f"chat:{message.chat.id}", parts[1], int(parts[2]), parts[3], float(parts[4]))
+            except ValueError as e:
+                bot.reply_to(message, f"Invalid rule: {e}")
+                return
+
+            name = ASSETS_DICT.get(rule["symbol"], rule["symbol"])
+            bot.reply_to(
+                message,
+                f"Subscribed to rule {rule['id']}: {name} {rule['horizon']}-day "
+                f"{rule['direction']} above {rule['threshold']}%"
+            )
+
+        except Exception as e:
+            logger.error(f"Error in subscribe command: {e}")
+            bot.reply_to(message, "Error creating the alert rule.")
+
+    @bot.message_handler(commands=['rules'])
+    def send_rules(message):
+        try:
+            logger.info(f"User {message.from_user.username or message.from_user.id} requested alert rules")
+
+            from managers.rules_manager import list_rules
+
+            rules = list_rules(f"chat:{message.chat.id}")
+            if not rules:
+                bot.reply_to(message, "You have no alert rules. Use /subscribe to create one.")
+                return
+
+            response = "Your Alert Rules:\n\n"
+            for rule in rules:
+                name = ASSETS_DICT.get(rule["symbol"], rule["symbol"])
+                response += f"{rule['id']}: {name} {rule['horizon']}-day {rule['direction']} above {rule['threshold']}%\n"
+            response += "\nUse /unsubscribe ID to remove a rule"
+
+            bot.reply_to(message, response)
+
+        except Exception as e:
+            logger.error(f"Error in rules command: {e}")
+            bot.reply_to(message, "Error retrieving alert rules.")
+
+    @bot.message_handler(commands=['unsubscribe'])
+    def unsubscribe_rule(message):
+        try:
+            logger.info(f"User {message.from_user.username or message.from_user.id} requested a rule removal")
+
+            parts = message.text.split()
+            if len(parts) != 2 or not parts[1].isdigit():
+                bot.reply_to(message, "Usage: /unsubscribe ID (see /rules)")
+                return
+
+            from managers.rules_manager import delete_rule
+
+            if delete_rule(f"chat:{message.chat.id}", int(parts[1])):
+                bot.reply_to(message, f"Rule {parts[1]} removed.")
+            else:
+                bot.reply_to(message, f"Rule {parts[1]} not found.")
+
+        except Exception as e:
+            logger.error(f"Error in unsubscribe command: {e}")
+            bot.reply_to(message, "Error removing the alert rule.")
+
     @bot.message_handler(commands=['update'])
     def force_update(message):
         try:
@@ -417,6 +536,10 @@ CotizAPI Bot Commands:
 /weekly - Weekly variations  
 /monthly - Monthly variations
 /alerts - Recent alerts
+/stats - Rolling statistics
+/subscribe - Create an alert rule
+/rules - Your alert rules
+/unsubscribe - Remove an alert rule
 /update - Force update
 
 Type /start for more information.
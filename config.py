@@ -5,7 +5,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Database configuration
-DATABASE_URL = "sqlite:///./cotizapi.db"
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./cotizapi.db")
 
 # API configuration
 API_HOST = "127.0.0.1"  # Cambiado de 0.0.0.0 a 127.0.0.1
@@ -23,14 +23,70 @@ ASSETS_DICT = {
     "CL=F": "Oil",
 }
 
-# Threshold constants
-DAILY_THRESHOLD = 3.0    # 3% daily variation threshold for alerts
-WEEKLY_THRESHOLD = 6.0   # 6% weekly variation threshold for alerts
+# Threshold constants (default alert rules, applied to every asset)
+DAILY_THRESHOLD = float(os.getenv("DAILY_THRESHOLD", "2.0"))      # 2% daily variation threshold for alerts
+WEEKLY_THRESHOLD = float(os.getenv("WEEKLY_THRESHOLD", "4.0"))    # 4% weekly variation threshold for alerts
+MONTHLY_THRESHOLD = float(os.getenv("MONTHLY_THRESHOLD", "7.0"))  # 7% monthly variation threshold for alerts
 WEEK_DAY_THRESHOLD = 5   # Saturday is day 5 (0-indexed, Monday=0)
 
+# API keys allowed to manage alert rules (comma-separated; empty accepts any key)
+API_KEYS = {key.strip() for key in os.getenv("API_KEYS", "").split(",") if key.strip()}
+
+# Yahoo Finance rate limiting
+YAHOO_RATE_LIMIT = float(os.getenv("YAHOO_RATE_LIMIT", "2"))   # Requests per second
+YAHOO_RATE_BURST = int(os.getenv("YAHOO_RATE_BURST", "3"))     # Requests allowed back to back
+YAHOO_MAX_RETRIES = int(os.getenv("YAHOO_MAX_RETRIES", "3"))   # Attempts per symbol
+
+# Price provider: "yahoo" for live data or "replay" for recorded quotes
+PRICE_PROVIDER = os.getenv("PRICE_PROVIDER", "yahoo")
+REPLAY_FIXTURE_PATH = os.getenv("REPLAY_FIXTURE_PATH", "./tests/fixtures/replay_prices.json")
+REPLAY_LATENCY_MS = float(os.getenv("REPLAY_LATENCY_MS", "0"))     # Artificial latency per request
+REPLAY_FAILURE_RATE = float(os.getenv("REPLAY_FAILURE_RATE", "0"))  # Probability of a failed request
+REPLAY_SEED = int(os.getenv("REPLAY_SEED", "42"))
+
+# Upstream failure handling
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))       # Failures before opening
+CIRCUIT_COOLDOWN_SECONDS = float(os.getenv("CIRCUIT_COOLDOWN_SECONDS", "300"))     # Time the circuit stays open
+NEGATIVE_CACHE_TTL_SECONDS = float(os.getenv("NEGATIVE_CACHE_TTL_SECONDS", "60"))  # Time "no data" is remembered
+
+# Background price refresh
+PRICE_REFRESH_ENABLED = os.getenv("PRICE_REFRESH_ENABLED", "true").lower() == "true"
+PRICE_REFRESH_INTERVAL_SECONDS = float(os.getenv("PRICE_REFRESH_INTERVAL_SECONDS", "900"))  # 15 minutes
+
+# In-memory price cache
+PRICE_CACHE_MAX_SYMBOLS = int(os.getenv("PRICE_CACHE_MAX_SYMBOLS", "256"))    # Assets kept before LRU eviction
+PRICE_CACHE_HISTORY_DAYS = int(os.getenv("PRICE_CACHE_HISTORY_DAYS", "45"))   # Days of history cached per asset
+CORRELATION_CACHE_SIZE = int(os.getenv("CORRELATION_CACHE_SIZE", "32"))     # Correlation results kept before LRU eviction
+
+# Intraday price series
+INTRADAY_RETENTION_DAYS = int(os.getenv("INTRADAY_RETENTION_DAYS", "7"))  # Days kept before rolling up to daily closes
+
+# Rolling statistics windows, in days
+ROLLING_WINDOWS = [int(days) for days in os.getenv("ROLLING_WINDOWS", "7,30,90").split(",")]
+
+# Materialized variation horizons, in days
+VARIATION_HORIZONS = [int(days) for days in os.getenv("VARIATION_HORIZONS", "1,7,30").split(",")]
+
+# Historical backfill
+BACKFILL_YEARS = int(os.getenv("BACKFILL_YEARS", "5"))  # Years of history for symbols without data
+
+# Memory-mapped price history snapshots
+PRICE_SNAPSHOTS_ENABLED = os.getenv("PRICE_SNAPSHOTS_ENABLED", "true").lower() == "true"
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "./snapshots")  # One .npy pair (days, prices) per asset
+
+# History exports
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "5000"))  # Rows fetched and sent per streamed chunk
+
 # Telegram Bot configuration
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
-TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")  # Chat receiving the alerts of the default rules
+
+# Telegram alert dispatch
+TELEGRAM_API_BASE = os.getenv("TELEGRAM_API_BASE", "https://api.telegram.org")
+TELEGRAM_GLOBAL_RATE = float(os.getenv("TELEGRAM_GLOBAL_RATE", "30"))      # Messages per second across all chats
+TELEGRAM_CHAT_RATE = float(os.getenv("TELEGRAM_CHAT_RATE", "1"))           # Messages per second to the same chat
+TELEGRAM_BATCH_SECONDS = float(os.getenv("TELEGRAM_BATCH_SECONDS", "1"))   # Time alerts are gathered per chat
+TELEGRAM_MAX_RETRIES = int(os.getenv("TELEGRAM_MAX_RETRIES", "3"))         # Attempts per message
 
 
 ASSETS_DICT = {
@@ -1,9 +1,10 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime
+from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Index, UniqueConstraint, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from typing import Generator
 from loguru import logger
 from config import DATABASE_URL
+from db.migrations import run_migrations
 
 # SQLAlchemy setup
 engine = create_engine(DATABASE_URL)
@@ -24,11 +25,59 @@ class Asset(Base):
         date: Date when the price was recorded.
     """
     __tablename__ = "assets"
+    __table_args__ = (
+        UniqueConstraint("symbol", "date"),
+        Index("ix_assets_symbol_date_price", "symbol", text("date DESC"), "price"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    symbol = Column(String, index=True)
-    price = Column(Float)
-    date = Column(String)
+    symbol = Column(String, index=True, nullable=False)
+    price = Column(Float, nullable=False)
+    date = Column(String, nullable=False)
+
+
+class IntradayPrice(Base):
+    """
+    Model for storing timestamped intraday price observations.
+    Stored as a WITHOUT ROWID table clustered on (symbol, ts), so range
+    queries by symbol and time read contiguous rows of the primary key.
+
+    Attributes:
+    ----------
+        symbol: Financial instrument symbol (e.g., 'BTC-USD').
+        ts: Unix epoch timestamp (seconds) of the observation.
+        price: Asset price value.
+    """
+    __tablename__ = "intraday_prices"
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    symbol = Column(String, primary_key=True)
+    ts = Column(Integer, primary_key=True)
+    price = Column(Float, nullable=False)
+
+
+class Variation(Base):
+    """
+    Model for the materialized price variations of each asset and horizon,
+    refreshed whenever new prices are stored for the asset.
+
+    Attributes:
+    ----------
+        symbol: Financial instrument symbol (e.g., 'BTC-USD').
+        horizon: Number of days the variation looks back.
+        as_of_date: Date the variation was computed for.
+        base_price: Last price on or before as_of_date minus horizon days.
+        price: Latest price of the asset when the variation was computed.
+        variation: Percentage variation between base_price and price.
+    """
+    __tablename__ = "variations"
+
+    symbol = Column(String, primary_key=True)
+    horizon = Column(Integer, primary_key=True)
+    as_of_date = Column(String, nullable=False)
+    base_price = Column(Float)
+    price = Column(Float, nullable=False)
+    variation = Column(Float)
 
 
 class Alert(Base):
@@ -41,13 +90,50 @@ class Alert(Base):
         symbol: Financial instrument symbol that triggered the alert.
         date: Timestamp when the alert was generated.
         message: Alert message content.
+        rule: Rule that triggered the alert (e.g. 'default:increase').
+        horizon: Number of days of the variation that triggered the alert.
+        as_of_date: Date of the variation that triggered the alert.
     """
     __tablename__ = "alerts"
+    __table_args__ = (
+        Index("ix_alerts_date", "date"),
+        Index("ix_alerts_symbol_date", "symbol", "date"),
+        # One alert per rule, horizon and day; repeated evaluations store nothing new
+        Index("uq_alerts_dedupe", "symbol", "rule", "horizon", "as_of_date", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    symbol = Column(String, index=True, nullable=False)
+    date = Column(DateTime, nullable=False)
+    message = Column(String, nullable=False)
+    rule = Column(String)
+    horizon = Column(Integer)
+    as_of_date = Column(String)
+
+
+class AlertRule(Base):
+    """
+    Model for storing alert rules subscribed by Telegram chats or API keys.
+
+    Attributes:
+    ----------
+        id: Primary key for the rule.
+        owner: Subscriber of the rule ('chat:<chat id>' or 'api:<key hash>').
+        symbol: Financial instrument symbol the rule applies to.
+        horizon: Number of days of the variation the rule checks.
+        direction: 'increase' or 'decrease'.
+        threshold: Percentage the variation must exceed to trigger the rule.
+        created_at: Timestamp when the rule was created.
+    """
+    __tablename__ = "alert_rules"
 
     id = Column(Integer, primary_key=True, index=True)
-    symbol = Column(String, index=True)
-    date = Column(DateTime)
-    message = Column(String)
+    owner = Column(String, index=True, nullable=False)
+    symbol = Column(String, nullable=False)
+    horizon = Column(Integer, nullable=False)
+    direction = Column(String, nullable=False)
+    threshold = Column(Float, nullable=False)
+    created_at = Column(DateTime, nullable=False)
 
 
 def get_db() -> Generator:
@@ -67,11 +153,14 @@ def get_db() -> Generator:
 
 def initialize_database():
     """
-    Initializes the database, creating tables if they don't exist.
+    Initializes the database, creating tables if they don't exist and
+    applying pending schema migrations to existing database files.
 
     Returns:
     -------
         None
     """
     Base.metadata.create_all(bind=engine)
-    logger.info("Database tables created successfully")
\ No newline at end of file
+    logger.info("Database tables created successfully")
+    version = run_migrations(engine)
+    logger.info(f"Database schema at version {version}")
\ No newline at end of file
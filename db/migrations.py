@@ -0,0 +1,165 @@
+from typing import Callable
+
+from loguru import logger
+from sqlalchemy import Connection, Engine
+
+
+def _ensure_unique_symbol_date(conn: Connection) -> None:
+    """
+    Ensures a unique index on assets(symbol, date) exists, removing duplicated
+    prices first (the most recently inserted row of each symbol and date is kept).
+
+    Args:
+    ----
+        conn: Connection within the migration transaction.
+    """
+    for index in conn.exec_driver_sql("PRAGMA index_list('assets')").fetchall():
+        name, unique = index[1], index[2]
+        columns = [row[2] for row in conn.exec_driver_sql(f"PRAGMA index_info('{name}')").fetchall()]
+        if unique and columns == ["symbol", "date"]:
+            return
+
+    removed = conn.exec_driver_sql("""
+        DELETE FROM assets
+        WHERE id NOT IN (SELECT MAX(id) FROM assets GROUP BY symbol, date)
+    """).rowcount
+    if removed:
+        logger.warning(f"Removed {removed} duplicated prices before creating the unique (symbol, date) index")
+
+    conn.exec_driver_sql("CREATE UNIQUE INDEX uq_assets_symbol_date ON assets (symbol, date)")
+
+
+def _create_latest_price_index(conn: Connection) -> None:
+    """
+    Creates the covering index used by latest price and as-of lookups, which
+    are answered from the index alone without visiting the table rows.
+
+    Args:
+    ----
+        conn: Connection within the migration transaction.
+    """
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_assets_symbol_date_price ON assets (symbol, date DESC, price)"
+    )
+
+
+def _create_alerts_date_index(conn: Connection) -> None:
+    """
+    Creates the index used to read alerts by date.
+
+    Args:
+    ----
+        conn: Connection within the migration transaction.
+    """
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_alerts_date ON alerts (date)")
+
+
+def _add_alert_dedupe_key(conn: Connection) -> None:
+    """
+    Adds the rule, horizon and as_of_date columns to alerts and the unique index
+    that deduplicates alerts on them. Alerts stored before have no key and are kept.
+
+    Args:
+    ----
+        conn: Connection within the migration transaction.
+    """
+    columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info('alerts')").fetchall()}
+    for name, column_type in (("rule", "VARCHAR"), ("horizon", "INTEGER"), ("as_of_date", "VARCHAR")):
+        if name not in columns:
+            conn.exec_driver_sql(f"ALTER TABLE alerts ADD COLUMN {name} {column_type}")
+
+    conn.exec_driver_sql(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_alerts_dedupe ON alerts (symbol, rule, horizon, as_of_date)"
+    )
+
+
+def _create_alerts_symbol_date_index(conn: Connection) -> None:
+    """
+    Creates the index used to page through the alerts of a symbol by date. As in
+    every SQLite index, the row id (the alert id) follows the indexed columns, so
+    (date, id) keyset pagination is served by this index and ix_alerts_date.
+
+    Args:
+    ----
+        conn: Connection within the migration transaction.
+    """
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_alerts_symbol_date ON alerts (symbol, date)")
+
+
+def _normalize_alert_dates(conn: Connection) -> None:
+    """
+    Rewrites alert dates stored with a date only, or without fractional seconds, to
+    the 'YYYY-MM-DD HH:MM:SS.ffffff' format of current alerts, so date filters and
+    pagination cursors compare every alert in the same format through ix_alerts_date.
+
+    Args:
+    ----
+        conn: Connection within the migration transaction.
+    """
+    rewritten = conn.exec_driver_sql("""
+        UPDATE alerts
+        SET date = CASE length(date)
+            WHEN 10 THEN date || ' 00:00:00.000000'
+            ELSE replace(date, 'T', ' ') || '.000000'
+        END
+        WHERE length(date) IN (10, 19)
+    """).rowcount
+    if rewritten:
+        logger.info(f"Normalized the date of {rewritten} legacy alerts")
+
+
+# Ordered schema migrations; the position of each one (starting at 1) is its version
+MIGRATIONS: list[tuple[str, Callable[[Connection], None]]] = [
+    ("unique (symbol, date) index on assets", _ensure_unique_symbol_date),
+    ("covering (symbol, date DESC, price) index on assets", _create_latest_price_index),
+    ("date index on alerts", _create_alerts_date_index),
+    ("deduplication key on alerts", _add_alert_dedupe_key),
+    ("(symbol, date) index on alerts", _create_alerts_symbol_date_index),
+    ("full timestamps on legacy alerts", _normalize_alert_dates),
+]
+
+
+def get_schema_version(engine: Engine) -> int:
+    """
+    Gets the schema version recorded in the database file.
+
+    Args:
+    ----
+        engine: Engine bound to the database.
+
+    Returns:
+    -------
+        Number of migrations applied to the database.
+    """
+    with engine.connect() as conn:
+        return conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def run_migrations(engine: Engine) -> int:
+    """
+    Applies pending migrations in order. Each migration runs in its own
+    transaction together with the update of PRAGMA user_version, so an
+    interrupted upgrade resumes from the first migration not applied.
+
+    Args:
+    ----
+        engine: Engine bound to the database (tables must already exist).
+
+    Returns:
+    -------
+        Schema version of the database after the upgrade.
+    """
+    if engine.dialect.name != "sqlite":
+        logger.warning(f"Schema migrations only support SQLite, skipping them for {engine.dialect.name}")
+        return 0
+
+    version = get_schema_version(engine)
+    for target, (description, migrate) in enumerate(MIGRATIONS[version:], start=version + 1):
+        with engine.begin() as conn:
+            conn.exec_driver_sql("BEGIN")
+            migrate(conn)
+            conn.exec_driver_sql(f"PRAGMA user_version = {target}")
+        logger.info(f"Applied migration {target}: {description}")
+        version = target
+
+    return version
@@ -1,20 +1,48 @@
+import asyncio
 import threading
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from api.endpoints import router as api_router  # Use modified endpoints
 from managers.assets_manager import update_prices_efficiently
+from managers.alerts_manager import generate_alerts
 from db.database import initialize_database
 from loguru import logger
-from config import API_HOST, API_PORT, TELEGRAM_BOT_TOKEN
+from managers.scheduler import run_price_refresh_loop
+from config import API_HOST, API_PORT, TELEGRAM_BOT_TOKEN, PRICE_REFRESH_ENABLED
 from bot.telegram_bot import start_bot
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Prepares the database schema and starts the background price refresh with
+    the API, stopping it on shutdown.
+    """
+    # Also needed when the app is served directly (uvicorn main:app), without main()
+    initialize_database()
+
+    refresh_task = None
+    if PRICE_REFRESH_ENABLED:
+        refresh_task = asyncio.create_task(run_price_refresh_loop())
+
+    yield
+
+    if refresh_task is not None:
+        refresh_task.cancel()
+        try:
+            await refresh_task
+        except asyncio.CancelledError:
+            pass
+
+
 # Initialize FastAPI
 app = FastAPI(
     title="CotizAPI",
     description="API for tracking financial asset prices",
-    version="1.0"
+    version="1.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -61,8 +89,9 @@ def initialize_system():
         update_result = update_prices_efficiently(force_update=True)
         logger.info(f"Update completed: {update_result['updated_successfully']} prices updated")
 
-        # Generate alerts
+        # Generate alerts for prices stored while the system was stopped
         logger.info("Generating alerts...")
+        generate_alerts()
         logger.info("Alerts generated.")
     except Exception as e:
         logger.error(f"Error during initialization: {e}")
@@ -1,81 +1,171 @@
+import base64
+import json
 from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any
+from sqlalchemy import text, bindparam
 from sqlalchemy.orm import Session
 from loguru import logger
 from db.database import SessionLocal, Alert
-from managers.assets_manager import calculate_variations
-from config import ASSETS
+from managers.rules_manager import get_rule_index
+from managers.variations_manager import get_materialized_variations
+from config import ASSETS, DAILY_THRESHOLD, WEEKLY_THRESHOLD, MONTHLY_THRESHOLD
 
-# Alert thresholds defined directly here
-DAILY_THRESHOLD = 2.0    # 3% daily variation
-WEEKLY_THRESHOLD = 4.0   # 5% weekly variation
-MONTHLY_THRESHOLD = 7.0  # 7% monthly variation
 
+# Label of the usual alert horizons, in days
+HORIZON_LABELS = {1: "Daily", 7: "Weekly", 30: "Monthly"}
 
-def generate_alerts() -> None:
+# Alerts per INSERT statement: RETURNING needs SQLite 3.35+, which allows 32766
+# bound parameters per statement; each alert takes 5 besides the shared date
+ALERT_INSERT_CHUNK_ROWS = (32766 - 1) // 5
+
+
+def _last_price_dates(symbols: List[str]) -> Dict[str, str]:
+    # Date of the latest stored price of each asset, which its variations are computed from
+    query = text("""
+        SELECT symbol, MAX(date) FROM assets WHERE symbol IN :symbols GROUP BY symbol
+    """).bindparams(bindparam("symbols", expanding=True))
+    with SessionLocal() as db:
+        return {row[0]: str(row[1]) for row in db.execute(query, {"symbols": list(symbols)})}
+
+
+def evaluate_alerts(symbols: List[str]) -> List[Dict[str, Any]]:
     """
-    Generates alerts based on price variations exceeding predefined thresholds.
-    Alerts are always stored in the database.
+    Evaluates the default and subscribed alert rules of the given assets against
+    their materialized variations and stores the triggered alerts in a single
+    transaction. Called for the changed assets whenever new prices are stored, so its
+    cost depends only on them and, through the rule index, on the triggered rules.
+    An alert is stored once per asset, rule, horizon and last price date, so
+    evaluations without new prices never repeat it.
+
+    Args:
+    ----
+        symbols: Asset symbols to evaluate.
 
     Returns:
     -------
-        None
+        List of the alerts stored by this evaluation (already stored alerts are skipped),
+        with the owner of the rule that triggered them (None for default rules).
     """
-    db: Session = SessionLocal()
+    if not symbols:
+        return []
+
+    index = get_rule_index()
+    horizons = sorted(set().union(*(index.horizons(symbol) for symbol in symbols)))
+    variations = get_materialized_variations(symbols, horizons)
+    as_of_dates = _last_price_dates(symbols)
+
+    alerts = []
+    owners = {}
+    for days in horizons:
+        label = HORIZON_LABELS.get(days, f"{days}-day")
+        for item in variations[days]:
+            variation = item["variation"]
+            if variation is None:
+                continue
+
+            for rule in index.match(item["symbol"], days, variation):
+                alerts.append({
+                    "symbol": item["symbol"],
+                    "message": f"{label} {rule['direction']} of {variation:.2f}% "
+                               f"exceeded the {rule['threshold']}% threshold!",
+                    "rule": rule["rule"],
+                    "horizon": days,
+                    "as_of_date": as_of_dates.get(item["symbol"]),
+                })
+                owners[(item["symbol"], rule["rule"], days)] = rule["owner"]
+
+    if not alerts:
+        return []
+
+    with SessionLocal() as db:
+        stored = insert_alerts(db, alerts)
+
+    for alert in stored:
+        alert["owner"] = owners[(alert["symbol"], alert["rule"], alert["horizon"])]
+        logger.warning(f"ALERT ({alert['rule']}): {alert['symbol']} - {alert['message']}")
+
+    # Delivery is queued on the dispatcher thread, so ingestion never waits for Telegram
     try:
-        # Calculate variations
-        daily_variations = calculate_variations(ASSETS, 1)
-        weekly_variations = calculate_variations(ASSETS, 7)
-        monthly_variations = calculate_variations(ASSETS, 30)
+        from bot.dispatcher import dispatch_alerts
+        dispatch_alerts(stored)
+    except Exception as e:
+        logger.error(f"Error dispatching alerts: {e}")
 
-        alerts_generated = False
+    return stored
 
-        for asset in ASSETS:
-            # Check daily variation (threshold: 3%)
-            daily_variation = next(
-                (item["variation"] for item in daily_variations if item["symbol"] == asset), None
-            )
-
-            if daily_variation is not None and abs(daily_variation) > DAILY_THRESHOLD:
-                direction = "increase" if daily_variation > 0 else "decrease"
-                message = f"Daily {direction} of {daily_variation:.2f}% exceeded the {DAILY_THRESHOLD}% threshold!"
-                insert_alert(db, asset, message)
-                alerts_generated = True
-                logger.warning(f"DAILY ALERT: {asset} - {message}")
-
-            # Check weekly variation (threshold: 5%)
-            weekly_variation = next(
-                (item["variation"] for item in weekly_variations if item["symbol"] == asset), None
-            )
-
-            if weekly_variation is not None and abs(weekly_variation) > WEEKLY_THRESHOLD:
-                direction = "increase" if weekly_variation > 0 else "decrease"
-                message = f"Weekly {direction} of {weekly_variation:.2f}% exceeded the {WEEKLY_THRESHOLD}% threshold!"
-                insert_alert(db, asset, message)
-                alerts_generated = True
-                logger.warning(f"WEEKLY ALERT: {asset} - {message}")
-
-            # Check monthly variation (threshold: 7%)
-            monthly_variation = next(
-                (item["variation"] for item in monthly_variations if item["symbol"] == asset), None
-            )
-
-            if monthly_variation is not None and abs(monthly_variation) > MONTHLY_THRESHOLD:
-                direction = "increase" if monthly_variation > 0 else "decrease"
-                message = f"Monthly {direction} of {monthly_variation:.2f}% exceeded the {MONTHLY_THRESHOLD}% threshold!"
-                insert_alert(db, asset, message)
-                alerts_generated = True
-                logger.warning(f"MONTHLY ALERT: {asset} - {message}")
-
-        if alerts_generated:
+
+def generate_alerts() -> None:
+    """
+    Generates alerts for every tracked asset based on price variations exceeding
+    predefined thresholds. Alerts are always stored in the database.
+
+    Returns:
+    -------
+        None
+    """
+    try:
+        if evaluate_alerts(ASSETS):
             logger.info("Alerts generated and stored in database")
         else:
-            logger.info("No significant variations detected. Current thresholds: "
+            logger.info("No new significant variations detected. Current thresholds: "
                        f"Daily >{DAILY_THRESHOLD}%, Weekly >{WEEKLY_THRESHOLD}%, Monthly >{MONTHLY_THRESHOLD}%")
 
     except Exception as e:
         logger.error(f"Error generating alerts: {e}")
-    finally:
-        db.close()
+
+
+def insert_alerts(db: Session, alerts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Inserts several alerts with multi-row statements of ALERT_INSERT_CHUNK_ROWS
+    alerts each, in one transaction and one commit. Alerts whose
+    (symbol, rule, horizon, as_of_date) key is already stored are skipped.
+
+    Args:
+    ----
+        db: Database session.
+        alerts: List of dictionaries with symbol and message, and optionally the
+            rule, horizon and as_of_date deduplication key.
+
+    Returns:
+    -------
+        List of the alerts actually inserted, with their id and date.
+    """
+    if not alerts:
+        return []
+
+    # Same format SQLAlchemy uses to store DateTime values in SQLite
+    now = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S.%f')
+
+    try:
+        rows = []
+        for first in range(0, len(alerts), ALERT_INSERT_CHUNK_ROWS):
+            params: Dict[str, Any] = {"date": now}
+            values = []
+            for position, alert in enumerate(alerts[first:first + ALERT_INSERT_CHUNK_ROWS]):
+                for field in ("symbol", "message", "rule", "horizon", "as_of_date"):
+                    params[f"{field}_{position}"] = alert.get(field)
+                values.append(f"(:symbol_{position}, :date, :message_{position}, :rule_{position}, "
+                              f":horizon_{position}, :as_of_date_{position})")
+
+            query = text(f"""
+                INSERT INTO alerts (symbol, date, message, rule, horizon, as_of_date)
+                VALUES {", ".join(values)}
+                ON CONFLICT (symbol, rule, horizon, as_of_date) DO NOTHING
+                RETURNING id, symbol, date, message, rule, horizon, as_of_date
+            """)
+            rows += db.execute(query, params).fetchall()
+        db.commit()
+    except Exception as e:
+        logger.error(f"Error inserting {len(alerts)} alerts: {e}")
+        db.rollback()
+        return []
+
+    logger.info(f"{len(rows)} alerts stored in database ({len(alerts) - len(rows)} already stored)")
+    return [
+        {"id": row[0], "symbol": row[1], "date": row[2], "message": row[3],
+         "rule": row[4], "horizon": row[5], "as_of_date": row[6]}
+        for row in rows
+    ]
 
 
 def insert_alert(db: Session, symbol: str, message: str) -> None:
@@ -92,19 +182,8 @@ def insert_alert(db: Session, symbol: str, message: str) -> None:
     -------
         None
     """
-    try:
-        logger.info(f"Inserting alert -> Symbol: {symbol} | Message: {message}")
-
-        # Save to database
-        new_alert = Alert(symbol=symbol, date=datetime.now(timezone.utc), message=message)
-        db.add(new_alert)
-        db.commit()
-
-        logger.info(f"Alert successfully stored in database for {symbol}")
-
-    except Exception as e:
-        logger.error(f"Error inserting alert for {symbol}: {e}")
-        db.rollback()
+    logger.info(f"Inserting alert -> Symbol: {symbol} | Message: {message}")
+    insert_alerts(db, [{"symbol": symbol, "message": message}])
 
 
 def get_recent_alerts() -> list[dict[str, str]]:
@@ -132,14 +211,153 @@ def get_recent_alerts() -> list[dict[str, str]]:
         db.close()
 
 
+def _stored_date(value: datetime) -> str:
+    # Alert dates are stored in UTC, in the format SQLAlchemy uses for DateTime values
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime('%Y-%m-%d %H:%M:%S.%f')
+
+
+def _alert_filters(since: datetime | None, until: datetime | None, symbol: str | None) -> tuple[str, Dict[str, Any]]:
+    clauses, params = [], {}
+    if since is not None:
+        clauses.append("date >= :since")
+        params["since"] = _stored_date(since)
+    if until is not None:
+        clauses.append("date < :until")
+        params["until"] = _stored_date(until)
+    if symbol is not None:
+        clauses.append("symbol = :symbol")
+        params["symbol"] = symbol
+    return " AND ".join(clauses) or "true", params
+
+
+def encode_alert_cursor(date: str, alert_id: int) -> str:
+    """
+    Encodes the (date, id) position of an alert as an opaque pagination cursor.
+    """
+    return base64.urlsafe_b64encode(json.dumps([date, alert_id]).encode()).decode()
+
+
+def decode_alert_cursor(cursor: str) -> tuple[str, int]:
+    """
+    Decodes a pagination cursor into the (date, id) position it points after.
+
+    Raises:
+    ------
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        date, alert_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(date), int(alert_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def get_alerts_page(
+        since: datetime | None = None,
+        until: datetime | None = None,
+        symbol: str | None = None,
+        cursor: str | None = None,
+        limit: int = 100,
+) -> Dict[str, Any]:
+    """
+    Retrieves one page of alerts, newest first, with keyset pagination on (date, id).
+    Each page is a bounded index range scan, however many alerts match.
+
+    Args:
+    ----
+        since: Earliest alert date (inclusive).
+        until: Latest alert date (exclusive).
+        symbol: Asset symbol to filter by.
+        cursor: Cursor returned with the previous page (default: first page).
+        limit: Maximum number of alerts in the page.
+
+    Returns:
+    -------
+        Dictionary containing the alerts of the page and the cursor of the next
+        page (None on the last page).
+
+    Raises:
+    ------
+        ValueError: If the cursor is malformed.
+    """
+    where, params = _alert_filters(since, until, symbol)
+    if cursor is not None:
+        where += " AND (date, id) < (:cursor_date, :cursor_id)"
+        params["cursor_date"], params["cursor_id"] = decode_alert_cursor(cursor)
+    params["limit"] = limit + 1
+
+    query = text(f"""
+        SELECT id, symbol, date, message, rule, horizon, as_of_date
+        FROM alerts
+        WHERE {where}
+        ORDER BY date DESC, id DESC
+        LIMIT :limit
+    """)
+
+    with SessionLocal() as db:
+        rows = db.execute(query, params).fetchall()
+
+    next_cursor = encode_alert_cursor(str(rows[limit - 1][2]), rows[limit - 1][0]) if len(rows) > limit else None
+    return {
+        "alerts": [
+            {"id": row[0], "symbol": row[1], "date": datetime.fromisoformat(str(row[2])).isoformat(), "message": row[3],
+             "rule": row[4], "horizon": row[5], "as_of_date": row[6]}
+            for row in rows[:limit]
+        ],
+        "next_cursor": next_cursor,
+    }
+
+
+def count_alerts_by_bucket(
+        bucket: str,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        symbol: str | None = None,
+) -> List[Dict[str, Any]]:
+    """
+    Counts alerts per hour or per day.
+
+    Args:
+    ----
+        bucket: Bucket size, 'hour' or 'day'.
+        since: Earliest alert date (inclusive).
+        until: Latest alert date (exclusive).
+        symbol: Asset symbol to filter by.
+
+    Returns:
+    -------
+        List of dictionaries with the start of each bucket and its number of alerts,
+        ordered by bucket.
+    """
+    # strftime also normalizes legacy alerts stored with a date only to their midnight bucket
+    bucket_format = {"hour": "%Y-%m-%dT%H:00", "day": "%Y-%m-%dT00:00"}[bucket]
+    where, params = _alert_filters(since, until, symbol)
+
+    query = text(f"""
+        SELECT strftime('{bucket_format}', date) AS bucket, COUNT(*) AS count
+        FROM alerts
+        WHERE {where}
+        GROUP BY bucket
+        ORDER BY bucket
+    """)
+
+    with SessionLocal() as db:
+        rows = db.execute(query, params).fetchall()
+
+    return [{"bucket": row[0], "count": row[1]} for row in rows]
+
+
 def check_and_log_current_variations() -> None:
     """
     Helper function to check current variations and debug.
     """
     try:
-        daily_variations = calculate_variations(ASSETS, 1)
-        weekly_variations = calculate_variations(ASSETS, 7)
-        monthly_variations = calculate_variations(ASSETS, 30)
+        variations = get_materialized_variations(ASSETS, [1, 7, 30])
+        daily_variations = variations[1]
+        weekly_variations = variations[7]
+        monthly_variations = variations[30]
 
         logger.info("=== CURRENT VARIATIONS ===")
         for asset in ASSETS:
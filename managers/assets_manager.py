@@ -1,16 +1,23 @@
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import text, bindparam
 from loguru import logger
 
-from config import ASSETS
+from config import ASSETS, PRICE_SNAPSHOTS_ENABLED
 from db.database import SessionLocal
+from managers.intraday_manager import record_intraday_prices
+from managers.price_cache import price_cache
+from managers.variations_manager import refresh_variations
+from utils.single_flight import SingleFlight
+
+# Concurrent refreshes of the same assets share one upstream fetch
+_refresh_flight = SingleFlight()
 
 
 def get_current_price_db(symbol: str) -> float | None:
     """
-    Retrieve the latest price of an asset from the database.
+    Retrieve the latest price of an asset from the database, through the price cache.
 
     Args:
     ----
@@ -21,15 +28,13 @@ def get_current_price_db(symbol: str) -> float | None:
         Current price or None if not available.
     """
     try:
-        with SessionLocal() as db:
-            query = text("SELECT price FROM assets WHERE symbol = :symbol ORDER BY date DESC LIMIT 1")
-            result = db.execute(query, {"symbol": symbol}).fetchone()
+        latest = price_cache.get_latest(symbol)
 
-            if result is None or result[0] is None:
-                logger.warning(f"No price data found for {symbol}")
-                return None
+        if latest is None:
+            logger.warning(f"No price data found for {symbol}")
+            return None
 
-            return float(result[0])
+        return latest[1]
     except Exception as e:
         logger.error(f"Error retrieving price for {symbol}: {e}")
         return None
@@ -38,6 +43,7 @@ def get_current_price_db(symbol: str) -> float | None:
 def get_price_by_date(db: Session, symbol: str, date: str) -> float | None:
     """
     Retrieves the price of an asset for a specific date from database.
+    Dates within the cached recent history are answered from the price cache.
 
     Args:
     ----
@@ -50,6 +56,10 @@ def get_price_by_date(db: Session, symbol: str, date: str) -> float | None:
         Price on the specified date or None if not available.
     """
     try:
+        covered, price = price_cache.get_price_as_of(symbol, date)
+        if covered:
+            return price
+
         query = text("""
             SELECT price FROM assets 
             WHERE symbol = :symbol AND date <= :date
@@ -64,6 +74,126 @@ def get_price_by_date(db: Session, symbol: str, date: str) -> float | None:
         return None
 
 
+def _on_prices_stored(changes: Dict[tuple[str, str], float]) -> None:
+    """
+    Keeps derived in-memory state in line after new prices are committed.
+
+    Args:
+    ----
+        changes: Stored prices keyed by (symbol, date).
+
+    Returns:
+    -------
+        None
+    """
+    from managers.alerts_manager import evaluate_alerts
+    from managers.candles_manager import invalidate_candles
+    from managers.price_matrix import invalidate_price_matrix
+    from managers.rolling_stats import rolling_stats
+    from managers.snapshots_manager import update_snapshots
+
+    symbols = sorted({symbol for symbol, _ in changes})
+
+    def update_rolling_stats() -> None:
+        for (symbol, date), price in sorted(changes.items(), key=lambda item: item[0][1]):
+            rolling_stats.on_price(symbol, date, price)
+
+    # Snapshots first, so a price matrix reloaded after the invalidation reads them up to date
+    hooks = []
+    if PRICE_SNAPSHOTS_ENABLED:
+        hooks.append(("updating price snapshots", lambda: update_snapshots(changes)))
+    hooks += [
+        ("invalidating the price cache", lambda: price_cache.invalidate(set(symbols))),
+        ("invalidating the price matrix", invalidate_price_matrix),
+        ("invalidating candles", lambda: invalidate_candles(changes)),
+        ("updating rolling statistics", update_rolling_stats),
+        # Only the changed assets are evaluated, against the variations refreshed with their prices
+        ("evaluating alerts", lambda: evaluate_alerts(symbols)),
+    ]
+
+    # The prices are already committed: a failing hook must not stop the others
+    for description, hook in hooks:
+        try:
+            hook()
+        except Exception as e:
+            logger.error(f"Error {description} after storing prices: {e}")
+
+
+def bulk_upsert_prices(db: Session, rows: List[tuple[str, str, float]]) -> List[Dict[str, Any]]:
+    """
+    Inserts or updates many asset prices with a single UPSERT statement and one commit.
+    The materialized variations of the affected assets are refreshed in the same transaction.
+
+    Args:
+    ----
+        db: Database session.
+        rows: List of (symbol, date, price) tuples.
+
+    Returns:
+    -------
+        List with one outcome per row: its symbol, date, price and a status of
+        'inserted', 'updated', 'unchanged' or 'failed'.
+    """
+    if not rows:
+        return []
+
+    rows = [(symbol.upper(), str(date), float(price)) for symbol, date, price in rows]
+
+    try:
+        # Look up the stored prices of all affected (symbol, date) pairs in one query
+        query_existing = text("""
+            SELECT symbol, date, price FROM assets
+            WHERE symbol IN :symbols AND date BETWEEN :first_date AND :last_date
+        """).bindparams(bindparam("symbols", expanding=True))
+        existing = {
+            (row[0], str(row[1])): row[2]
+            for row in db.execute(query_existing, {
+                "symbols": sorted({row[0] for row in rows}),
+                "first_date": min(row[1] for row in rows),
+                "last_date": max(row[1] for row in rows),
+            })
+        }
+
+        outcomes = []
+        changes = {}
+        for symbol, date, price in rows:
+            stored = changes.get((symbol, date), existing.get((symbol, date)))
+            if stored is None:
+                status = "inserted"
+            elif stored == price:
+                status = "unchanged"
+            else:
+                status = "updated"
+
+            if status != "unchanged":
+                changes[(symbol, date)] = price
+            outcomes.append({"symbol": symbol, "date": date, "price": price, "status": status})
+
+        if changes:
+            query_upsert = text("""
+                INSERT INTO assets (symbol, date, price)
+                VALUES (:symbol, :date, :price)
+                ON CONFLICT(symbol, date) DO UPDATE SET price = excluded.price
+            """)
+            db.execute(query_upsert, [
+                {"symbol": symbol, "date": date, "price": price}
+                for (symbol, date), price in changes.items()
+            ])
+            refresh_variations(db, sorted({symbol for symbol, _ in changes}))
+            db.commit()
+    except Exception as e:
+        logger.error(f"Error upserting {len(rows)} prices: {e}")
+        db.rollback()
+        return [{"symbol": symbol, "date": date, "price": price, "status": "failed"}
+                for symbol, date, price in rows]
+
+    if changes:
+        _on_prices_stored(changes)
+
+    logger.info(f"Stored {len(changes)} prices ({len(rows) - len(changes)} unchanged)")
+    return outcomes
+
+
 def insert_price(db: Session, symbol: str, price: float, date: str) -> bool:
     """
     Inserts or updates the price of an asset in the database.
@@ -79,34 +209,118 @@ def insert_price(db: Session, symbol: str, price: float, date: str) -> bool:
     -------
         True if operation was successful, False otherwise.
     """
-    try:
-        # Try to update first
-        query_update = text("""
-            UPDATE assets 
-            SET price = :price 
-            WHERE symbol = :symbol AND date = :date
-        """)
-        result = db.execute(query_update, {"symbol": symbol.upper(), "date": date, "price": price})
-        db.commit()
-
-        # If no record was updated, it doesn't exist and needs to be inserted
-        if result.rowcount == 0:
-            logger.info(f"No existing price for {symbol} on {date}, inserting new record.")
-            query_insert = text("""
-                INSERT INTO assets (symbol, date, price) 
-                VALUES (:symbol, :date, :price)
-            """)
-            db.execute(query_insert, {"symbol": symbol.upper(), "date": date, "price": price})
-            db.commit()
-            logger.info(f"Inserted new price for {symbol} on {date}: {price}")
-        else:
-            logger.info(f"Updated price for {symbol} on {date}: {price}")
+    outcome = bulk_upsert_prices(db, [(symbol, date, price)])[0]
+    if outcome["status"] == "failed":
+        return False
+
+    logger.info(f"Price for {symbol} on {date} {outcome['status']}: {price}")
+    return True
+
+
+def get_prices_as_of(assets: List[str], horizons: List[int]) -> Dict[str, Dict[str, Any]]:
+    """
+    Retrieves the latest price of each asset and its price as of each horizon
+    (number of days ago) in a single SQL statement.
 
-        return True
+    Args:
+    ----
+        assets: List of asset symbols.
+        horizons: Numbers of days to look back.
+
+    Returns:
+    -------
+        Dictionary keyed by symbol with the latest 'price' and a 'past_prices'
+        dictionary keyed by horizon. Assets without prices are omitted.
+    """
+    if not assets or not horizons:
+        return {}
+
+    now = datetime.now()
+    params: Dict[str, Any] = {"symbols": list(assets)}
+    values = []
+    for position, days in enumerate(horizons):
+        params[f"days_{position}"] = days
+        params[f"date_{position}"] = (now - timedelta(days=days)).strftime('%Y-%m-%d')
+        values.append(f"(:days_{position}, :date_{position})")
+
+    query = text(f"""
+        WITH horizons(days, past_date) AS (VALUES {", ".join(values)}),
+        latest AS (
+            SELECT a.symbol, a.price FROM assets a
+            WHERE a.symbol IN :symbols
+              AND a.date = (SELECT MAX(b.date) FROM assets b WHERE b.symbol = a.symbol)
+        )
+        SELECT l.symbol, l.price, h.days,
+               (SELECT p.price FROM assets p
+                WHERE p.symbol = l.symbol AND p.date <= h.past_date
+                ORDER BY p.date DESC LIMIT 1) AS past_price
+        FROM latest l CROSS JOIN horizons h
+    """).bindparams(bindparam("symbols", expanding=True))
+
+    prices: Dict[str, Dict[str, Any]] = {}
+    with SessionLocal() as db:
+        for symbol, price, days, past_price in db.execute(query, params):
+            entry = prices.setdefault(symbol, {"price": float(price), "past_prices": {}})
+            entry["past_prices"][days] = float(past_price) if past_price is not None else None
+
+    return prices
+
+
+def _build_variations(prices: Dict[str, Dict[str, Any]], assets: List[str],
+                      horizons: List[int]) -> Dict[int, List[dict]]:
+    """
+    Builds per-horizon variation lists from latest and as-of prices.
+
+    Args:
+    ----
+        prices: Prices as returned by get_prices_as_of.
+        assets: List of asset symbols.
+        horizons: Numbers of days for the variation calculation.
+
+    Returns:
+    -------
+        Dictionary keyed by horizon with lists of dictionaries containing symbol and variation.
+    """
+    variations: Dict[int, List[dict]] = {}
+    for days in horizons:
+        variations[days] = []
+        for symbol in assets:
+            entry = prices.get(symbol)
+            current_price = entry["price"] if entry else None
+            past_price = entry["past_prices"].get(days) if entry else None
+
+            logger.debug(f"{symbol} - Current price: {current_price}, Price {days} days ago: {past_price}")
+
+            if current_price is not None and past_price:
+                variation = ((current_price - past_price) / past_price) * 100
+                variations[days].append({"symbol": symbol, "variation": variation})
+            else:
+                variations[days].append({"symbol": symbol, "variation": None})
+
+    return variations
+
+
+def calculate_variations_multi(assets: List[str], horizons: List[int]) -> Dict[int, List[dict]]:
+    """
+    Calculate percentage variations for asset prices over several horizons with a single query.
+
+    Args:
+    ----
+        assets: List of asset symbols.
+        horizons: Numbers of days for the variation calculation.
+
+    Returns:
+    -------
+        Dictionary keyed by horizon with lists of dictionaries containing symbol and variation,
+        in the same shape as calculate_variations.
+    """
+    try:
+        prices = get_prices_as_of(assets, horizons)
     except Exception as e:
-        logger.error(f"Error inserting/updating price for {symbol} on {date}: {e}")
-        db.rollback()
-        return False
+        logger.error(f"Error calculating variations: {e}")
+        prices = {}
+
+    return _build_variations(prices, assets, horizons)
 
 
 def calculate_variations(assets: List[str], days: int) -> List[dict]:
@@ -122,31 +336,38 @@ def calculate_variations(assets: List[str], days: int) -> List[dict]:
     -------
         List of dictionaries containing symbol and variation.
     """
-    variations = []
-    db = SessionLocal()
-    try:
-        for symbol in assets:
-            current_price = get_current_price_db(symbol)
-            past_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-            past_price = get_price_by_date(db, symbol, past_date)
+    return calculate_variations_multi(assets, [days])[days]
 
-            logger.debug(
-                f"{symbol} - Current price: {current_price}, Price {days} days ago ({past_date}): {past_price}")
 
-            if current_price is not None and past_price is not None:
-                variation = ((current_price - past_price) / past_price) * 100
-                variations.append({"symbol": symbol, "variation": variation})
-            else:
-                variations.append({"symbol": symbol, "variation": None})
-    finally:
-        db.close()
+def _store_observed_prices(db: Session, prices: Dict[str, float], date: str) -> List[Dict[str, Any]]:
+    """
+    Stores prices just fetched from the provider as the daily prices of a date,
+    keeping each stored observation in the intraday series.
 
-    return variations
+    Args:
+    ----
+        db: Database session.
+        prices: Fetched prices by symbol.
+        date: Date for the daily price records.
+
+    Returns:
+    -------
+        List with one outcome per price, as returned by bulk_upsert_prices.
+    """
+    outcomes = bulk_upsert_prices(db, [(symbol, date, price) for symbol, price in prices.items()])
+
+    observed_at = int(datetime.now().timestamp())
+    record_intraday_prices(db, [
+        (outcome["symbol"], observed_at, outcome["price"])
+        for outcome in outcomes if outcome["status"] != "failed"
+    ])
+    return outcomes
 
 
 def update_single_price(symbol: str, price: float, date: str) -> bool:
     """
-    Updates a single asset price in the database.
+    Updates a single asset price just fetched from the provider in the database,
+    also recording it in the intraday series.
 
     Args:
     ----
@@ -158,88 +379,105 @@ def update_single_price(symbol: str, price: float, date: str) -> bool:
     -------
         True if successful, False otherwise.
     """
-    db = SessionLocal()
-    try:
-        return insert_price(db, symbol, price, date)
-    finally:
-        db.close()
+    with SessionLocal() as db:
+        outcome = _store_observed_prices(db, {symbol: price}, date)[0]
+
+    if outcome["status"] == "failed":
+        return False
 
+    logger.info(f"Price for {outcome['symbol']} on {date} {outcome['status']}: {price}")
+    return True
 
-def update_prices_efficiently(force_update: bool = False) -> Dict[str, Any]:
+
+def _get_symbols_to_update(force_update: bool, today: str) -> List[str]:
     """
-    Updates asset prices in the database.
+    Determines which assets need a price update.
 
     Args:
     ----
-        force_update: Whether to force update even if prices exist for today.
+        force_update: Whether to update all assets even if prices exist for today.
+        today: Date of the update.
+
+    Returns:
+    -------
+        List of symbols to update.
+    """
+    if force_update:
+        # If forcing update, update all symbols
+        logger.info(f"Force update requested for all assets: {', '.join(ASSETS)}")
+        return ASSETS.copy()
+
+    # If not forcing, only update those without today's price
+    symbols_to_update = []
+    with SessionLocal() as db:
+        for symbol in ASSETS:
+            query = text("""
+                SELECT COUNT(*) FROM assets 
+                WHERE symbol = :symbol AND date = :date
+            """)
+            result = db.execute(query, {"symbol": symbol, "date": today}).scalar()
+
+            if result == 0:
+                symbols_to_update.append(symbol)
+
+    return symbols_to_update
+
+
+def _refresh_key(symbols: List[str], today: str) -> tuple:
+    """
+    Builds the single-flight key of a price refresh.
+
+    Args:
+    ----
+        symbols: Symbols being refreshed.
+        today: Date of the refresh.
+
+    Returns:
+    -------
+        Key shared by refreshes of the same symbol set on the same day.
+    """
+    return "refresh", today, tuple(sorted(symbols))
+
+
+def _store_fetched_prices(symbols: List[str], prices: Dict[str, float | None], today: str,
+                          force_update: bool) -> Dict[str, Any]:
+    """
+    Stores fetched prices and builds the update results summary.
+
+    Args:
+    ----
+        symbols: Symbols that were requested.
+        prices: Fetched prices by symbol (None when not available).
+        today: Date for the price records.
+        force_update: Whether the update was forced.
 
     Returns:
     -------
         Dictionary with results summary.
     """
-    import time
-    from services.yahoo_finance import get_current_price as yahoo_get_current_price
+    failed_symbols = [symbol for symbol in symbols if prices.get(symbol) is None]
+    for symbol in failed_symbols:
+        logger.warning(f"Could not get a valid price for {symbol}")
 
-    today = datetime.now().strftime('%Y-%m-%d')
+    fetched = [symbol for symbol in symbols if prices.get(symbol) is not None]
+
+    # Write all fetched prices in a single transaction, keeping each observation in the intraday series
+    with SessionLocal() as db:
+        outcomes = _store_observed_prices(db, {symbol: prices[symbol] for symbol in fetched}, today)
 
-    # Determine which symbols need updating
-    symbols_to_update = []
-    db = SessionLocal()
-    try:
-        if force_update:
-            # If forcing update, update all symbols
-            symbols_to_update = ASSETS.copy()
-            logger.info(f"Force update requested for all assets: {', '.join(symbols_to_update)}")
-        else:
-            # If not forcing, only update those without today's price
-            for symbol in ASSETS:
-                query = text("""
-                    SELECT COUNT(*) FROM assets 
-                    WHERE symbol = :symbol AND date = :date
-                """)
-                result = db.execute(query, {"symbol": symbol, "date": today}).scalar()
-
-                if result == 0:
-                    symbols_to_update.append(symbol)
-
-            if not symbols_to_update:
-                logger.info(f"All assets already have prices for today ({today}). No update needed.")
-                return {"status": "no_update_needed", "message": "All assets already have prices for today"}
-    finally:
-        db.close()
-
-    logger.info(f"Fetching prices for {len(symbols_to_update)} assets: {', '.join(symbols_to_update)}")
-
-    # Get current prices one by one
     success_count = 0
-    failed_symbols = []
-
-    for symbol in symbols_to_update:
-        # Add delay between queries to avoid rate limits
-        if symbol != symbols_to_update[0]:  # Don't wait for the first symbol
-            wait_time = 5  # Wait 5 seconds between requests
-            logger.info(f"Waiting {wait_time} seconds before requesting the next symbol...")
-            time.sleep(wait_time)
-
-        logger.info(f"Fetching price for {symbol}...")
-        price = yahoo_get_current_price(symbol)
-
-        if price is not None:
-            # Update price in database
-            if update_single_price(symbol, price, today):
-                success_count += 1
-                logger.info(f"Successfully updated price for {symbol}: {price:.2f} USD")
-            else:
-                failed_symbols.append(symbol)
-                logger.error(f"Failed to save price for {symbol} in database")
+    for outcome in outcomes:
+        if outcome["status"] != "failed":
+            success_count += 1
+            logger.info(f"Successfully updated price for {outcome['symbol']}: {outcome['price']:.2f} USD")
         else:
-            failed_symbols.append(symbol)
-            logger.warning(f"Could not get a valid price for {symbol}")
+            failed_symbols.append(outcome["symbol"])
+            logger.error(f"Failed to save price for {outcome['symbol']} in database")
 
     # Generate results summary
     results = {
         "status": "success" if success_count > 0 else "error",
-        "total_assets": len(symbols_to_update),
+        "total_assets": len(symbols),
         "updated_successfully": success_count,
         "failed_assets": len(failed_symbols),
         "failed_symbols": failed_symbols,
@@ -248,13 +486,96 @@ def update_prices_efficiently(force_update: bool = False) -> Dict[str, Any]:
     }
 
     if success_count > 0:
-        logger.info(f"Successfully updated {success_count} out of {len(symbols_to_update)} assets")
+        logger.info(f"Successfully updated {success_count} out of {len(symbols)} assets")
     else:
         logger.error("Failed to update any asset prices")
 
     return results
 
 
+def update_prices_efficiently(force_update: bool = False, batch: bool = True) -> Dict[str, Any]:
+    """
+    Updates asset prices in the database.
+
+    Args:
+    ----
+        force_update: Whether to force update even if prices exist for today.
+        batch: Whether to fetch all symbols in a single upstream request instead
+            of one request per symbol.
+
+    Returns:
+    -------
+        Dictionary with results summary. Concurrent refreshes of the same assets
+        (from any thread) share one fetch and receive the same summary.
+    """
+    import time
+    from services.price_providers import get_price_provider
+
+    provider = get_price_provider()
+    today = datetime.now().strftime('%Y-%m-%d')
+
+    # Determine which symbols need updating
+    symbols_to_update = _get_symbols_to_update(force_update, today)
+    if not symbols_to_update:
+        logger.info(f"All assets already have prices for today ({today}). No update needed.")
+        return {"status": "no_update_needed", "message": "All assets already have prices for today"}
+
+    def fetch_and_store() -> Dict[str, Any]:
+        logger.info(f"Fetching prices for {len(symbols_to_update)} assets: {', '.join(symbols_to_update)}")
+
+        if batch:
+            # Get all prices in one round trip
+            prices, _ = provider.get_prices(symbols_to_update)
+        else:
+            # Get current prices one by one
+            prices = {}
+            for symbol in symbols_to_update:
+                # Add delay between queries to avoid rate limits
+                if symbol != symbols_to_update[0]:  # Don't wait for the first symbol
+                    wait_time = 5  # Wait 5 seconds between requests
+                    logger.info(f"Waiting {wait_time} seconds before requesting the next symbol...")
+                    time.sleep(wait_time)
+
+                logger.info(f"Fetching price for {symbol}...")
+                prices[symbol] = provider.get_current_price(symbol)
+
+        return _store_fetched_prices(symbols_to_update, prices, today, force_update)
+
+    return _refresh_flight.do(_refresh_key(symbols_to_update, today), fetch_and_store)
+
+
+async def update_prices_async(force_update: bool = False) -> Dict[str, Any]:
+    """
+    Updates asset prices in the database, fetching all symbols concurrently
+    (for Yahoo Finance, under the configured token-bucket rate limit).
+
+    Args:
+    ----
+        force_update: Whether to force update even if prices exist for today.
+
+    Returns:
+    -------
+        Dictionary with results summary, same as update_prices_efficiently.
+        Concurrent refreshes of the same assets share one fetch.
+    """
+    import asyncio
+    from services.price_providers import get_price_provider
+
+    today = datetime.now().strftime('%Y-%m-%d')
+
+    symbols_to_update = await asyncio.to_thread(_get_symbols_to_update, force_update, today)
+    if not symbols_to_update:
+        logger.info(f"All assets already have prices for today ({today}). No update needed.")
+        return {"status": "no_update_needed", "message": "All assets already have prices for today"}
+
+    async def fetch_and_store() -> Dict[str, Any]:
+        logger.info(f"Fetching prices concurrently for {len(symbols_to_update)} assets: {', '.join(symbols_to_update)}")
+        prices = await get_price_provider().get_prices_async(symbols_to_update)
+        return await asyncio.to_thread(_store_fetched_prices, symbols_to_update, prices, today, force_update)
+
+    return await _refresh_flight.do_async(_refresh_key(symbols_to_update, today), fetch_and_store)
+
+
 def update_all_prices() -> Dict[str, Any]:
     """
     Updates all asset prices and stores them in the database.
@@ -266,7 +587,7 @@ def update_all_prices() -> Dict[str, Any]:
     return update_prices_efficiently(force_update=True)
 
 
-def get_asset_prices_and_variations(force_update: bool = True) -> Dict[str, Any]:
+def get_asset_prices_and_variations(force_update: bool = False) -> Dict[str, Any]:
     """
     Gets current prices and variations for all assets.
 
@@ -284,18 +605,14 @@ def get_asset_prices_and_variations(force_update: bool = True) -> Dict[str, Any]
         update_results = update_prices_efficiently(force_update=force_update)
         logger.info(f"Update completed: {update_results['updated_successfully']} prices updated")
 
-    # Get current prices from database
-    current_prices = {}
-    for symbol in ASSETS:
-        price = get_current_price_db(symbol)
-        if price is not None:
-            current_prices[symbol] = price
-
-    # Calculate variations
+    # Get current prices and variations from database in one query
     logger.info("Calculating variations...")
-    daily_variations = calculate_variations(ASSETS, 1)
-    weekly_variations = calculate_variations(ASSETS, 7)
-    monthly_variations = calculate_variations(ASSETS, 30)
+    prices = get_prices_as_of(ASSETS, [1, 7, 30])
+    current_prices = {symbol: entry["price"] for symbol, entry in prices.items()}
+    variations = _build_variations(prices, ASSETS, [1, 7, 30])
+    daily_variations = variations[1]
+    weekly_variations = variations[7]
+    monthly_variations = variations[30]
 
     # Organize results
     result = {
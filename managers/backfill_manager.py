@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+from typing import List, Dict, Any
+from sqlalchemy import text
+from loguru import logger
+
+from config import ASSETS, BACKFILL_YEARS
+from db.database import SessionLocal
+from managers.assets_manager import bulk_upsert_prices
+
+
+def get_last_stored_date(symbol: str) -> str | None:
+    """
+    Retrieves the most recent date stored for an asset.
+
+    Args:
+    ----
+        symbol: Asset symbol.
+
+    Returns:
+    -------
+        Last stored date (YYYY-MM-DD) or None if the asset has no prices.
+    """
+    with SessionLocal() as db:
+        result = db.execute(
+            text("SELECT MAX(date) FROM assets WHERE symbol = :symbol"),
+            {"symbol": symbol},
+        ).scalar()
+        return str(result) if result is not None else None
+
+
+def backfill_symbol(symbol: str, years: int = BACKFILL_YEARS) -> int | None:
+    """
+    Backfills the daily price history of an asset in one upstream request.
+    Resumes from the last stored date; assets without data get `years` years of history.
+    All rows are written with a single bulk upsert inside one transaction.
+
+    Args:
+    ----
+        symbol: Asset symbol.
+        years: Years of history to retrieve when the asset has no stored prices.
+
+    Returns:
+    -------
+        Number of rows written (0 if the stored history was already up to date),
+        or None if no history was retrieved for an asset without stored prices or
+        it could not be stored.
+    """
+    from services.price_providers import get_price_provider
+
+    # The last stored day is fetched again since it may hold an intraday price
+    last_stored = get_last_stored_date(symbol)
+    start = last_stored or (datetime.now() - timedelta(days=365 * years)).strftime('%Y-%m-%d')
+
+    logger.info(f"Backfilling {symbol} from {start}...")
+    history = get_price_provider().get_history(symbol, start=start, years=years)
+    if not history:
+        if last_stored is not None:
+            # No newer closes yet (e.g. weekends), the stored history is up to date
+            logger.info(f"No new history to backfill for {symbol} after {last_stored}")
+            return 0
+        logger.warning(f"No history to backfill for {symbol}")
+        return None
+
+    db = SessionLocal()
+    try:
+        outcomes = bulk_upsert_prices(db, [(symbol, date, price) for date, price in history])
+    finally:
+        db.close()
+
+    if any(outcome["status"] == "failed" for outcome in outcomes):
+        logger.error(f"Error backfilling prices for {symbol}")
+        return None
+
+    written = sum(1 for outcome in outcomes if outcome["status"] in ("inserted", "updated"))
+    logger.info(f"Backfilled {written} prices for {symbol} ({history[0][0]} to {history[-1][0]})")
+    return written
+
+
+def backfill_prices(symbols: List[str] | None = None, years: int = BACKFILL_YEARS) -> Dict[str, Any]:
+    """
+    Backfills the daily price history of several assets.
+
+    Args:
+    ----
+        symbols: Asset symbols to backfill (defaults to all tracked assets).
+        years: Years of history to retrieve for assets without stored prices.
+
+    Returns:
+    -------
+        Dictionary with results summary.
+    """
+    symbols = symbols or ASSETS.copy()
+    rows_by_symbol = {}
+    failed_symbols = []
+
+    for symbol in symbols:
+        rows = backfill_symbol(symbol, years)
+        rows_by_symbol[symbol] = rows or 0
+        if rows is None:
+            failed_symbols.append(symbol)
+
+    total_rows = sum(rows_by_symbol.values())
+    logger.info(f"Backfill completed: {total_rows} prices written for {len(symbols)} assets")
+
+    return {
+        # Assets already up to date are not errors
+        "status": "success" if len(failed_symbols) < len(symbols) else "error",
+        "total_assets": len(symbols),
+        "rows_written": total_rows,
+        "rows_by_symbol": rows_by_symbol,
+        "failed_symbols": failed_symbols,
+        "years": years
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backfill daily price history for tracked assets")
+    parser.add_argument("symbols", nargs="*", help="Symbols to backfill (default: all tracked assets)")
+    parser.add_argument("--years", type=int, default=BACKFILL_YEARS,
+                        help="Years of history for assets without stored prices")
+    args = parser.parse_args()
+
+    print(backfill_prices(args.symbols or None, args.years))
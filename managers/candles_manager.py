@@ -0,0 +1,140 @@
+import threading
+from datetime import date, datetime
+from typing import List, Dict, Any
+
+from sqlalchemy import text
+from loguru import logger
+
+from db.database import SessionLocal
+
+# SQL expression giving the first day of the bucket of each stored date
+BUCKET_EXPRESSIONS = {
+    "1w": "date(date, '-6 days', 'weekday 1')",
+    "1mo": "strftime('%Y-%m-01', date)",
+    "1q": "printf('%s-%02d-01', strftime('%Y', date), (CAST(strftime('%m', date) AS INTEGER) - 1) / 3 * 3 + 1)",
+}
+
+# Finished candles of each (symbol, interval), with the bucket they were finished before
+_finished: Dict[tuple[str, str], Dict[str, Any]] = {}
+_generations: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def bucket_start(day: date, interval: str) -> str:
+    """
+    Returns the first day of the bucket a date belongs to.
+
+    Args:
+    ----
+        day: Date to place in a bucket.
+        interval: Candle interval ('1w', '1mo' or '1q').
+
+    Returns:
+    -------
+        First day of the bucket (YYYY-MM-DD).
+    """
+    if interval == "1w":
+        return date.fromordinal(day.toordinal() - day.weekday()).isoformat()
+    if interval == "1mo":
+        return day.replace(day=1).isoformat()
+    return day.replace(month=(day.month - 1) // 3 * 3 + 1, day=1).isoformat()
+
+
+def _query_candles(symbol: str, interval: str, since: str | None) -> List[Dict[str, Any]]:
+    # One window-function pass: every row of a bucket sees the whole bucket
+    query = text(f"""
+        WITH bucketed AS (
+            SELECT {BUCKET_EXPRESSIONS[interval]} AS bucket, date, price
+            FROM assets
+            WHERE symbol = :symbol AND (:since IS NULL OR date >= :since)
+        )
+        SELECT DISTINCT
+            bucket,
+            FIRST_VALUE(price) OVER w AS open,
+            MAX(price) OVER w AS high,
+            MIN(price) OVER w AS low,
+            LAST_VALUE(price) OVER w AS close,
+            COUNT(*) OVER w AS count
+        FROM bucketed
+        WINDOW w AS (PARTITION BY bucket ORDER BY date ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING)
+        ORDER BY bucket
+    """)
+
+    with SessionLocal() as db:
+        rows = db.execute(query, {"symbol": symbol, "since": since}).fetchall()
+
+    return [
+        {"start": row[0], "open": row[1], "high": row[2], "low": row[3], "close": row[4], "count": row[5]}
+        for row in rows
+    ]
+
+
+def get_candles(symbol: str, interval: str) -> List[Dict[str, Any]]:
+    """
+    Aggregates the stored prices of an asset into open/high/low/close/count candles.
+    Finished buckets (before the current one) are cached, so only the buckets
+    finished or started since the last call are read from the database.
+
+    Args:
+    ----
+        symbol: Asset symbol.
+        interval: Candle interval ('1w', '1mo' or '1q').
+
+    Returns:
+    -------
+        List of candles ordered by bucket start date.
+    """
+    if interval not in BUCKET_EXPRESSIONS:
+        raise ValueError(f"Unsupported interval '{interval}'")
+
+    key = (symbol, interval)
+    current = bucket_start(datetime.now().date(), interval)
+
+    with _lock:
+        entry = _finished.get(key)
+        generation = _generations.get(symbol, 0)
+        cached = list(entry["candles"]) if entry else []
+        since = entry["until"] if entry else None
+
+    fresh = _query_candles(symbol, interval, since)
+    candles = cached + fresh
+    finished = [candle for candle in candles if candle["start"] < current]
+
+    with _lock:
+        # Keep them only if no prices of the asset were written while querying
+        if _generations.get(symbol, 0) == generation:
+            _finished[key] = {"candles": finished, "until": current}
+
+    logger.debug(f"Candles {symbol} {interval}: {len(cached)} cached, {len(fresh)} queried")
+    return candles
+
+
+def invalidate_candles(changes: Dict[tuple[str, str], float]) -> None:
+    """
+    Drops the cached candles of assets whose stored prices changed inside a
+    finished bucket (backfills and corrections of past dates).
+
+    Args:
+    ----
+        changes: Stored prices keyed by (symbol, date).
+
+    Returns:
+    -------
+        None
+    """
+    with _lock:
+        for symbol in {symbol for symbol, _ in changes}:
+            _generations[symbol] = _generations.get(symbol, 0) + 1
+
+        for (symbol, interval), entry in list(_finished.items()):
+            if any(changed == symbol and day < entry["until"] for changed, day in changes):
+                del _finished[(symbol, interval)]
+
+
+def clear_candles() -> None:
+    """
+    Drops every cached candle.
+    """
+    with _lock:
+        _finished.clear()
+        _generations.clear()
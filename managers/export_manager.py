@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+from typing import List, Dict, Any, Iterator
+
+from sqlalchemy import text
+from loguru import logger
+
+from config import EXPORT_CHUNK_ROWS
+from db.database import SessionLocal
+
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _format_chunk(rows: List[tuple], export_format: str) -> str:
+    if export_format == "ndjson":
+        return "".join(
+            json.dumps({"symbol": symbol, "date": str(date), "price": price}) + "\n"
+            for symbol, date, price in rows
+        )
+
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue()
+
+
+def iter_price_history(
+        symbols: List[str] | None = None,
+        start: str | None = None,
+        end: str | None = None,
+        export_format: str = "csv",
+) -> Iterator[str]:
+    """
+    Streams stored prices as CSV or NDJSON text chunks, ordered by symbol and date.
+    Each chunk of EXPORT_CHUNK_ROWS rows is read in its own short session, resuming
+    after the last (symbol, date) sent, so no read transaction is held open while
+    the client consumes the stream and price writes are never blocked by an export.
+
+    Args:
+    ----
+        symbols: Asset symbols to export (default: every stored asset).
+        start: First date to export (YYYY-MM-DD, default: no lower bound).
+        end: Last date to export (YYYY-MM-DD, default: no upper bound).
+        export_format: Output format, 'csv' or 'ndjson'.
+
+    Yields:
+    ------
+        Formatted chunks of rows (the CSV header first).
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{export_format}'")
+
+    if export_format == "csv":
+        yield "symbol,date,price\n"
+
+    # Only the predicates that apply are added, so every chunk seeks the unique
+    # (symbol, date) index right after the last row sent
+    bounds = []
+    params: Dict[str, Any] = {"chunk_rows": EXPORT_CHUNK_ROWS, "start": start}
+    if end is not None:
+        bounds.append("date <= :end")
+        params["end"] = end
+
+    if symbols:
+        # One symbol at a time, so chunks never revisit the rows of earlier symbols
+        segments = [(["symbol = :symbol"], "date > :last_date", {"symbol": symbol})
+                    for symbol in sorted(set(symbols))]
+    else:
+        segments = [([], "(symbol, date) > (:last_symbol, :last_date)", {})]
+
+    exported = 0
+    for filters, resume_after, segment_params in segments:
+        resume = False
+        while True:
+            where = filters + ([resume_after] if resume else []) + bounds
+            # Within one symbol, the last row sent is already a tighter lower bound than the start date
+            if start is not None and not (resume and filters):
+                where.append("date >= :start")
+            query = text(f"""
+                SELECT symbol, date, price
+                FROM assets
+                {"WHERE " + " AND ".join(where) if where else ""}
+                ORDER BY symbol, date
+                LIMIT :chunk_rows
+            """)
+            with SessionLocal() as db:
+                rows = [tuple(row) for row in db.execute(query, {**params, **segment_params}).fetchall()]
+            if not rows:
+                break
+
+            exported += len(rows)
+            yield _format_chunk(rows, export_format)
+
+            if len(rows) < EXPORT_CHUNK_ROWS:
+                break
+            params["last_symbol"], params["last_date"] = rows[-1][0], rows[-1][1]
+            resume = True
+
+    logger.info(f"Exported {exported} prices as {export_format}")
@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta
+from typing import List, Dict, Any
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from loguru import logger
+
+from config import INTRADAY_RETENTION_DAYS
+from db.database import SessionLocal
+
+
+def record_intraday_prices(db: Session, rows: List[tuple[str, int, float]]) -> bool:
+    """
+    Stores timestamped intraday prices.
+
+    Args:
+    ----
+        db: Database session.
+        rows: List of (symbol, epoch timestamp, price) tuples.
+
+    Returns:
+    -------
+        True if operation was successful, False otherwise.
+    """
+    if not rows:
+        return True
+
+    try:
+        db.execute(text("""
+            INSERT INTO intraday_prices (symbol, ts, price)
+            VALUES (:symbol, :ts, :price)
+            ON CONFLICT(symbol, ts) DO UPDATE SET price = excluded.price
+        """), [{"symbol": symbol.upper(), "ts": int(ts), "price": float(price)} for symbol, ts, price in rows])
+        db.commit()
+        return True
+    except Exception as e:
+        logger.error(f"Error storing {len(rows)} intraday prices: {e}")
+        db.rollback()
+        return False
+
+
+def get_intraday_prices(symbol: str, start_ts: int, end_ts: int) -> List[Dict[str, Any]]:
+    """
+    Retrieves the intraday prices of an asset within a time range.
+
+    Args:
+    ----
+        symbol: Asset symbol.
+        start_ts: Start of the range (epoch seconds, inclusive).
+        end_ts: End of the range (epoch seconds, inclusive).
+
+    Returns:
+    -------
+        List of dictionaries with timestamp and price, ordered by time.
+    """
+    try:
+        with SessionLocal() as db:
+            rows = db.execute(text("""
+                SELECT ts, price FROM intraday_prices
+                WHERE symbol = :symbol AND ts BETWEEN :start_ts AND :end_ts
+                ORDER BY ts
+            """), {"symbol": symbol, "start_ts": start_ts, "end_ts": end_ts}).fetchall()
+
+        return [{"ts": row[0], "price": row[1]} for row in rows]
+    except Exception as e:
+        logger.error(f"Error retrieving intraday prices for {symbol}: {e}")
+        return []
+
+
+def rollup_intraday_prices(retention_days: int = INTRADAY_RETENTION_DAYS) -> Dict[str, Any]:
+    """
+    Rolls intraday prices older than the retention window up into daily closes.
+    The last observation of each day is stored in the assets table, unless a daily
+    close was already stored for it (e.g. by a backfill), and the intraday rows of
+    those days are deleted.
+
+    Args:
+    ----
+        retention_days: Number of days (including today) of intraday data to keep.
+
+    Returns:
+    -------
+        Dictionary with results summary.
+    """
+    from managers.assets_manager import bulk_upsert_prices
+
+    # Whole local days before the retention window are rolled up
+    cutoff_day = (datetime.now() - timedelta(days=retention_days - 1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    cutoff_ts = int(cutoff_day.timestamp())
+
+    db = SessionLocal()
+    try:
+        closes = db.execute(text("""
+            SELECT symbol, day, price FROM (
+                SELECT symbol, date(ts, 'unixepoch', 'localtime') AS day, price,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY symbol, date(ts, 'unixepoch', 'localtime') ORDER BY ts DESC
+                       ) AS position
+                FROM intraday_prices
+                WHERE ts < :cutoff_ts
+            ) AS closes
+            WHERE position = 1
+              AND NOT EXISTS (SELECT 1 FROM assets WHERE assets.symbol = closes.symbol AND assets.date = closes.day)
+        """), {"cutoff_ts": cutoff_ts}).fetchall()
+
+        # Days that already have a daily close keep it, their intraday rows are only deleted
+        outcomes = bulk_upsert_prices(db, [(row[0], row[1], row[2]) for row in closes])
+        if any(outcome["status"] == "failed" for outcome in outcomes):
+            logger.error("Intraday rollup aborted: daily closes could not be stored")
+            return {"status": "error", "daily_closes": 0, "deleted_rows": 0}
+
+        deleted = db.execute(
+            text("DELETE FROM intraday_prices WHERE ts < :cutoff_ts"),
+            {"cutoff_ts": cutoff_ts},
+        ).rowcount
+        db.commit()
+
+        logger.info(f"Rolled up {deleted} intraday prices into {len(closes)} daily closes")
+        return {"status": "success", "daily_closes": len(closes), "deleted_rows": deleted}
+    except Exception as e:
+        logger.error(f"Error rolling up intraday prices: {e}")
+        db.rollback()
+        return {"status": "error", "daily_closes": 0, "deleted_rows": 0}
+    finally:
+        db.close()
@@ -0,0 +1,169 @@
+import bisect
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Any
+from sqlalchemy import text
+
+from config import PRICE_CACHE_MAX_SYMBOLS, PRICE_CACHE_HISTORY_DAYS
+from db.database import SessionLocal
+
+
+class PriceCache:
+    """
+    Process-local LRU cache of the latest price and recent history of each asset.
+
+    Each entry holds every stored price from a cutoff date (`history_days` before the
+    load) onwards, plus the latest stored price. Entries are invalidated by the price
+    writers whenever a new row is stored for the asset.
+
+    Attributes:
+    ----------
+        max_symbols: Maximum number of cached assets before the least recently used is evicted.
+        history_days: Days of history kept per asset.
+        hits: Number of lookups answered from the cache.
+        misses: Number of lookups that loaded the asset from the database.
+        evictions: Number of entries evicted to respect max_symbols.
+    """
+
+    def __init__(self, max_symbols: int, history_days: int):
+        self.max_symbols = max_symbols
+        self.history_days = history_days
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, symbol: str) -> Dict[str, Any]:
+        cutoff = (datetime.now() - timedelta(days=self.history_days)).strftime('%Y-%m-%d')
+
+        with SessionLocal() as db:
+            rows = db.execute(
+                text("SELECT date, price FROM assets WHERE symbol = :symbol AND date >= :cutoff ORDER BY date"),
+                {"symbol": symbol, "cutoff": cutoff},
+            ).fetchall()
+
+            if rows:
+                latest = rows[-1]
+            else:
+                latest = db.execute(
+                    text("SELECT date, price FROM assets WHERE symbol = :symbol ORDER BY date DESC LIMIT 1"),
+                    {"symbol": symbol},
+                ).fetchone()
+
+        return {
+            "cutoff": cutoff,
+            "dates": [str(row[0]) for row in rows],
+            "prices": [float(row[1]) for row in rows],
+            "latest": (str(latest[0]), float(latest[1])) if latest is not None else None,
+        }
+
+    def _get_entry(self, symbol: str) -> Dict[str, Any]:
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is not None:
+                self._entries.move_to_end(symbol)
+                self.hits += 1
+                return entry
+
+            self.misses += 1
+            generation = self._generations.get(symbol, 0)
+
+        entry = self._load(symbol)
+
+        with self._lock:
+            # Don't cache data that a concurrent write has already made stale
+            if self._generations.get(symbol, 0) == generation:
+                self._entries[symbol] = entry
+                self._entries.move_to_end(symbol)
+                while len(self._entries) > self.max_symbols:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+
+        return entry
+
+    def get_latest(self, symbol: str) -> tuple[str, float] | None:
+        """
+        Retrieves the latest stored price of an asset.
+
+        Args:
+        ----
+            symbol: Asset symbol.
+
+        Returns:
+        -------
+            Tuple of (date, price) or None if the asset has no prices.
+        """
+        return self._get_entry(symbol)["latest"]
+
+    def get_price_as_of(self, symbol: str, date: str) -> tuple[bool, float | None]:
+        """
+        Retrieves the last stored price of an asset on or before a date, if the
+        cached history covers that date.
+
+        Args:
+        ----
+            symbol: Asset symbol.
+            date: Date (YYYY-MM-DD).
+
+        Returns:
+        -------
+            Tuple of (covered, price). When covered is False the caller must query the database.
+        """
+        entry = self._get_entry(symbol)
+
+        if date < entry["cutoff"]:
+            return False, None
+
+        position = bisect.bisect_right(entry["dates"], date)
+        if position == 0:
+            # Older prices may exist before the cached window
+            return False, None
+
+        return True, entry["prices"][position - 1]
+
+    def invalidate(self, symbols: list[str] | set[str]) -> None:
+        """
+        Drops the cached entries of the given assets.
+
+        Args:
+        ----
+            symbols: Asset symbols whose prices changed.
+        """
+        with self._lock:
+            for symbol in symbols:
+                self._generations[symbol] = self._generations.get(symbol, 0) + 1
+                self._entries.pop(symbol, None)
+
+    def clear(self) -> None:
+        """
+        Drops every cached entry.
+        """
+        with self._lock:
+            for symbol in self._entries:
+                self._generations[symbol] = self._generations.get(symbol, 0) + 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the cache effectiveness counters.
+
+        Returns:
+        -------
+            Dictionary with hits, misses, hit ratio, evictions and size.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_size": self.max_symbols,
+            }
+
+
+price_cache = PriceCache(PRICE_CACHE_MAX_SYMBOLS, PRICE_CACHE_HISTORY_DAYS)
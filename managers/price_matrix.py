@@ -0,0 +1,477 @@
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import List, Dict, Any
+
+import numpy as np
+from sqlalchemy import text
+from loguru import logger
+
+from config import CORRELATION_CACHE_SIZE, PRICE_SNAPSHOTS_ENABLED
+from db.database import SessionLocal
+from managers.snapshots_manager import load_snapshot_columns
+
+
+class PriceMatrix:
+    """
+    Dense symbols x dates matrix of stored prices, forward-filled over the union of
+    all stored dates, on which variations, returns and drawdowns are computed with
+    vectorized NumPy operations.
+
+    Attributes:
+    ----------
+        symbols: Asset symbols, one per row.
+        dates: Sorted stored dates (datetime64[D]), one per column.
+        prices: Forward-filled prices (NaN before an asset's first price).
+        observed: True where a price was actually stored for that symbol and date.
+    """
+
+    def __init__(self, symbols: List[str], dates: np.ndarray, prices: np.ndarray, observed: np.ndarray):
+        self.symbols = symbols
+        self.dates = dates
+        self.prices = prices
+        self.observed = observed
+        self._rows = {symbol: row for row, symbol in enumerate(symbols)}
+
+    @classmethod
+    def from_rows(cls, symbols: np.ndarray, dates: np.ndarray, prices: np.ndarray) -> "PriceMatrix":
+        """
+        Builds the matrix from parallel arrays of (symbol, date, price) observations.
+
+        Args:
+        ----
+            symbols: Symbol of each observation.
+            dates: Date of each observation (datetime64[D]).
+            prices: Price of each observation.
+
+        Returns:
+        -------
+            Price matrix.
+        """
+        unique_symbols, symbol_index = np.unique(symbols, return_inverse=True)
+        unique_dates, date_index = np.unique(dates, return_inverse=True)
+
+        raw = np.full((len(unique_symbols), len(unique_dates)), np.nan)
+        raw[symbol_index, date_index] = prices
+        observed = ~np.isnan(raw)
+
+        # Forward-fill: each column takes the last observed column of its row
+        columns = np.where(observed, np.arange(raw.shape[1]), 0)
+        np.maximum.accumulate(columns, axis=1, out=columns)
+        filled = raw[np.arange(raw.shape[0])[:, None], columns]
+
+        return cls([str(symbol) for symbol in unique_symbols], unique_dates, filled, observed)
+
+    @classmethod
+    def load(cls) -> "PriceMatrix":
+        """
+        Loads every stored price, from the memory-mapped snapshots when every
+        stored asset has an up-to-date one and from the database otherwise.
+
+        Returns:
+        -------
+            Price matrix.
+        """
+        if PRICE_SNAPSHOTS_ENABLED:
+            with SessionLocal() as db:
+                stored = {
+                    row[0]: (row[1], str(row[2]))
+                    for row in db.execute(text("SELECT symbol, COUNT(*), MAX(date) FROM assets GROUP BY symbol"))
+                }
+            columns = load_snapshot_columns(stored)
+            if columns is not None:
+                return cls.from_rows(*columns)
+
+        with SessionLocal() as db:
+            rows = db.execute(text("SELECT symbol, date, price FROM assets")).fetchall()
+
+        if not rows:
+            return cls([], np.array([], dtype="datetime64[D]"), np.empty((0, 0)), np.empty((0, 0), dtype=bool))
+
+        symbols, dates, prices = zip(*rows)
+        return cls.from_rows(
+            np.array(symbols),
+            np.array([str(date) for date in dates], dtype="datetime64[D]"),
+            np.array(prices, dtype=float),
+        )
+
+    def _as_of_columns(self, dates: np.ndarray) -> np.ndarray:
+        # Index of the last stored date on or before each date (-1 if none)
+        return np.searchsorted(self.dates, dates, side="right") - 1
+
+    def _prices_as_of(self, dates: np.ndarray) -> np.ndarray:
+        columns = self._as_of_columns(dates)
+        result = np.full((len(self.symbols), len(dates)), np.nan)
+        valid = columns >= 0
+        result[:, valid] = self.prices[:, columns[valid]]
+        return result
+
+    def _past_dates(self, horizons: List[int], as_of: datetime | None) -> np.ndarray:
+        reference = np.datetime64((as_of or datetime.now()).strftime('%Y-%m-%d'), "D")
+        return reference - np.asarray(horizons, dtype="timedelta64[D]")
+
+    def latest_prices(self) -> np.ndarray:
+        """
+        Returns the latest stored price of every symbol.
+
+        Returns:
+        -------
+            Array with one price per symbol.
+        """
+        if not self.dates.size:
+            return np.empty(0)
+        return self.prices[:, -1]
+
+    def variations(self, horizons: List[int], as_of: datetime | None = None) -> np.ndarray:
+        """
+        Computes percentage variations between the latest price and the price
+        `horizon` days before `as_of`, for every symbol and horizon at once.
+
+        Args:
+        ----
+            horizons: Numbers of days to look back.
+            as_of: Reference time (default: now).
+
+        Returns:
+        -------
+            Array of shape (symbols, horizons), NaN where not enough data is stored.
+        """
+        if not self.dates.size:
+            return np.full((len(self.symbols), len(horizons)), np.nan)
+
+        past = self._prices_as_of(self._past_dates(horizons, as_of))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return (self.latest_prices()[:, None] - past) / past * 100
+
+    def variations_between(self, starts: np.ndarray, end: np.datetime64) -> np.ndarray:
+        """
+        Computes percentage variations between the price as of each start date
+        and the price as of the end date, for every symbol at once.
+
+        Args:
+        ----
+            starts: Start dates (datetime64[D]).
+            end: End date (datetime64[D]).
+
+        Returns:
+        -------
+            Array of shape (symbols, starts), NaN where not enough data is stored.
+        """
+        if not self.dates.size:
+            return np.full((len(self.symbols), len(starts)), np.nan)
+
+        # Single lookup of every start date together with the end date
+        prices = self._prices_as_of(np.append(starts, end))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return (prices[:, -1:] - prices[:, :-1]) / prices[:, :-1] * 100
+
+    def prices_as_of(self, date: np.datetime64) -> np.ndarray:
+        """
+        Returns the last stored price on or before a date for every symbol.
+
+        Args:
+        ----
+            date: Reference date (datetime64[D]).
+
+        Returns:
+        -------
+            Array with one price per symbol, NaN where none is stored.
+        """
+        if not self.dates.size:
+            return np.full(len(self.symbols), np.nan)
+        return self._prices_as_of(np.array([date]))[:, 0]
+
+    def log_returns(self, horizons: List[int], as_of: datetime | None = None) -> np.ndarray:
+        """
+        Computes log returns between the latest price and the price `horizon` days
+        before `as_of`, for every symbol and horizon at once.
+
+        Args:
+        ----
+            horizons: Numbers of days to look back.
+            as_of: Reference time (default: now).
+
+        Returns:
+        -------
+            Array of shape (symbols, horizons), NaN where not enough data is stored.
+        """
+        if not self.dates.size:
+            return np.full((len(self.symbols), len(horizons)), np.nan)
+
+        past = self._prices_as_of(self._past_dates(horizons, as_of))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.log(self.latest_prices()[:, None] / past)
+
+    def aligned_returns(self, symbols: List[str], days: int) -> np.ndarray:
+        """
+        Computes daily returns of the given symbols over the last `days` days,
+        aligned on the dates where every one of them has a stored price.
+
+        Args:
+        ----
+            symbols: Asset symbols, all of them with stored prices.
+            days: Number of days of history to consider.
+
+        Returns:
+        -------
+            Array of shape (symbols, common dates - 1).
+        """
+        rows = [self._rows[symbol] for symbol in symbols]
+        if not rows or not self.dates.size:
+            return np.empty((len(rows), 0))
+
+        start = np.searchsorted(self.dates, self.dates[-1] - np.timedelta64(days, "D"), side="left")
+        common = self.observed[rows, start:].all(axis=0)
+        prices = self.prices[rows, start:][:, common]
+        return np.diff(prices, axis=1) / prices[:, :-1]
+
+    def drawdowns(self, days: int | None = None) -> Dict[str, np.ndarray]:
+        """
+        Computes the current and maximum drawdown (in percent, as negative numbers)
+        of every symbol over the last `days` days, or the full history.
+
+        Args:
+        ----
+            days: Number of days of history to consider (default: all).
+
+        Returns:
+        -------
+            Dictionary with 'current' and 'max' arrays holding one value per symbol.
+        """
+        prices = self.prices
+        if days is not None and self.dates.size:
+            start = np.searchsorted(self.dates, self.dates[-1] - np.timedelta64(days, "D"), side="left")
+            prices = prices[:, start:]
+
+        if not prices.size:
+            empty = np.full(len(self.symbols), np.nan)
+            return {"current": empty, "max": empty.copy()}
+
+        peaks = np.fmax.accumulate(prices, axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdowns = (prices - peaks) / peaks * 100
+
+        deepest = np.min(np.where(np.isnan(drawdowns), np.inf, drawdowns), axis=1)
+        return {"current": drawdowns[:, -1], "max": np.where(np.isinf(deepest), np.nan, deepest)}
+
+    def row(self, symbol: str) -> int | None:
+        """
+        Returns the row of a symbol, or None if it has no stored prices.
+        """
+        return self._rows.get(symbol)
+
+
+_matrix: PriceMatrix | None = None
+_matrix_version = 0
+_matrix_lock = threading.Lock()
+
+# Correlation results keyed by (days, assets, last stored date, matrix version), least recently used first
+_correlations: OrderedDict[tuple[int, tuple[str, ...], str, int], Dict[str, Any]] = OrderedDict()
+
+
+def get_price_matrix() -> PriceMatrix:
+    """
+    Returns the in-memory price matrix, loading it from the database when needed.
+
+    Returns:
+    -------
+        Price matrix reflecting the stored prices.
+    """
+    global _matrix
+
+    with _matrix_lock:
+        if _matrix is not None:
+            return _matrix
+        version = _matrix_version
+
+    matrix = PriceMatrix.load()
+    logger.debug(f"Price matrix loaded: {len(matrix.symbols)} symbols x {len(matrix.dates)} dates")
+
+    with _matrix_lock:
+        # Keep it only if no prices were stored while loading
+        if version == _matrix_version:
+            _matrix = matrix
+
+    return matrix
+
+
+def get_price_matrix_version() -> int:
+    """
+    Returns a counter that changes every time stored prices change.
+    """
+    with _matrix_lock:
+        return _matrix_version
+
+
+def invalidate_price_matrix() -> None:
+    """
+    Drops the in-memory price matrix so it is reloaded on next use.
+    """
+    global _matrix, _matrix_version
+
+    with _matrix_lock:
+        _matrix = None
+        _matrix_version += 1
+
+
+def calculate_variations_vectorized(assets: List[str], horizons: List[int]) -> Dict[int, List[dict]]:
+    """
+    Calculate percentage variations for asset prices over several horizons using the price matrix.
+
+    Args:
+    ----
+        assets: List of asset symbols.
+        horizons: Numbers of days for the variation calculation.
+
+    Returns:
+    -------
+        Dictionary keyed by horizon with lists of dictionaries containing symbol and variation,
+        in the same shape as calculate_variations.
+    """
+    variations: Dict[int, List[dict]] = {days: [] for days in horizons}
+    try:
+        matrix = get_price_matrix()
+        values = matrix.variations(horizons)
+    except Exception as e:
+        logger.error(f"Error calculating variations: {e}")
+        matrix, values = None, None
+
+    for symbol in assets:
+        row = matrix.row(symbol) if matrix is not None else None
+        for column, days in enumerate(horizons):
+            variation: Any = None
+            if row is not None and np.isfinite(values[row, column]):
+                variation = float(values[row, column])
+            variations[days].append({"symbol": symbol, "variation": variation})
+
+    return variations
+
+
+def calculate_variations_range(
+        assets: List[str],
+        horizons: List[int],
+        start: date | None = None,
+        end: date | None = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Calculate percentage variations for several horizons ending at a date, and
+    optionally between two explicit dates, in one pass over the price matrix.
+
+    Args:
+    ----
+        assets: List of asset symbols.
+        horizons: Numbers of days to look back from the end date.
+        start: Start date of the explicit range (default: no range).
+        end: End date of the variations (default: today).
+
+    Returns:
+    -------
+        Dictionary keyed by symbol with the price as of the end date, the variation of
+        each horizon and, when a start date is given, the variation over the range.
+    """
+    end_day = np.datetime64((end or datetime.now().date()).isoformat(), "D")
+    starts = end_day - np.asarray(horizons, dtype="timedelta64[D]")
+    if start is not None:
+        starts = np.append(starts, np.datetime64(start.isoformat(), "D"))
+
+    try:
+        matrix = get_price_matrix()
+        values = matrix.variations_between(starts, end_day)
+        prices = matrix.prices_as_of(end_day)
+    except Exception as e:
+        logger.error(f"Error calculating variations: {e}")
+        matrix, values, prices = None, None, None
+
+    def as_float(value: float) -> Any:
+        return float(value) if np.isfinite(value) else None
+
+    result = {}
+    for symbol in assets:
+        row = matrix.row(symbol) if matrix is not None else None
+        item: Dict[str, Any] = {
+            "price": as_float(prices[row]) if row is not None else None,
+            "variations": {
+                days: as_float(values[row, column]) if row is not None else None
+                for column, days in enumerate(horizons)
+            },
+        }
+        if start is not None:
+            item["range"] = as_float(values[row, -1]) if row is not None else None
+        result[symbol] = item
+
+    return result
+
+
+def calculate_correlations(assets: List[str], days: int) -> Dict[str, Any]:
+    """
+    Calculate the correlation and covariance matrices of the daily returns of
+    all assets over the last `days` days, with one vectorized operation.
+    Results are cached per window, assets and last stored date until prices change,
+    keeping the CORRELATION_CACHE_SIZE most recently used.
+
+    Args:
+    ----
+        assets: List of asset symbols.
+        days: Number of days of history to consider.
+
+    Returns:
+    -------
+        Dictionary containing the number of aligned return observations and the
+        correlation and covariance matrices, keyed by symbol pairs (None where
+        the asset has no stored prices or not enough data is stored).
+    """
+    version = get_price_matrix_version()
+    matrix = get_price_matrix()
+    last_date = str(matrix.dates[-1]) if matrix.dates.size else ""
+    key = (days, tuple(sorted(set(assets))), last_date, version)
+
+    with _matrix_lock:
+        cached = _correlations.get(key)
+        if cached is not None:
+            _correlations.move_to_end(key)
+    if cached is None:
+        symbols = [symbol for symbol in assets if matrix.row(symbol) is not None]
+        returns = matrix.aligned_returns(symbols, days)
+
+        if returns.shape[1] >= 2:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                correlation = np.atleast_2d(np.corrcoef(returns))
+            covariance = np.atleast_2d(np.cov(returns))
+        else:
+            correlation = covariance = np.full((len(symbols), len(symbols)), np.nan)
+
+        cached = {
+            "symbols": symbols,
+            "observations": returns.shape[1],
+            "correlation": correlation,
+            "covariance": covariance,
+        }
+        with _matrix_lock:
+            # Results of older versions can never be requested again
+            for stale in [stale for stale in _correlations if stale[3] != _matrix_version]:
+                del _correlations[stale]
+            if version == _matrix_version:
+                _correlations[key] = cached
+                while len(_correlations) > CORRELATION_CACHE_SIZE:
+                    _correlations.popitem(last=False)
+
+    positions = {symbol: position for position, symbol in enumerate(cached["symbols"])}
+
+    def as_table(values: np.ndarray) -> Dict[str, Dict[str, Any]]:
+        table = {}
+        for symbol in assets:
+            row = positions.get(symbol)
+            table[symbol] = {
+                other: float(values[row, positions[other]])
+                if row is not None and other in positions and np.isfinite(values[row, positions[other]]) else None
+                for other in assets
+            }
+        return table
+
+    return {
+        "days": days,
+        "as_of": last_date or None,
+        "observations": cached["observations"],
+        "correlation": as_table(cached["correlation"]),
+        "covariance": as_table(cached["covariance"]),
+    }
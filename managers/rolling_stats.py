@@ -0,0 +1,248 @@
+import math
+import threading
+from collections import deque
+from datetime import date as date_type, timedelta
+from typing import List, Dict, Any
+from sqlalchemy import text
+from loguru import logger
+
+from config import ROLLING_WINDOWS
+from db.database import SessionLocal
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+class RollingWindow:
+    """
+    Statistics over the prices of the last `days` calendar days, maintained incrementally.
+
+    Running sums give the mean and standard deviation of prices and of daily log returns
+    in O(1) per new price; monotonic deques give the minimum and maximum in amortized O(1).
+    The latest day is kept out of the deques until a later day arrives, so replacing its
+    price (intraday refreshes) is O(1) as well.
+
+    Attributes:
+    ----------
+        days: Window length in calendar days.
+    """
+
+    def __init__(self, days: int):
+        self.days = days
+        self._entries: deque[tuple[int, float, float | None]] = deque()
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._return_count = 0
+        self._return_sum = 0.0
+        self._return_sum_sq = 0.0
+        self._min: deque[tuple[int, float]] = deque()
+        self._max: deque[tuple[int, float]] = deque()
+
+    def _add(self, price: float, log_return: float | None, sign: int) -> None:
+        self._sum += sign * price
+        self._sum_sq += sign * price * price
+        if log_return is not None:
+            self._return_count += sign
+            self._return_sum += sign * log_return
+            self._return_sum_sq += sign * log_return * log_return
+
+    def _push_extremes(self, day: int, price: float) -> None:
+        while self._min and self._min[-1][1] >= price:
+            self._min.pop()
+        self._min.append((day, price))
+        while self._max and self._max[-1][1] <= price:
+            self._max.pop()
+        self._max.append((day, price))
+
+    def push(self, day: int, price: float, log_return: float | None) -> None:
+        """
+        Adds the price of a new day and evicts the days that fall out of the window.
+
+        Args:
+        ----
+            day: Date ordinal of the price, later than every price in the window.
+            price: Price value.
+            log_return: Log return from the previous stored price, if any.
+        """
+        # The previous latest day is final now, and joins the extremes before the eviction
+        if self._entries:
+            previous_day, previous_price, _ = self._entries[-1]
+            self._push_extremes(previous_day, previous_price)
+
+        first_day = day - self.days + 1
+        while self._entries and self._entries[0][0] < first_day:
+            _, old_price, old_return = self._entries.popleft()
+            self._add(old_price, old_return, -1)
+        while self._min and self._min[0][0] < first_day:
+            self._min.popleft()
+        while self._max and self._max[0][0] < first_day:
+            self._max.popleft()
+
+        self._entries.append((day, price, log_return))
+        self._add(price, log_return, 1)
+
+    def replace_last(self, price: float, log_return: float | None) -> None:
+        """
+        Replaces the price of the latest day (e.g. a new intraday value for today) in O(1).
+
+        Args:
+        ----
+            price: New price value.
+            log_return: Log return from the previous stored price, if any.
+        """
+        day, old_price, old_return = self._entries.pop()
+        self._add(old_price, old_return, -1)
+        self._entries.append((day, price, log_return))
+        self._add(price, log_return, 1)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the current statistics of the window.
+
+        Returns:
+        -------
+            Dictionary with count, mean, std, volatility (annualized, in percent), min and max.
+        """
+        count = len(self._entries)
+        if count == 0:
+            return {"count": 0, "mean": None, "std": None, "volatility": None, "min": None, "max": None}
+
+        latest = self._entries[-1][1]
+        mean = self._sum / count
+        std = None
+        if count > 1:
+            std = math.sqrt(max(0.0, (self._sum_sq - count * mean * mean) / (count - 1)))
+
+        volatility = None
+        if self._return_count > 1:
+            return_mean = self._return_sum / self._return_count
+            return_var = (self._return_sum_sq - self._return_count * return_mean * return_mean) / (self._return_count - 1)
+            volatility = math.sqrt(max(0.0, return_var) * TRADING_DAYS_PER_YEAR) * 100
+
+        return {
+            "count": count,
+            "mean": mean,
+            "std": std,
+            "volatility": volatility,
+            "min": min(self._min[0][1], latest) if self._min else latest,
+            "max": max(self._max[0][1], latest) if self._max else latest,
+        }
+
+
+class RollingStatsTracker:
+    """
+    Keeps the rolling windows of every asset up to date as prices are stored.
+
+    An asset's windows are loaded from the database the first time its statistics are
+    requested; afterwards each stored price updates them incrementally.
+
+    Attributes:
+    ----------
+        windows: Window lengths in calendar days.
+    """
+
+    def __init__(self, windows: List[int]):
+        self.windows = sorted(windows)
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _new_state(self) -> Dict[str, Any]:
+        return {
+            "windows": {days: RollingWindow(days) for days in self.windows},
+            "last_day": None,
+            "last_price": None,
+            "previous_price": None,
+        }
+
+    def _apply(self, state: Dict[str, Any], day: int, price: float) -> bool:
+        # Returns False when the price is older than the state and it must be rebuilt
+        if state["last_day"] is None or day > state["last_day"]:
+            previous = state["last_price"]
+            log_return = math.log(price / previous) if previous else None
+            for window in state["windows"].values():
+                window.push(day, price, log_return)
+            state["previous_price"] = previous
+            state["last_day"] = day
+            state["last_price"] = price
+            return True
+
+        if day == state["last_day"]:
+            previous = state["previous_price"]
+            log_return = math.log(price / previous) if previous else None
+            for window in state["windows"].values():
+                window.replace_last(price, log_return)
+            state["last_price"] = price
+            return True
+
+        return False
+
+    def _load(self, symbol: str) -> Dict[str, Any]:
+        state = self._new_state()
+
+        with SessionLocal() as db:
+            latest = db.execute(
+                text("SELECT MAX(date) FROM assets WHERE symbol = :symbol"), {"symbol": symbol}
+            ).scalar()
+            if latest is None:
+                return state
+
+            # One extra week gives the first log return of the longest window
+            cutoff = date_type.fromisoformat(str(latest)) - timedelta(days=self.windows[-1] + 7)
+            rows = db.execute(
+                text("SELECT date, price FROM assets WHERE symbol = :symbol AND date >= :cutoff ORDER BY date"),
+                {"symbol": symbol, "cutoff": cutoff.isoformat()},
+            ).fetchall()
+
+        for row in rows:
+            self._apply(state, date_type.fromisoformat(str(row[0])).toordinal(), float(row[1]))
+
+        return state
+
+    def on_price(self, symbol: str, date: str, price: float) -> None:
+        """
+        Updates the windows of an asset with a newly stored price.
+
+        Args:
+        ----
+            symbol: Asset symbol.
+            date: Date of the price (YYYY-MM-DD).
+            price: Stored price.
+        """
+        with self._lock:
+            state = self._states.get(symbol)
+            if state is None:
+                return
+
+            if not self._apply(state, date_type.fromisoformat(date).toordinal(), price):
+                # Prices stored before the latest day (e.g. a backfill) require a reload
+                del self._states[symbol]
+
+    def get_stats(self, symbol: str) -> Dict[int, Dict[str, Any]]:
+        """
+        Returns the rolling statistics of an asset for every window.
+
+        Args:
+        ----
+            symbol: Asset symbol.
+
+        Returns:
+        -------
+            Dictionary keyed by window length with the statistics of each window.
+        """
+        with self._lock:
+            state = self._states.get(symbol)
+            if state is None:
+                state = self._load(symbol)
+                self._states[symbol] = state
+                logger.debug(f"Rolling statistics loaded for {symbol}")
+
+            return {days: window.stats() for days, window in state["windows"].items()}
+
+    def clear(self) -> None:
+        """
+        Drops the windows of every asset.
+        """
+        with self._lock:
+            self._states.clear()
+
+
+rolling_stats = RollingStatsTracker(ROLLING_WINDOWS)
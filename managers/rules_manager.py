@@ -0,0 +1,229 @@
+import bisect
+import threading
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Iterable
+
+from loguru import logger
+
+from config import ASSETS, DAILY_THRESHOLD, WEEKLY_THRESHOLD, MONTHLY_THRESHOLD
+from db.database import SessionLocal, AlertRule
+
+# Default thresholds applied to every asset, keyed by horizon in days
+DEFAULT_THRESHOLDS = {1: DAILY_THRESHOLD, 7: WEEKLY_THRESHOLD, 30: MONTHLY_THRESHOLD}
+
+# Accepted spellings of each rule direction
+DIRECTIONS = {"increase": "increase", "up": "increase", "decrease": "decrease", "down": "decrease"}
+
+# Symbol under which the default rules are indexed
+ALL_SYMBOLS = "*"
+
+
+class RuleIndex:
+    """
+    Immutable index of alert rules. The rules of each (symbol, horizon, direction)
+    are sorted by threshold, so the rules triggered by a variation are found by
+    binary search: every rule whose threshold is below the variation magnitude.
+
+    Attributes:
+    ----------
+        size: Number of indexed rules.
+    """
+
+    def __init__(self, rules: Iterable[Dict[str, Any]]):
+        grouped: Dict[tuple[str, int, str], List[Dict[str, Any]]] = defaultdict(list)
+        for rule in rules:
+            grouped[(rule["symbol"], rule["horizon"], rule["direction"])].append(rule)
+
+        self._rules: Dict[tuple[str, int, str], List[Dict[str, Any]]] = {}
+        self._thresholds: Dict[tuple[str, int, str], List[float]] = {}
+        self._horizons: Dict[str, set[int]] = defaultdict(set)
+        for key, group in grouped.items():
+            group.sort(key=lambda rule: rule["threshold"])
+            self._rules[key] = group
+            self._thresholds[key] = [rule["threshold"] for rule in group]
+            self._horizons[key[0]].add(key[1])
+
+        self.size = sum(len(group) for group in self._rules.values())
+
+    def horizons(self, symbol: str) -> set[int]:
+        """
+        Returns the horizons with rules that apply to a symbol.
+        """
+        return self._horizons.get(symbol, set()) | self._horizons.get(ALL_SYMBOLS, set())
+
+    def match(self, symbol: str, horizon: int, variation: float) -> List[Dict[str, Any]]:
+        """
+        Finds the rules triggered by a variation.
+
+        Args:
+        ----
+            symbol: Asset symbol.
+            horizon: Number of days of the variation.
+            variation: Percentage variation.
+
+        Returns:
+        -------
+            Rules of the symbol (and default rules) in the direction of the
+            variation whose threshold is exceeded by it.
+        """
+        direction = "increase" if variation > 0 else "decrease"
+        matched = []
+        for key in ((symbol, horizon, direction), (ALL_SYMBOLS, horizon, direction)):
+            thresholds = self._thresholds.get(key)
+            if thresholds:
+                matched.extend(self._rules[key][:bisect.bisect_left(thresholds, abs(variation))])
+        return matched
+
+
+def _default_rules() -> List[Dict[str, Any]]:
+    return [
+        {"id": None, "rule": f"default:{direction}", "owner": None, "symbol": ALL_SYMBOLS,
+         "horizon": horizon, "direction": direction, "threshold": threshold}
+        for horizon, threshold in DEFAULT_THRESHOLDS.items()
+        for direction in ("increase", "decrease")
+    ]
+
+
+def _rule_to_dict(rule: AlertRule) -> Dict[str, Any]:
+    return {
+        "id": rule.id,
+        "rule": f"rule:{rule.id}",
+        "owner": rule.owner,
+        "symbol": rule.symbol,
+        "horizon": rule.horizon,
+        "direction": rule.direction,
+        "threshold": rule.threshold,
+    }
+
+
+_index: RuleIndex | None = None
+_index_version = 0
+_index_lock = threading.Lock()
+
+
+def get_rule_index() -> RuleIndex:
+    """
+    Returns the in-memory rule index, loading the stored rules when needed.
+
+    Returns:
+    -------
+        Index of the default and subscribed rules.
+    """
+    global _index
+
+    with _index_lock:
+        if _index is not None:
+            return _index
+        version = _index_version
+
+    with SessionLocal() as db:
+        rules = [_rule_to_dict(rule) for rule in db.query(AlertRule).all()]
+    index = RuleIndex(_default_rules() + rules)
+    logger.debug(f"Rule index loaded: {index.size} rules")
+
+    with _index_lock:
+        # Keep it only if no rules changed while loading
+        if version == _index_version:
+            _index = index
+
+    return index
+
+
+def invalidate_rule_index() -> None:
+    """
+    Drops the in-memory rule index so it is reloaded on next use.
+    """
+    global _index, _index_version
+
+    with _index_lock:
+        _index = None
+        _index_version += 1
+
+
+def add_rule(owner: str, symbol: str, horizon: int, direction: str, threshold: float) -> Dict[str, Any]:
+    """
+    Subscribes an owner to an alert rule.
+
+    Args:
+    ----
+        owner: Subscriber of the rule ('chat:<chat id>' or 'api:<key hash>').
+        symbol: Asset symbol.
+        horizon: Number of days of the variation.
+        direction: 'increase'/'up' or 'decrease'/'down'.
+        threshold: Percentage the variation must exceed.
+
+    Returns:
+    -------
+        The stored rule.
+
+    Raises:
+    ------
+        ValueError: If the symbol is not tracked or any parameter is invalid.
+    """
+    symbol = symbol.upper()
+    if symbol not in ASSETS:
+        raise ValueError(f"Symbol '{symbol}' not found. Available symbols: {', '.join(ASSETS)}")
+    if horizon <= 0:
+        raise ValueError("Number of days must be greater than zero")
+    if direction.lower() not in DIRECTIONS:
+        raise ValueError("Direction must be one of: up, down")
+    if threshold <= 0:
+        raise ValueError("Threshold must be greater than zero")
+
+    with SessionLocal() as db:
+        rule = AlertRule(
+            owner=owner,
+            symbol=symbol,
+            horizon=horizon,
+            direction=DIRECTIONS[direction.lower()],
+            threshold=threshold,
+            created_at=datetime.now(timezone.utc),
+        )
+        db.add(rule)
+        db.commit()
+        stored = _rule_to_dict(rule)
+
+    invalidate_rule_index()
+    logger.info(f"Alert rule {stored['id']} added for {owner}: {symbol} {horizon}d {stored['direction']} >{threshold}%")
+    return stored
+
+
+def list_rules(owner: str) -> List[Dict[str, Any]]:
+    """
+    Lists the alert rules of an owner.
+
+    Args:
+    ----
+        owner: Subscriber of the rules.
+
+    Returns:
+    -------
+        List of rules ordered by id.
+    """
+    with SessionLocal() as db:
+        rules = db.query(AlertRule).filter(AlertRule.owner == owner).order_by(AlertRule.id).all()
+        return [_rule_to_dict(rule) for rule in rules]
+
+
+def delete_rule(owner: str, rule_id: int) -> bool:
+    """
+    Unsubscribes an owner from one of their alert rules.
+
+    Args:
+    ----
+        owner: Subscriber of the rule.
+        rule_id: Id of the rule.
+
+    Returns:
+    -------
+        True if the rule existed and was deleted, False otherwise.
+    """
+    with SessionLocal() as db:
+        deleted = db.query(AlertRule).filter(AlertRule.id == rule_id, AlertRule.owner == owner).delete()
+        db.commit()
+
+    if deleted:
+        invalidate_rule_index()
+        logger.info(f"Alert rule {rule_id} deleted for {owner}")
+    return bool(deleted)
@@ -0,0 +1,39 @@
+import asyncio
+from loguru import logger
+
+from config import PRICE_REFRESH_INTERVAL_SECONDS
+from managers.assets_manager import update_prices_async
+from managers.intraday_manager import rollup_intraday_prices
+
+
+async def run_price_refresh_loop(interval_seconds: float = PRICE_REFRESH_INTERVAL_SECONDS) -> None:
+    """
+    Refreshes asset prices in the background every `interval_seconds`, then rolls
+    intraday prices past the retention window up into daily closes.
+    The first refresh happens after one interval, since startup already updates prices.
+    Runs until the task is cancelled.
+
+    Args:
+    ----
+        interval_seconds: Time between two refreshes.
+
+    Returns:
+    -------
+        None
+    """
+    logger.info(f"Price refresh scheduler started (every {interval_seconds:.0f} seconds)")
+
+    while True:
+        try:
+            await asyncio.sleep(interval_seconds)
+
+            logger.info("Scheduled price refresh...")
+            result = await update_prices_async(force_update=True)
+            logger.info(f"Scheduled refresh completed: {result.get('updated_successfully', 0)} prices updated")
+
+            await asyncio.to_thread(rollup_intraday_prices)
+        except asyncio.CancelledError:
+            logger.info("Price refresh scheduler stopped")
+            raise
+        except Exception as e:
+            logger.error(f"Error during scheduled price refresh: {e}")
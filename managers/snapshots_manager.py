@@ -0,0 +1,232 @@
+import os
+import tempfile
+import threading
+from collections import defaultdict
+from typing import List, Dict, Any
+from urllib.parse import quote
+
+import numpy as np
+from sqlalchemy import text
+from loguru import logger
+
+from config import SNAPSHOT_DIR
+from db.database import SessionLocal
+
+
+def _snapshot_paths(symbol: str) -> tuple[str, str]:
+    # Symbols such as 'GC=F' or '^GSPC' are percent-encoded into unique file names
+    stem = os.path.join(SNAPSHOT_DIR, quote(symbol, safe=""))
+    return f"{stem}.days.npy", f"{stem}.prices.npy"
+
+
+# Serializes snapshot writers, which read a snapshot before appending to it
+_snapshot_lock = threading.RLock()
+
+
+def _save(path: str, values: np.ndarray) -> None:
+    # Written aside to a unique file and renamed, so readers never map a partially written file
+    fd, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, values)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+
+def _write_snapshot(symbol: str, days: np.ndarray, prices: np.ndarray) -> None:
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    days_path, prices_path = _snapshot_paths(symbol)
+    _save(prices_path, prices.astype(np.float64))
+    _save(days_path, days.astype(np.int32))
+
+
+def _replace_last_price(symbol: str, price: float) -> None:
+    _, prices_path = _snapshot_paths(symbol)
+    prices = np.load(prices_path, mmap_mode="r+")
+    prices[-1] = price
+    prices.flush()
+
+
+def remove_snapshot(symbol: str) -> None:
+    """
+    Deletes the snapshot of an asset, so its prices are read from the database.
+
+    Args:
+    ----
+        symbol: Asset symbol.
+
+    Returns:
+    -------
+        None
+    """
+    for path in _snapshot_paths(symbol):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def load_snapshot(symbol: str) -> tuple[np.ndarray, np.ndarray] | None:
+    """
+    Memory-maps the price history snapshot of an asset without copying it.
+
+    Args:
+    ----
+        symbol: Asset symbol.
+
+    Returns:
+    -------
+        Tuple of read-only arrays (days since 1970-01-01 as int32, prices as float64),
+        or None if no consistent snapshot exists.
+    """
+    days_path, prices_path = _snapshot_paths(symbol)
+    try:
+        days = np.load(days_path, mmap_mode="r")
+        prices = np.load(prices_path, mmap_mode="r")
+    except (FileNotFoundError, ValueError):
+        return None
+
+    if days.shape != prices.shape:
+        # Caught between the renames of a rewrite
+        return None
+    return days, prices
+
+
+def write_snapshot(symbol: str) -> int:
+    """
+    Rewrites the snapshot of an asset from its stored prices.
+
+    Args:
+    ----
+        symbol: Asset symbol.
+
+    Returns:
+    -------
+        Number of prices written.
+    """
+    # Read under the lock too, so an older read never overwrites a newer snapshot
+    with _snapshot_lock:
+        with SessionLocal() as db:
+            rows = db.execute(
+                text("SELECT date, price FROM assets WHERE symbol = :symbol ORDER BY date"),
+                {"symbol": symbol},
+            ).fetchall()
+
+        days = np.array([str(row[0]) for row in rows], dtype="datetime64[D]").astype(np.int32)
+        prices = np.array([row[1] for row in rows], dtype=np.float64)
+        _write_snapshot(symbol, days, prices)
+    return len(rows)
+
+
+def update_snapshots(changes: Dict[tuple[str, str], float]) -> None:
+    """
+    Brings the snapshots of the assets with stored price changes up to date.
+    A refreshed price of the last day is replaced in place and prices after it
+    are appended; only changes before the last day rewrite the snapshot of that
+    asset from the database. If the update fails the snapshot is deleted, so
+    readers fall back to the database.
+
+    Args:
+    ----
+        changes: Stored prices keyed by (symbol, date).
+
+    Returns:
+    -------
+        None
+    """
+    by_symbol: Dict[str, List[tuple[str, float]]] = defaultdict(list)
+    for (symbol, date), price in changes.items():
+        by_symbol[symbol].append((date, price))
+
+    for symbol, prices in by_symbol.items():
+        with _snapshot_lock:
+            try:
+                prices.sort()
+                days = np.array([date for date, _ in prices], dtype="datetime64[D]").astype(np.int32)
+                snapshot = load_snapshot(symbol)
+
+                values = np.array([price for _, price in prices], dtype=np.float64)
+
+                if snapshot is None or (snapshot[0].size and days[0] < snapshot[0][-1]):
+                    # Backfills into the past
+                    write_snapshot(symbol)
+                elif snapshot[0].size and days.size == 1 and days[0] == snapshot[0][-1]:
+                    # Same-day refresh: the last price is overwritten in place
+                    _replace_last_price(symbol, values[0])
+                else:
+                    # The last day, if refreshed, is dropped and written again with the newer days
+                    kept = len(snapshot[0]) - int(bool(snapshot[0].size) and days[0] == snapshot[0][-1])
+                    _write_snapshot(
+                        symbol,
+                        np.concatenate([snapshot[0][:kept], days]),
+                        np.concatenate([snapshot[1][:kept], values]),
+                    )
+            except Exception as e:
+                logger.error(f"Error updating price snapshot of {symbol}, removing it: {e}")
+                remove_snapshot(symbol)
+
+
+def load_snapshot_columns(stored: Dict[str, tuple[int, str]]) -> tuple[np.ndarray, np.ndarray, np.ndarray] | None:
+    """
+    Loads the snapshots of several assets as parallel (symbol, date, price) arrays,
+    checking each one against the number of prices and the last date stored.
+
+    Args:
+    ----
+        stored: Number of stored prices and last stored date (YYYY-MM-DD) of each asset.
+
+    Returns:
+    -------
+        Tuple of arrays (symbols, dates as datetime64[D], prices), or None if
+        any of the assets has no snapshot or its snapshot is out of date.
+    """
+    symbols = list(stored)
+    snapshots = [load_snapshot(symbol) for symbol in symbols]
+    if not snapshots or any(snapshot is None for snapshot in snapshots):
+        return None
+
+    for symbol, (days, _) in zip(symbols, snapshots):
+        count, last_date = stored[symbol]
+        if len(days) != count or str(np.datetime64(int(days[-1]), "D")) != last_date:
+            logger.warning(f"Price snapshot of {symbol} is out of date, reading prices from the database")
+            return None
+
+    return (
+        np.repeat(np.array(symbols), [len(days) for days, _ in snapshots]),
+        np.concatenate([days for days, _ in snapshots]).astype("datetime64[D]"),
+        np.concatenate([prices for _, prices in snapshots]),
+    )
+
+
+def export_snapshots(symbols: List[str] | None = None) -> Dict[str, Any]:
+    """
+    Rewrites the snapshots of the given assets, or of every stored asset.
+
+    Args:
+    ----
+        symbols: Asset symbols (default: every asset with stored prices).
+
+    Returns:
+    -------
+        Dictionary with the number of assets and prices written.
+    """
+    if symbols is None:
+        with SessionLocal() as db:
+            symbols = [row[0] for row in db.execute(text("SELECT DISTINCT symbol FROM assets")).fetchall()]
+
+    with _snapshot_lock:
+        written = {symbol: write_snapshot(symbol) for symbol in symbols}
+    logger.info(f"Exported price snapshots of {len(written)} assets to {SNAPSHOT_DIR}")
+    return {"directory": SNAPSHOT_DIR, "total_assets": len(written), "total_prices": sum(written.values())}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export memory-mapped price history snapshots")
+    parser.add_argument("symbols", nargs="*", help="Symbols to export (default: every stored asset)")
+    args = parser.parse_args()
+
+    print(export_snapshots(args.symbols or None))
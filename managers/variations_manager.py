@@ -0,0 +1,163 @@
+from datetime import datetime, timedelta
+from typing import List, Dict, Any
+from sqlalchemy.orm import Session
+from sqlalchemy import text, bindparam
+from loguru import logger
+
+from config import VARIATION_HORIZONS
+from db.database import SessionLocal
+
+
+def refresh_variations(db: Session, symbols: List[str], horizons: List[int] | None = None) -> None:
+    """
+    Recomputes the materialized variations of the given assets with a single statement.
+    Runs inside the caller's transaction and does not commit, so variations are
+    stored atomically with the prices that changed them.
+
+    Args:
+    ----
+        db: Database session.
+        symbols: Asset symbols whose prices changed.
+        horizons: Numbers of days to look back, defaults to VARIATION_HORIZONS.
+
+    Returns:
+    -------
+        None
+    """
+    if horizons is None:
+        horizons = VARIATION_HORIZONS
+    if not symbols or not horizons:
+        return
+
+    today = datetime.now()
+    params: Dict[str, Any] = {"symbols": sorted(set(symbols)), "as_of_date": today.strftime('%Y-%m-%d')}
+    values = []
+    for position, days in enumerate(horizons):
+        params[f"horizon_{position}"] = days
+        params[f"base_date_{position}"] = (today - timedelta(days=days)).strftime('%Y-%m-%d')
+        values.append(f"(:horizon_{position}, :base_date_{position})")
+
+    query = text(f"""
+        WITH horizons(horizon, base_date) AS (VALUES {", ".join(values)}),
+        latest AS (
+            SELECT a.symbol, a.price FROM assets a
+            WHERE a.symbol IN :symbols
+              AND a.date = (SELECT MAX(b.date) FROM assets b WHERE b.symbol = a.symbol)
+        )
+        INSERT INTO variations (symbol, horizon, as_of_date, base_price, price, variation)
+        SELECT symbol, horizon, :as_of_date, base_price, price,
+               CASE WHEN base_price IS NULL OR base_price = 0 THEN NULL
+                    ELSE (price - base_price) / base_price * 100 END
+        FROM (
+            SELECT l.symbol, h.horizon, l.price,
+                   (SELECT p.price FROM assets p
+                    WHERE p.symbol = l.symbol AND p.date <= h.base_date
+                    ORDER BY p.date DESC LIMIT 1) AS base_price
+            FROM latest l CROSS JOIN horizons h
+        )
+        WHERE true
+        ON CONFLICT(symbol, horizon) DO UPDATE SET
+            as_of_date = excluded.as_of_date,
+            base_price = excluded.base_price,
+            price = excluded.price,
+            variation = excluded.variation
+    """).bindparams(bindparam("symbols", expanding=True))
+
+    db.execute(query, params)
+
+
+def get_materialized_variations(assets: List[str], horizons: List[int]) -> Dict[int, List[dict]]:
+    """
+    Reads precomputed variations for the given assets and horizons. Variations
+    missing or computed on an earlier day, and horizons that are not materialized,
+    are computed with the price matrix engine instead; reads never write.
+
+    Args:
+    ----
+        assets: List of asset symbols.
+        horizons: Numbers of days for the variation calculation.
+
+    Returns:
+    -------
+        Dictionary keyed by horizon with lists of dictionaries containing symbol and variation,
+        in the same shape as calculate_variations.
+    """
+    from managers.price_matrix import calculate_variations_vectorized
+
+    materialized = [days for days in horizons if days in VARIATION_HORIZONS]
+    others = [days for days in horizons if days not in VARIATION_HORIZONS]
+
+    variations: Dict[int, List[dict]] = {}
+    if others:
+        variations.update(calculate_variations_vectorized(assets, others))
+
+    if not materialized:
+        return variations
+
+    today = datetime.now().strftime('%Y-%m-%d')
+    query = text("""
+        SELECT symbol, horizon, variation FROM variations
+        WHERE symbol IN :symbols AND horizon IN :horizons AND as_of_date >= :today
+    """).bindparams(bindparam("symbols", expanding=True), bindparam("horizons", expanding=True))
+
+    stored: Dict[tuple[str, int], float | None] = {}
+    try:
+        with SessionLocal() as db:
+            rows = db.execute(query, {"symbols": list(assets), "horizons": materialized, "today": today})
+            stored = {(row[0], row[1]): row[2] for row in rows}
+    except Exception as e:
+        logger.error(f"Error reading materialized variations: {e}")
+
+    # Horizons never materialized, or not refreshed today, of each asset
+    stale = sorted({symbol for symbol in assets for days in materialized if (symbol, days) not in stored})
+    if stale:
+        logger.debug(f"Computing stale variations for: {', '.join(stale)}")
+        for days, items in calculate_variations_vectorized(stale, materialized).items():
+            for item in items:
+                stored.setdefault((item["symbol"], days), item["variation"])
+
+    for days in materialized:
+        variations[days] = [
+            {"symbol": symbol, "variation": stored.get((symbol, days))} for symbol in assets
+        ]
+
+    return variations
+
+
+def rebuild_variations() -> Dict[str, Any]:
+    """
+    Recomputes the materialized variations of every stored asset from scratch.
+
+    Returns:
+    -------
+        Dictionary with results summary.
+    """
+    db = SessionLocal()
+    try:
+        symbols = [row[0] for row in db.execute(text("SELECT DISTINCT symbol FROM assets"))]
+
+        db.execute(text("DELETE FROM variations"))
+        refresh_variations(db, symbols)
+        db.commit()
+
+        logger.info(f"Rebuilt materialized variations for {len(symbols)} assets")
+        return {"status": "success", "total_assets": len(symbols), "horizons": VARIATION_HORIZONS}
+    except Exception as e:
+        logger.error(f"Error rebuilding materialized variations: {e}")
+        db.rollback()
+        return {"status": "error", "total_assets": 0, "horizons": VARIATION_HORIZONS}
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage the materialized variations table")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute every variation from stored prices")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        print(rebuild_variations())
+    else:
+        parser.print_help()
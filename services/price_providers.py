@@ -0,0 +1,446 @@
+"""
+Price provider module.
+
+This module defines the interface used to obtain market prices and the available
+backends: Yahoo Finance for live data and a replay provider that serves recorded
+quotes from a local fixture file for offline, deterministic benchmarks.
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from loguru import logger
+from utils.circuit_breaker import CircuitBreaker, NegativeCache
+
+from config import (
+    ASSETS,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_COOLDOWN_SECONDS,
+    NEGATIVE_CACHE_TTL_SECONDS,
+    PRICE_PROVIDER,
+    REPLAY_FIXTURE_PATH,
+    REPLAY_LATENCY_MS,
+    REPLAY_FAILURE_RATE,
+    REPLAY_SEED,
+)
+
+
+class PriceFetchError(Exception):
+    """
+    Raised by price providers when a request fails, as opposed to returning no data.
+
+    Attributes:
+    ----------
+        symbols: Symbols whose request failed.
+        prices: Prices retrieved for the other requested symbols.
+    """
+
+    def __init__(self, message: str, symbols: list[str], prices: dict[str, float | None] | None = None):
+        super().__init__(message)
+        self.symbols = symbols
+        self.prices = prices or {}
+
+
+class PriceProvider(ABC):
+    """
+    Base class for price sources. Symbols without data are returned as None;
+    failed requests raise PriceFetchError.
+
+    Attributes:
+    ----------
+        name: Identifier of the source, reported to API clients.
+    """
+    name = "provider"
+
+    @abstractmethod
+    def get_current_price(self, symbol: str) -> float | None:
+        """
+        Retrieves the latest available price of an asset.
+
+        Args:
+        ----
+            symbol: Asset symbol.
+
+        Returns:
+        -------
+            Current price or None if not available.
+
+        Raises:
+        ------
+            PriceFetchError: If the request failed.
+        """
+
+    def get_prices(self, symbols: list[str]) -> tuple[dict[str, float | None], list[str]]:
+        """
+        Retrieves the latest prices for several assets.
+
+        Args:
+        ----
+            symbols: List of asset symbols.
+
+        Returns:
+        -------
+            Tuple with a dictionary of symbols to prices and the list of missing symbols.
+
+        Raises:
+        ------
+            PriceFetchError: If the request of any symbol failed, with the prices of the others.
+        """
+        prices: dict[str, float | None] = {}
+        failed = []
+        for symbol in symbols:
+            try:
+                prices[symbol] = self.get_current_price(symbol)
+            except PriceFetchError:
+                prices[symbol] = None
+                failed.append(symbol)
+
+        if failed:
+            raise PriceFetchError(f"Price requests failed for {', '.join(failed)}", failed, prices)
+        return prices, [symbol for symbol, price in prices.items() if price is None]
+
+    def get_history(self, symbol: str, start: str | None = None, years: int = 5) -> list[tuple[str, float]]:
+        """
+        Retrieves the daily closing prices of an asset.
+
+        Args:
+        ----
+            symbol: Asset symbol.
+            start: First date to retrieve (YYYY-MM-DD), or None for the last `years` years.
+            years: Number of years of history to retrieve when no start date is given.
+
+        Returns:
+        -------
+            List of (date, close) tuples ordered by date.
+        """
+        return []
+
+    async def get_prices_async(self, symbols: list[str]) -> dict[str, float | None]:
+        """
+        Retrieves the latest prices for several assets concurrently.
+
+        Args:
+        ----
+            symbols: List of asset symbols.
+
+        Returns:
+        -------
+            Dictionary with symbols as keys and prices as values.
+
+        Raises:
+        ------
+            PriceFetchError: If the request of any symbol failed, with the prices of the others.
+        """
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self.get_current_price, symbol) for symbol in symbols),
+            return_exceptions=True,
+        )
+        return _collect_prices(symbols, results)
+
+
+def _collect_prices(symbols: list[str], results: list) -> dict[str, float | None]:
+    # Gathered results of concurrent requests, with the failed ones raised together
+    prices: dict[str, float | None] = {}
+    failed = []
+    for symbol, result in zip(symbols, results):
+        if isinstance(result, PriceFetchError):
+            failed.append(symbol)
+            result = None
+        elif isinstance(result, BaseException):
+            raise result
+        prices[symbol] = result
+
+    if failed:
+        raise PriceFetchError(f"Price requests failed for {', '.join(failed)}", failed, prices)
+    return prices
+
+
+class YahooPriceProvider(PriceProvider):
+    """
+    Live prices from Yahoo Finance.
+    """
+    name = "yahoo_finance"
+
+    def get_current_price(self, symbol: str) -> float | None:
+        from services.yahoo_finance import get_current_price
+        return get_current_price(symbol, raise_errors=True)
+
+    def get_prices(self, symbols: list[str]) -> tuple[dict[str, float | None], list[str]]:
+        from services.yahoo_finance import get_batch_prices
+        return get_batch_prices(symbols, raise_errors=True)
+
+    def get_history(self, symbol: str, start: str | None = None, years: int = 5) -> list[tuple[str, float]]:
+        from services.yahoo_finance import get_price_history
+        return get_price_history(symbol, start=start, years=years)
+
+    async def get_prices_async(self, symbols: list[str]) -> dict[str, float | None]:
+        from services.yahoo_finance import get_multiple_prices_async
+        return await get_multiple_prices_async(symbols, raise_errors=True)
+
+
+class ReplayPriceProvider(PriceProvider):
+    """
+    Recorded prices served from a local JSON fixture.
+
+    The fixture maps each symbol to its recorded series, either a list of prices
+    or a list of [date, price] pairs. Every request returns the next value of the
+    series, wrapping around at the end, so replays are repeatable. Dated series
+    are also served as price history.
+
+    Attributes:
+    ----------
+        fixture_path: Path of the JSON fixture file.
+        latency_ms: Artificial latency added to every request, in milliseconds.
+        failure_rate: Probability (0-1) that a request fails with PriceFetchError.
+    """
+    name = "replay"
+
+    def __init__(self, fixture_path: str, latency_ms: float = 0, failure_rate: float = 0,
+                 seed: int | None = None):
+        if not 0 <= failure_rate <= 1:
+            raise ValueError("Failure rate must be between 0 and 1")
+
+        self.fixture_path = fixture_path
+        self.latency_ms = latency_ms
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._positions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        with open(fixture_path, encoding="utf-8") as f:
+            raw = json.load(f)
+
+        self._series = {
+            symbol: [float(item[1]) if isinstance(item, list) else float(item) for item in values]
+            for symbol, values in raw.items()
+        }
+        self._history = {
+            symbol: [(str(item[0]), float(item[1])) for item in values if isinstance(item, list)]
+            for symbol, values in raw.items()
+        }
+        logger.info(f"Replay provider loaded {len(self._series)} symbols from {fixture_path}")
+
+    def _next_price(self, symbol: str) -> float | None:
+        with self._lock:
+            series = self._series.get(symbol)
+            if not series:
+                return None
+
+            if self.failure_rate and self._random.random() < self.failure_rate:
+                raise PriceFetchError(f"Simulated failure for {symbol}", [symbol])
+
+            position = self._positions.get(symbol, 0)
+            self._positions[symbol] = (position + 1) % len(series)
+            return series[position]
+
+    def get_current_price(self, symbol: str) -> float | None:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return self._next_price(symbol)
+
+    def get_history(self, symbol: str, start: str | None = None, years: int = 5) -> list[tuple[str, float]]:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        history = self._history.get(symbol, [])
+        return [item for item in history if start is None or item[0] >= start]
+
+    async def get_prices_async(self, symbols: list[str]) -> dict[str, float | None]:
+        async def fetch(symbol: str) -> float | None:
+            if self.latency_ms:
+                await asyncio.sleep(self.latency_ms / 1000)
+            return self._next_price(symbol)
+
+        results = await asyncio.gather(*(fetch(symbol) for symbol in symbols), return_exceptions=True)
+        return _collect_prices(symbols, results)
+
+
+class GuardedPriceProvider(PriceProvider):
+    """
+    Wraps a provider with a per-symbol circuit breaker and a negative cache.
+
+    Symbols that recently returned no data, or whose circuit is open after repeated
+    failures, are answered with None immediately so callers fall back to the database
+    without waiting on the upstream source. Failed requests only count towards the
+    circuit breaker: they are retried on the next call until the circuit opens.
+
+    Attributes:
+    ----------
+        provider: Wrapped price provider.
+        breaker: Per-symbol circuit breaker.
+        negative_cache: Symbols that recently returned no data.
+    """
+
+    def __init__(self, provider: PriceProvider, breaker: CircuitBreaker, negative_cache: NegativeCache):
+        self.provider = provider
+        self.breaker = breaker
+        self.negative_cache = negative_cache
+        self.name = provider.name
+
+    def _allowed(self, symbol: str) -> bool:
+        if symbol in self.negative_cache:
+            logger.debug(f"{symbol}: No data recently, skipping upstream request")
+            return False
+
+        if not self.breaker.allow(symbol):
+            logger.debug(f"{symbol}: Circuit open, skipping upstream request")
+            return False
+
+        return True
+
+    def _record(self, symbol: str, price: float | None, failed: bool = False) -> None:
+        if price is None:
+            # Only an answer without data is worth remembering, a failed request may succeed next time
+            if not failed:
+                self.negative_cache.add(symbol)
+            self.breaker.record_failure(symbol)
+            if self.breaker.is_open(symbol):
+                logger.warning(f"{symbol}: Circuit open for {self.breaker.cooldown_seconds:.0f} seconds")
+        else:
+            self.breaker.record_success(symbol)
+
+    def get_current_price(self, symbol: str) -> float | None:
+        if not self._allowed(symbol):
+            return None
+
+        try:
+            price = self.provider.get_current_price(symbol)
+        except PriceFetchError as e:
+            logger.warning(f"{symbol}: Price request failed: {e}")
+            self._record(symbol, None, failed=True)
+            return None
+
+        self._record(symbol, price)
+        return price
+
+    def get_prices(self, symbols: list[str]) -> tuple[dict[str, float | None], list[str]]:
+        prices: dict[str, float | None] = {symbol: None for symbol in symbols}
+        allowed = [symbol for symbol in symbols if self._allowed(symbol)]
+
+        if allowed:
+            try:
+                fetched, _ = self.provider.get_prices(allowed)
+                failed = set()
+            except PriceFetchError as e:
+                logger.warning(f"Price request failed: {e}")
+                fetched, failed = e.prices, set(e.symbols)
+
+            for symbol in allowed:
+                prices[symbol] = fetched.get(symbol)
+                self._record(symbol, prices[symbol], failed=symbol in failed)
+
+        return prices, [symbol for symbol, price in prices.items() if price is None]
+
+    def get_history(self, symbol: str, start: str | None = None, years: int = 5) -> list[tuple[str, float]]:
+        return self.provider.get_history(symbol, start=start, years=years)
+
+    async def get_prices_async(self, symbols: list[str]) -> dict[str, float | None]:
+        prices: dict[str, float | None] = {symbol: None for symbol in symbols}
+        allowed = [symbol for symbol in symbols if self._allowed(symbol)]
+
+        if allowed:
+            try:
+                fetched = await self.provider.get_prices_async(allowed)
+                failed = set()
+            except PriceFetchError as e:
+                logger.warning(f"Price request failed: {e}")
+                fetched, failed = e.prices, set(e.symbols)
+
+            for symbol in allowed:
+                prices[symbol] = fetched.get(symbol)
+                self._record(symbol, prices[symbol], failed=symbol in failed)
+
+        return prices
+
+
+def record_fixture(path: str, symbols: list[str] | None = None) -> int:
+    """
+    Records the stored price history of the given assets into a replay fixture file.
+
+    Args:
+    ----
+        path: Destination path of the JSON fixture.
+        symbols: Asset symbols to record (defaults to all tracked assets).
+
+    Returns:
+    -------
+        Number of recorded prices.
+    """
+    from sqlalchemy import text
+    from db.database import SessionLocal
+
+    fixture: dict[str, list] = {}
+    with SessionLocal() as db:
+        for symbol in symbols or ASSETS:
+            rows = db.execute(
+                text("SELECT date, price FROM assets WHERE symbol = :symbol ORDER BY date"),
+                {"symbol": symbol},
+            ).fetchall()
+            fixture[symbol] = [[str(row[0]), float(row[1])] for row in rows]
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(fixture, f)
+
+    count = sum(len(values) for values in fixture.values())
+    logger.info(f"Recorded {count} prices into {path}")
+    return count
+
+
+_provider: PriceProvider | None = None
+_provider_lock = threading.Lock()
+
+
+def get_price_provider() -> PriceProvider:
+    """
+    Returns the configured price provider, creating it on first use.
+
+    Returns:
+    -------
+        Price provider selected by the PRICE_PROVIDER setting, guarded by a
+        circuit breaker and a negative cache.
+    """
+    global _provider
+
+    with _provider_lock:
+        if _provider is None:
+            if PRICE_PROVIDER == "replay":
+                provider = ReplayPriceProvider(
+                    REPLAY_FIXTURE_PATH,
+                    latency_ms=REPLAY_LATENCY_MS,
+                    failure_rate=REPLAY_FAILURE_RATE,
+                    seed=REPLAY_SEED,
+                )
+            elif PRICE_PROVIDER == "yahoo":
+                provider = YahooPriceProvider()
+            else:
+                raise ValueError(f"Unknown price provider '{PRICE_PROVIDER}'")
+
+            _provider = GuardedPriceProvider(
+                provider,
+                CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_COOLDOWN_SECONDS),
+                NegativeCache(NEGATIVE_CACHE_TTL_SECONDS),
+            )
+
+            logger.info(f"Using price provider: {_provider.name}")
+
+        return _provider
+
+
+def set_price_provider(provider: PriceProvider | None) -> None:
+    """
+    Replaces the active price provider (None restores the configured one on next use).
+
+    Args:
+    ----
+        provider: Provider to use.
+
+    Returns:
+    -------
+        None
+    """
+    global _provider
+
+    with _provider_lock:
+        _provider = provider
@@ -1,8 +1,13 @@
+import asyncio
+import weakref
 import yfinance as yf
 from datetime import datetime
 import time
 import random
 from loguru import logger
+from config import YAHOO_RATE_LIMIT, YAHOO_RATE_BURST, YAHOO_MAX_RETRIES
+from services.price_providers import PriceFetchError, _collect_prices
+from utils.rate_limiter import TokenBucket
 
 
 def is_weekend() -> bool:
@@ -17,18 +22,45 @@ def is_weekend() -> bool:
     return weekday >= 5  # 5 = Saturday, 6 = Sunday
 
 
-def get_current_price(symbol: str) -> float | None:
+def _fetch_last_close(symbol: str) -> float | None:
+    """
+    Performs a single Yahoo Finance request for the last closing price of an asset.
+
+    Args:
+    ----
+        symbol: Asset symbol.
+
+    Returns:
+    -------
+        Last closing price or None if Yahoo returned no data.
+    """
+    ticker = yf.Ticker(symbol)
+    data = ticker.history(period="1d")
+
+    if not data.empty and 'Close' in data.columns:
+        return float(data['Close'].iloc[-1])
+
+    return None
+
+
+def get_current_price(symbol: str, raise_errors: bool = False) -> float | None:
     """
     Retrieves the latest available price of an asset from Yahoo Finance.
-    Implements a simple retry mechanism with delay.
+    Implements a simple retry mechanism with delay for failed requests;
+    an empty answer is returned right away.
 
     Args:
     ----
         symbol: Asset symbol.
+        raise_errors: Whether to raise when every attempt failed instead of returning None.
 
     Returns:
     -------
         Current price or None if not available.
+
+    Raises:
+    ------
+        PriceFetchError: If every attempt failed and raise_errors is set.
     """
     max_retries = 3
 
@@ -40,32 +72,130 @@ def get_current_price(symbol: str) -> float | None:
                 logger.debug(f"Retrying {symbol} in {wait_time:.2f} seconds (attempt {attempt + 1}/{max_retries})...")
                 time.sleep(wait_time)
 
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period="1d")
+            price = _fetch_last_close(symbol)
 
-            if not data.empty and 'Close' in data.columns:
-                price = float(data['Close'].iloc[-1])
+            if price is not None:
                 logger.info(f"{symbol}: Last price from Yahoo: {price:.2f} USD")
                 return price
-            else:
-                logger.warning(f"No data available for {symbol}")
+
+            # An empty answer is not a transient error, retrying would not help
+            logger.warning(f"No data available for {symbol}")
+            return None
 
         except Exception as e:
             logger.warning(f"Attempt {attempt + 1}/{max_retries} failed for {symbol}: {e}")
             if attempt == max_retries - 1:
                 logger.error(f"All retries failed for {symbol}: {e}")
+                if raise_errors:
+                    raise PriceFetchError(f"All retries failed for {symbol}: {e}", [symbol]) from e
 
     return None
 
 
-def get_multiple_prices(symbols: list[str]) -> dict[str, float | None]:
+def get_batch_prices(symbols: list[str], raise_errors: bool = False) -> tuple[dict[str, float | None], list[str]]:
+    """
+    Retrieves the latest prices for several assets in a single Yahoo Finance download.
+    The multi-ticker frame is split back into one closing price per symbol.
+
+    Args:
+    ----
+        symbols: List of asset symbols.
+        raise_errors: Whether to raise when the download fails instead of reporting
+            every symbol as missing.
+
+    Returns:
+    -------
+        Tuple with a dictionary of symbols to prices and the list of symbols
+        that came back without data.
+
+    Raises:
+    ------
+        PriceFetchError: If the download failed and raise_errors is set.
+    """
+    results: dict[str, float | None] = {symbol: None for symbol in symbols}
+
+    if not symbols:
+        return results, []
+
+    try:
+        # A few days of history covers weekends and holidays for futures
+        data = yf.download(
+            tickers=symbols,
+            period="5d",
+            interval="1d",
+            group_by="column",
+            auto_adjust=False,
+            progress=False,
+            threads=True,
+        )
+    except Exception as e:
+        logger.error(f"Batch download failed for {', '.join(symbols)}: {e}")
+        if raise_errors:
+            raise PriceFetchError(f"Batch download failed: {e}", list(symbols)) from e
+        return results, list(symbols)
+
+    if data is not None and not data.empty and "Close" in data.columns.get_level_values(0):
+        closes = data["Close"]
+        for symbol in symbols:
+            if symbol not in closes.columns:
+                continue
+
+            series = closes[symbol].dropna()
+            if not series.empty:
+                results[symbol] = float(series.iloc[-1])
+                logger.info(f"{symbol}: Last price from Yahoo: {results[symbol]:.2f} USD")
+
+    missing = [symbol for symbol, price in results.items() if price is None]
+    if missing:
+        logger.warning(f"No data available in batch download for: {', '.join(missing)}")
+
+    return results, missing
+
+
+def get_price_history(symbol: str, start: str | None = None, years: int = 5) -> list[tuple[str, float]]:
+    """
+    Retrieves the daily closing prices of an asset in a single Yahoo Finance request.
+
+    Args:
+    ----
+        symbol: Asset symbol.
+        start: First date to retrieve (YYYY-MM-DD). When None, the last `years` years are retrieved.
+        years: Number of years of history to retrieve when no start date is given.
+
+    Returns:
+    -------
+        List of (date, close) tuples ordered by date.
+    """
+    try:
+        ticker = yf.Ticker(symbol)
+        if start:
+            data = ticker.history(start=start, interval="1d", auto_adjust=False)
+        else:
+            data = ticker.history(period=f"{years}y", interval="1d", auto_adjust=False)
+    except Exception as e:
+        logger.error(f"Error retrieving price history for {symbol}: {e}")
+        return []
+
+    if data.empty or 'Close' not in data.columns:
+        logger.warning(f"No price history available for {symbol}")
+        return []
+
+    closes = data['Close'].dropna()
+    history = list(zip(closes.index.strftime('%Y-%m-%d'), closes.astype(float)))
+    logger.info(f"{symbol}: Retrieved {len(history)} daily prices from Yahoo")
+    return history
+
+
+def get_multiple_prices(symbols: list[str], batch: bool = True) -> dict[str, float | None]:
     """
-    Gets current prices for multiple assets with a patient approach.
-    Gets each symbol individually with delays to avoid rate limits.
+    Gets current prices for multiple assets.
+    By default all symbols are requested in one batched download; with batch=False
+    each symbol is fetched individually with delays to avoid rate limits.
 
     Args:
     ----
         symbols: List of asset symbols.
+        batch: Whether to fetch all symbols in a single upstream request.
 
     Returns:
     -------
@@ -74,6 +204,10 @@ def get_multiple_prices(symbols: list[str]) -> dict[str, float | None]:
     if is_weekend():
         logger.warning("Today is weekend. Market prices may not be up-to-date.")
 
+    if batch:
+        results, _ = get_batch_prices(symbols)
+        return results
+
     results = {}
 
     # Process symbols one by one with delays between requests
@@ -96,3 +230,95 @@ def get_multiple_prices(symbols: list[str]) -> dict[str, float | None]:
     return results
 
 
+# Token buckets shared by every concurrent fetch, keyed by event loop (asyncio locks
+# belong to one loop) and by rate and burst, so separate calls share the Yahoo quota
+_buckets: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _get_bucket(rate: float, burst: int) -> TokenBucket:
+    buckets = _buckets.setdefault(asyncio.get_running_loop(), {})
+    if (rate, burst) not in buckets:
+        buckets[(rate, burst)] = TokenBucket(rate, burst)
+    return buckets[(rate, burst)]
+
+
+async def _fetch_price_with_retries(symbol: str, bucket: TokenBucket, max_retries: int) -> float | None:
+    """
+    Fetches the price of one asset, retrying with backoff without blocking other tasks.
+
+    Args:
+    ----
+        symbol: Asset symbol.
+        bucket: Token bucket shared by all concurrent fetches.
+        max_retries: Maximum number of attempts.
+
+    Returns:
+    -------
+        Current price or None if Yahoo returned no data.
+
+    Raises:
+    ------
+        PriceFetchError: If every attempt failed.
+    """
+    for attempt in range(max_retries):
+        if attempt > 0:
+            wait_time = (2 ** attempt) + random.uniform(0, 1)
+            logger.debug(f"Retrying {symbol} in {wait_time:.2f} seconds (attempt {attempt + 1}/{max_retries})...")
+            await asyncio.sleep(wait_time)
+
+        await bucket.acquire()
+        try:
+            price = await asyncio.to_thread(_fetch_last_close, symbol)
+            if price is not None:
+                logger.info(f"{symbol}: Last price from Yahoo: {price:.2f} USD")
+                return price
+
+            logger.warning(f"No data available for {symbol}")
+            return None
+        except Exception as e:
+            logger.warning(f"Attempt {attempt + 1}/{max_retries} failed for {symbol}: {e}")
+
+    logger.error(f"All retries failed for {symbol}")
+    raise PriceFetchError(f"All retries failed for {symbol}", [symbol])
+
+
+async def get_multiple_prices_async(
+        symbols: list[str],
+        rate: float = YAHOO_RATE_LIMIT,
+        burst: int = YAHOO_RATE_BURST,
+        max_retries: int = YAHOO_MAX_RETRIES,
+        raise_errors: bool = False,
+) -> dict[str, float | None]:
+    """
+    Gets current prices for multiple assets concurrently under a token-bucket rate limit
+    shared with every other call using the same rate and burst.
+
+    Args:
+    ----
+        symbols: List of asset symbols.
+        rate: Maximum sustained requests per second.
+        burst: Number of requests that may be sent back to back.
+        max_retries: Maximum number of attempts per symbol.
+        raise_errors: Whether to raise when the requests of some symbols failed
+            instead of returning None for them.
+
+    Returns:
+    -------
+        Dictionary with symbols as keys and prices as values.
+
+    Raises:
+    ------
+        PriceFetchError: If some requests failed and raise_errors is set, with the other prices.
+    """
+    bucket = _get_bucket(rate, burst)
+    results = await asyncio.gather(
+        *(_fetch_price_with_retries(symbol, bucket, max_retries) for symbol in symbols),
+        return_exceptions=True,
+    )
+
+    try:
+        return _collect_prices(symbols, results)
+    except PriceFetchError as e:
+        if raise_errors:
+            raise
+        return e.prices
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from managers.alerts_manager import count_alerts_by_bucket, get_alerts_page
+from tests.database_case import TemporaryDatabaseTestCase
+
+
+class TestAlertsQueries(TemporaryDatabaseTestCase):
+    """
+    Test case for keyset-paginated and bucketed alert queries.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        start = datetime(2025, 1, 2, 10, 30)
+        rows = [
+            ("GC=F" if i % 2 else "SI=F", (start + timedelta(minutes=20 * (i // 2))).strftime('%Y-%m-%d %H:%M:%S.%f'),
+             f"alert {i}")
+            for i in range(10)
+        ]
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql("INSERT INTO alerts (symbol, date, message) VALUES (?, ?, ?)", rows)
+
+    def test_pages_cover_every_alert_once(self) -> None:
+        """
+        Ensures that following cursors returns every alert once, newest first, including date ties.
+        """
+        messages, cursor = [], None
+        while True:
+            page = get_alerts_page(cursor=cursor, limit=3)
+            self.assertLessEqual(len(page["alerts"]), 3)
+            messages += [alert["message"] for alert in page["alerts"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        self.assertEqual(messages, [f"alert {i}" for i in range(9, -1, -1)])
+
+    def test_filters_and_buckets(self) -> None:
+        """
+        Ensures that symbol and date filters apply to pages and hourly or daily counts.
+        """
+        page = get_alerts_page(since=datetime(2025, 1, 2, 11, tzinfo=timezone(timedelta(hours=1))),
+                               until=datetime(2025, 1, 2, 11, 30), symbol="GC=F")
+        self.assertEqual([alert["message"] for alert in page["alerts"]], ["alert 5", "alert 3", "alert 1"])
+        self.assertEqual(page["alerts"][0]["date"], "2025-01-02T11:10:00")
+
+        self.assertEqual(count_alerts_by_bucket("hour"), [
+            {"bucket": "2025-01-02T10:00", "count": 4},
+            {"bucket": "2025-01-02T11:00", "count": 6},
+        ])
+        self.assertEqual(count_alerts_by_bucket("day", symbol="SI=F"), [{"bucket": "2025-01-02T00:00", "count": 5}])
+
+    def test_legacy_date_only_alerts_are_bucketed(self) -> None:
+        """
+        Ensures that alerts stored with a date only are counted in their midnight bucket.
+        """
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql("INSERT INTO alerts (symbol, date, message) VALUES ('GC=F', '2025-01-01', 'legacy')")
+
+        self.assertEqual(count_alerts_by_bucket("hour")[0], {"bucket": "2025-01-01T00:00", "count": 1})
+        self.assertEqual(count_alerts_by_bucket("day")[0], {"bucket": "2025-01-01T00:00", "count": 1})
+
+    def test_pages_use_the_date_index(self) -> None:
+        """
+        Ensures that paging through a symbol's alerts is an index range scan without sorting.
+        """
+        with self.engine.connect() as conn:
+            plan = " ".join(str(row[-1]) for row in conn.execute(text("""
+                EXPLAIN QUERY PLAN SELECT id FROM alerts
+                WHERE symbol = 'GC=F' AND (date, id) < ('2025-01-02', 5)
+                ORDER BY date DESC, id DESC LIMIT 3
+            """)))
+        self.assertIn("ix_alerts_symbol_date", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
@@ -0,0 +1,79 @@
+from sqlalchemy import text
+
+from db.database import SessionLocal
+from managers.alerts_manager import evaluate_alerts, generate_alerts, get_recent_alerts, insert_alerts
+from managers.assets_manager import insert_price
+from tests.database_case import TemporaryDatabaseTestCase, days_ago
+
+
+class TestAlertsOnIngest(TemporaryDatabaseTestCase):
+    """
+    Test case for alert evaluation triggered by stored prices.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.insert_prices([
+            ("GC=F", days_ago(1), 100.0),
+            ("SI=F", days_ago(1), 30.0),
+            ("SI=F", days_ago(0), 40.0),
+        ])
+
+    def stored_alerts(self) -> list[tuple[str, str]]:
+        with self.engine.connect() as conn:
+            return [tuple(row) for row in conn.execute(text("SELECT symbol, message FROM alerts ORDER BY id"))]
+
+    def test_only_changed_assets_are_evaluated(self) -> None:
+        """
+        Ensures that storing a price alerts on its asset only, and small moves store no alerts.
+        """
+        with SessionLocal() as db:
+            insert_price(db, "GC=F", 101.0, days_ago(0))
+        self.assertEqual(self.stored_alerts(), [])
+
+        with SessionLocal() as db:
+            insert_price(db, "GC=F", 105.0, days_ago(0))
+        self.assertEqual(self.stored_alerts(), [
+            ("GC=F", "Daily increase of 5.00% exceeded the 2.0% threshold!"),
+        ])
+
+    def test_generate_alerts_evaluates_every_asset(self) -> None:
+        """
+        Ensures that a full evaluation alerts on assets whose prices were stored before it ran.
+        """
+        generate_alerts()
+
+        self.assertEqual([symbol for symbol, _ in self.stored_alerts()], ["SI=F"])
+
+    def test_repeated_evaluations_are_idempotent(self) -> None:
+        """
+        Ensures that an alert is stored once per asset, rule, horizon and price date however often it is evaluated.
+        """
+        stored = evaluate_alerts(["SI=F"])
+        self.assertEqual([(alert["rule"], alert["horizon"]) for alert in stored], [("default:increase", 1)])
+        # Keyed on the date of the prices evaluated, not on the day of the evaluation
+        self.assertEqual(stored[0]["as_of_date"], days_ago(0))
+
+        with SessionLocal() as db:
+            insert_price(db, "SI=F", 45.0, days_ago(0))
+        self.assertEqual(evaluate_alerts(["SI=F"]), [])
+        generate_alerts()
+
+        self.assertEqual(self.stored_alerts(), [
+            ("SI=F", "Daily increase of 33.33% exceeded the 2.0% threshold!"),
+        ])
+        self.assertEqual(len(get_recent_alerts()), 1)
+
+    def test_large_batches_are_stored(self) -> None:
+        """
+        Ensures that batches beyond the SQLite bound parameter limit are stored in one call.
+        """
+        alerts = [
+            {"symbol": "GC=F", "message": f"Alert {n}", "rule": "default", "horizon": 1, "as_of_date": f"d{n}"}
+            for n in range(10000)
+        ]
+        with SessionLocal() as db:
+            self.assertEqual(len(insert_alerts(db, alerts)), 10000)
+            self.assertEqual(insert_alerts(db, alerts[:10] + [dict(alerts[0], as_of_date="new")])[0]["as_of_date"], "new")
+
+        self.assertEqual(len(self.stored_alerts()), 10001)
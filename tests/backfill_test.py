@@ -0,0 +1,84 @@
+import json
+import os
+import tempfile
+
+from sqlalchemy import text
+
+from managers.backfill_manager import backfill_prices, backfill_symbol
+from services.price_providers import ReplayPriceProvider, set_price_provider
+from tests.database_case import TemporaryDatabaseTestCase
+
+
+class TestBackfill(TemporaryDatabaseTestCase):
+    """
+    Test case for the bulk historical backfill engine.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        fd, self.fixture_path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"GC=F": [["2025-05-27", 3300.0], ["2025-05-28", 3310.0], ["2025-05-29", 3320.0]]}, f)
+        set_price_provider(ReplayPriceProvider(self.fixture_path))
+
+    def tearDown(self) -> None:
+        set_price_provider(None)
+        os.remove(self.fixture_path)
+        super().tearDown()
+
+    def stored_prices(self) -> list[tuple]:
+        with self.engine.connect() as conn:
+            return conn.execute(text("SELECT date, price FROM assets ORDER BY date")).fetchall()
+
+    def test_backfill_fills_history(self) -> None:
+        """
+        Ensures that all history is written for an asset without stored prices.
+        """
+        self.assertEqual(backfill_symbol("GC=F"), 3)
+        self.assertEqual(
+            self.stored_prices(),
+            [("2025-05-27", 3300.0), ("2025-05-28", 3310.0), ("2025-05-29", 3320.0)],
+        )
+
+    def test_backfill_resumes_from_last_stored_date(self) -> None:
+        """
+        Ensures that only the last stored date onwards is fetched and that it is overwritten.
+        """
+        self.insert_prices([("GC=F", "2025-05-28", 1.0)])
+
+        self.assertEqual(backfill_symbol("GC=F"), 2)
+        self.assertEqual(
+            self.stored_prices(),
+            [("2025-05-28", 3310.0), ("2025-05-29", 3320.0)],
+        )
+
+    def test_backfill_summary_reports_symbols_without_history(self) -> None:
+        """
+        Ensures that assets with no upstream history are reported as failed.
+        """
+        result = backfill_prices(["GC=F", "ZW=F"])
+
+        self.assertEqual(result["rows_written"], 3)
+        self.assertEqual(result["failed_symbols"], ["ZW=F"])
+
+    def test_backfill_of_up_to_date_asset_succeeds(self) -> None:
+        """
+        Ensures that backfilling an asset whose history is already stored is not an error.
+        """
+        backfill_prices(["GC=F"])
+        result = backfill_prices(["GC=F"])
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["rows_written"], 0)
+        self.assertEqual(result["failed_symbols"], [])
+
+    def test_backfill_without_newer_history_succeeds(self) -> None:
+        """
+        Ensures that an asset with stored prices and no newer upstream history is up to date, not failed.
+        """
+        self.insert_prices([("GC=F", "2025-06-02", 3330.0)])
+
+        result = backfill_prices(["GC=F"])
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["failed_symbols"], [])
@@ -0,0 +1,66 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from services.yahoo_finance import get_batch_prices, get_multiple_prices_async
+
+
+class TestBatchPrices(unittest.TestCase):
+    """
+    Test case for splitting a multi-ticker Yahoo Finance download into per-symbol prices.
+    """
+
+    def test_batch_download_is_split_per_symbol(self) -> None:
+        """
+        Ensures that each symbol gets its last close and empty symbols are reported as missing.
+        """
+        index = pd.date_range("2025-05-28", periods=3, freq="D")
+        columns = pd.MultiIndex.from_product([["Close", "Open"], ["BTC-USD", "GC=F", "ZW=F"]],
+                                             names=["Price", "Ticker"])
+        data = pd.DataFrame(np.nan, index=index, columns=columns)
+        data[("Close", "BTC-USD")] = [100.0, 101.0, 102.0]
+        data[("Close", "GC=F")] = [2000.0, 2010.0, np.nan]
+
+        with patch("services.yahoo_finance.yf.download", return_value=data) as download:
+            prices, missing = get_batch_prices(["BTC-USD", "GC=F", "ZW=F"])
+
+        # A single upstream request is made for all symbols
+        download.assert_called_once()
+        self.assertEqual(prices, {"BTC-USD": 102.0, "GC=F": 2010.0, "ZW=F": None})
+        self.assertEqual(missing, ["ZW=F"])
+
+    def test_failed_download_reports_all_missing(self) -> None:
+        """
+        Ensures that a failed download reports every requested symbol as missing.
+        """
+        with patch("services.yahoo_finance.yf.download", side_effect=RuntimeError("boom")):
+            prices, missing = get_batch_prices(["GC=F", "SI=F"])
+
+        self.assertEqual(prices, {"GC=F": None, "SI=F": None})
+        self.assertEqual(missing, ["GC=F", "SI=F"])
+
+    def test_concurrent_calls_share_rate_limit(self) -> None:
+        """
+        Ensures that concurrent async fetches draw from one token bucket.
+        """
+        async def fetch_twice() -> float:
+            start = time.monotonic()
+            await asyncio.gather(
+                get_multiple_prices_async(["GC=F", "SI=F"], rate=20, burst=1),
+                get_multiple_prices_async(["BTC-USD", "ZW=F"], rate=20, burst=1),
+            )
+            return time.monotonic() - start
+
+        with patch("services.yahoo_finance._fetch_last_close", return_value=1.0):
+            elapsed = asyncio.run(fetch_twice())
+
+        # Four requests with a burst of one need three refills of 1/20 s
+        self.assertGreaterEqual(elapsed, 0.14)
+
+
+if __name__ == "__main__":
+    unittest.main()
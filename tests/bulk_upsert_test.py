@@ -0,0 +1,62 @@
+from unittest import mock
+
+from sqlalchemy import text
+
+from db.database import SessionLocal
+from managers.assets_manager import bulk_upsert_prices, insert_price
+from managers.rolling_stats import rolling_stats
+from tests.database_case import TemporaryDatabaseTestCase
+
+
+class TestBulkUpsert(TemporaryDatabaseTestCase):
+    """
+    Test case for the single-statement bulk UPSERT price writer.
+    """
+
+    def test_outcomes_per_row(self) -> None:
+        """
+        Ensures that each row reports whether it was inserted, updated or left unchanged.
+        """
+        self.insert_prices([("GC=F", "2025-05-30", 3300.0), ("SI=F", "2025-05-30", 33.0)])
+
+        with SessionLocal() as db:
+            outcomes = bulk_upsert_prices(db, [
+                ("GC=F", "2025-05-30", 3310.0),
+                ("SI=F", "2025-05-30", 33.0),
+                ("gc=f", "2025-05-31", 3320.0),
+            ])
+
+        self.assertEqual([outcome["status"] for outcome in outcomes], ["updated", "unchanged", "inserted"])
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(text("SELECT symbol, date, price FROM assets ORDER BY symbol, date")).fetchall()
+        self.assertEqual(rows, [
+            ("GC=F", "2025-05-30", 3310.0),
+            ("GC=F", "2025-05-31", 3320.0),
+            ("SI=F", "2025-05-30", 33.0),
+        ])
+
+    def test_insert_price_overwrites_same_day(self) -> None:
+        """
+        Ensures that storing a price twice on the same day keeps a single row.
+        """
+        with SessionLocal() as db:
+            self.assertTrue(insert_price(db, "BTC-USD", 100.0, "2025-05-31"))
+            self.assertTrue(insert_price(db, "BTC-USD", 101.0, "2025-05-31"))
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(text("SELECT price FROM assets WHERE symbol = 'BTC-USD'")).fetchall()
+        self.assertEqual(rows, [(101.0,)])
+
+    def test_failing_hook_after_commit(self) -> None:
+        """
+        Ensures that an error refreshing derived state neither reports committed rows as failed
+        nor skips the other refreshes.
+        """
+        with mock.patch("managers.candles_manager.invalidate_candles", side_effect=RuntimeError("boom")), \
+                mock.patch.object(rolling_stats, "on_price") as on_price:
+            with SessionLocal() as db:
+                outcomes = bulk_upsert_prices(db, [("GC=F", "2025-05-30", 3300.0)])
+
+        self.assertEqual([outcome["status"] for outcome in outcomes], ["inserted"])
+        on_price.assert_called_once_with("GC=F", "2025-05-30", 3300.0)
@@ -0,0 +1,58 @@
+from datetime import date
+from unittest import mock
+
+from db.database import SessionLocal
+from managers import candles_manager
+from managers.assets_manager import insert_price
+from managers.candles_manager import bucket_start, get_candles
+from tests.database_case import TemporaryDatabaseTestCase
+
+
+class TestCandles(TemporaryDatabaseTestCase):
+    """
+    Test case for OHLC candle aggregation.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.insert_prices([
+            ("GC=F", "2025-01-06", 10.0),
+            ("GC=F", "2025-01-08", 14.0),
+            ("GC=F", "2025-01-10", 8.0),
+            ("GC=F", "2025-01-12", 12.0),
+            ("GC=F", "2025-01-13", 20.0),
+            ("GC=F", "2025-04-01", 30.0),
+        ])
+
+    def test_buckets_match_sql(self) -> None:
+        """
+        Ensures that weekly, monthly and quarterly buckets aggregate open, high, low, close and count.
+        """
+        weekly = get_candles("GC=F", "1w")
+        self.assertEqual(weekly[0], {"start": "2025-01-06", "open": 10.0, "high": 14.0, "low": 8.0,
+                                     "close": 12.0, "count": 4})
+        self.assertEqual([candle["start"] for candle in weekly], ["2025-01-06", "2025-01-13", "2025-03-31"])
+
+        quarterly = get_candles("GC=F", "1q")
+        self.assertEqual([(candle["start"], candle["close"], candle["count"]) for candle in quarterly],
+                         [("2025-01-01", 20.0, 5), ("2025-04-01", 30.0, 1)])
+
+        for day in ("2025-01-06", "2025-01-12", "2025-04-01"):
+            for interval in ("1w", "1mo", "1q"):
+                bucket = bucket_start(date.fromisoformat(day), interval)
+                self.assertIn(bucket, [candle["start"] for candle in get_candles("GC=F", interval)])
+
+    def test_finished_buckets_are_cached(self) -> None:
+        """
+        Ensures that finished buckets are served from the cache until an earlier price is written.
+        """
+        get_candles("GC=F", "1mo")
+
+        with mock.patch.object(candles_manager, "_query_candles", return_value=[]) as query:
+            self.assertEqual(len(get_candles("GC=F", "1mo")), 2)
+            self.assertIsNotNone(query.call_args.args[2])
+
+        with SessionLocal() as db:
+            insert_price(db, "GC=F", 50.0, "2025-01-20")
+
+        self.assertEqual(get_candles("GC=F", "1mo")[0]["high"], 50.0)
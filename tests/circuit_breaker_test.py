@@ -0,0 +1,140 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from services.price_providers import GuardedPriceProvider, PriceFetchError, PriceProvider, YahooPriceProvider
+from utils.circuit_breaker import CircuitBreaker, NegativeCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingProvider(PriceProvider):
+    name = "counting"
+
+    def __init__(self, prices: dict) -> None:
+        self.prices = prices
+        self.errors = set()
+        self.calls = []
+
+    def get_current_price(self, symbol: str) -> float | None:
+        self.calls.append(symbol)
+        if symbol in self.errors:
+            raise PriceFetchError(f"{symbol} timed out", [symbol])
+        return self.prices.get(symbol)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """
+    Test case for the per-symbol circuit breaker and negative cache.
+    """
+
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.upstream = CountingProvider({"GC=F": 3300.0})
+        self.provider = GuardedPriceProvider(
+            self.upstream,
+            CircuitBreaker(failure_threshold=2, cooldown_seconds=300, clock=self.clock),
+            NegativeCache(ttl_seconds=60, clock=self.clock),
+        )
+
+    def test_negative_cache_skips_upstream(self) -> None:
+        """
+        Ensures that a symbol without data is not requested again until the cache expires.
+        """
+        self.assertIsNone(self.provider.get_current_price("ZW=F"))
+        self.assertIsNone(self.provider.get_current_price("ZW=F"))
+        self.assertEqual(self.upstream.calls, ["ZW=F"])
+
+        self.clock.now = 61
+        self.provider.get_current_price("ZW=F")
+        self.assertEqual(self.upstream.calls, ["ZW=F", "ZW=F"])
+
+    def test_circuit_opens_and_recovers(self) -> None:
+        """
+        Ensures that the circuit opens after repeated failures and closes after a successful trial.
+        """
+        self.provider.get_current_price("ZW=F")
+        self.clock.now = 61
+        self.provider.get_current_price("ZW=F")
+        self.assertTrue(self.provider.breaker.is_open("ZW=F"))
+
+        # Open circuit: no upstream calls even after the negative cache expires
+        self.clock.now = 200
+        self.assertIsNone(self.provider.get_current_price("ZW=F"))
+        self.assertEqual(len(self.upstream.calls), 2)
+
+        # After the cooldown a trial call goes through and closes the circuit
+        self.upstream.prices["ZW=F"] = 540.0
+        self.clock.now = 400
+        self.assertEqual(self.provider.get_current_price("ZW=F"), 540.0)
+        self.assertFalse(self.provider.breaker.is_open("ZW=F"))
+
+    def test_batch_only_requests_allowed_symbols(self) -> None:
+        """
+        Ensures that batched fetches skip symbols that are short-circuited.
+        """
+        self.provider.get_current_price("ZW=F")
+
+        prices, missing = self.provider.get_prices(["GC=F", "ZW=F"])
+
+        self.assertEqual(prices, {"GC=F": 3300.0, "ZW=F": None})
+        self.assertEqual(missing, ["ZW=F"])
+        self.assertEqual(self.upstream.calls, ["ZW=F", "GC=F"])
+
+    def test_failed_requests_are_not_negative_cached(self) -> None:
+        """
+        Ensures that a failed request is retried on the next call and only counts towards the circuit.
+        """
+        self.upstream.errors.add("GC=F")
+        self.assertIsNone(self.provider.get_current_price("GC=F"))
+        self.assertNotIn("GC=F", self.provider.negative_cache)
+
+        self.upstream.errors.clear()
+        self.assertEqual(self.provider.get_current_price("GC=F"), 3300.0)
+        self.assertEqual(self.upstream.calls, ["GC=F", "GC=F"])
+
+        self.upstream.errors.add("GC=F")
+        self.provider.get_current_price("GC=F")
+        self.provider.get_current_price("GC=F")
+        self.assertTrue(self.provider.breaker.is_open("GC=F"))
+
+    def test_batch_failures_keep_other_prices(self) -> None:
+        """
+        Ensures that a batch with failed requests returns the other prices and caches only missing data.
+        """
+        self.upstream.prices["SI=F"] = 33.0
+        self.upstream.errors.add("SI=F")
+
+        prices, missing = self.provider.get_prices(["GC=F", "SI=F", "ZW=F"])
+        async_prices = asyncio.run(self.provider.get_prices_async(["GC=F", "SI=F"]))
+
+        self.assertEqual(prices, {"GC=F": 3300.0, "SI=F": None, "ZW=F": None})
+        self.assertEqual(missing, ["SI=F", "ZW=F"])
+        self.assertEqual(async_prices, {"GC=F": 3300.0, "SI=F": None})
+        self.assertNotIn("SI=F", self.provider.negative_cache)
+        self.assertIn("ZW=F", self.provider.negative_cache)
+
+    def test_failed_yahoo_download_is_an_error(self) -> None:
+        """
+        Ensures that a failed Yahoo Finance download is reported as an error, not as missing data.
+        """
+        provider = GuardedPriceProvider(
+            YahooPriceProvider(),
+            CircuitBreaker(failure_threshold=2, cooldown_seconds=300, clock=self.clock),
+            NegativeCache(ttl_seconds=60, clock=self.clock),
+        )
+        with patch("services.yahoo_finance.yf.download", side_effect=RuntimeError("boom")):
+            prices, missing = provider.get_prices(["GC=F"])
+
+        self.assertEqual(missing, ["GC=F"])
+        self.assertNotIn("GC=F", provider.negative_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
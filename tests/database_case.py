@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from sqlalchemy import create_engine
+
+from db.database import Base, SessionLocal
+from db.migrations import run_migrations
+from managers import snapshots_manager
+from managers.candles_manager import clear_candles
+from managers.price_cache import price_cache
+from managers.price_matrix import invalidate_price_matrix
+from managers.rolling_stats import rolling_stats
+from managers.rules_manager import invalidate_rule_index
+
+
+def days_ago(days: int) -> str:
+    """
+    Returns the date (YYYY-MM-DD) of the given number of days before today.
+    """
+    return (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+
+
+class TemporaryDatabaseTestCase(unittest.TestCase):
+    """
+    Base test case that binds the application sessions to a temporary SQLite database.
+    """
+
+    def setUp(self) -> None:
+        fd, self.database_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.engine = create_engine(f"sqlite:///{self.database_path}")
+        Base.metadata.create_all(bind=self.engine)
+        run_migrations(self.engine)
+
+        self.snapshot_dir = tempfile.mkdtemp()
+        self._snapshot_patch = mock.patch.object(snapshots_manager, "SNAPSHOT_DIR", self.snapshot_dir)
+        self._snapshot_patch.start()
+
+        self._original_bind = SessionLocal.kw["bind"]
+        SessionLocal.configure(bind=self.engine)
+        price_cache.clear()
+        invalidate_price_matrix()
+        rolling_stats.clear()
+        clear_candles()
+        invalidate_rule_index()
+
+    def tearDown(self) -> None:
+        price_cache.clear()
+        invalidate_price_matrix()
+        rolling_stats.clear()
+        clear_candles()
+        invalidate_rule_index()
+        SessionLocal.configure(bind=self._original_bind)
+        self.engine.dispose()
+        os.remove(self.database_path)
+        self._snapshot_patch.stop()
+        shutil.rmtree(self.snapshot_dir)
+
+    def insert_prices(self, rows: list[tuple[str, str, float]]) -> None:
+        """
+        Inserts (symbol, date, price) rows directly into the assets table.
+        """
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql("INSERT INTO assets (symbol, date, price) VALUES (?, ?, ?)", rows)
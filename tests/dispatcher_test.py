@@ -0,0 +1,90 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bot.dispatcher import TelegramDispatcher, dispatch_alerts
+
+
+class FakeTelegramHandler(BaseHTTPRequestHandler):
+    """
+    Minimal Bot API sendMessage endpoint that rate-limits the first request to chat '429'.
+    """
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, body))
+            limited = body["chat_id"] == "429" and not server.limited
+            server.limited = server.limited or limited
+
+        if limited:
+            status, payload = 429, {"ok": False, "error_code": 429, "parameters": {"retry_after": 1}}
+        elif body["chat_id"] == "400":
+            status, payload = 400, {"ok": False, "error_code": 400, "description": "Bad Request: chat not found"}
+        else:
+            status, payload = 200, {"ok": True, "result": {"message_id": len(server.requests)}}
+
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+class TestTelegramDispatcher(unittest.TestCase):
+    """
+    Test case for the Telegram dispatcher against a local fake Bot API server.
+    """
+
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeTelegramHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.limited = False
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.dispatcher = TelegramDispatcher(
+            "TOKEN", api_base=f"http://127.0.0.1:{self.server.server_port}", batch_seconds=0.05,
+        )
+        self.dispatcher.start()
+
+    def tearDown(self) -> None:
+        self.dispatcher.stop()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_batches_messages_per_chat(self) -> None:
+        """
+        Ensures that the messages of a chat are sent as one message and each chat gets its own.
+        """
+        dispatched = dispatch_alerts([
+            {"symbol": "GC=F", "message": "first", "owner": "chat:1"},
+            {"symbol": "SI=F", "message": "second", "owner": "chat:1"},
+            {"symbol": "GC=F", "message": "third", "owner": "chat:2"},
+            {"symbol": "GC=F", "message": "api", "owner": "api:abc"},
+        ], self.dispatcher)
+        self.dispatcher.flush(5)
+
+        self.assertEqual(dispatched, 3)
+        sent = sorted((body["chat_id"], body["text"]) for _, body in self.server.requests)
+        self.assertEqual(sent, [("1", "Gold (GC=F): first\n\nSilver (SI=F): second"), ("2", "Gold (GC=F): third")])
+        self.assertTrue(all(path == "/botTOKEN/sendMessage" for path, _ in self.server.requests))
+
+    def test_retries_after_rate_limit(self) -> None:
+        """
+        Ensures that rate limited messages are resent after retry_after and rejected ones are not retried.
+        """
+        self.dispatcher.send(429, "limited")
+        self.dispatcher.send(400, "rejected")
+        self.dispatcher.flush(5)
+
+        chats = [body["chat_id"] for _, body in self.server.requests]
+        self.assertEqual(chats.count("429"), 2)
+        self.assertEqual(chats.count("400"), 1)
+        self.assertEqual((self.dispatcher.sent, self.dispatcher.failed), (1, 1))
@@ -0,0 +1,93 @@
+import json
+from unittest import mock
+
+from sqlalchemy import event
+
+from db.database import SessionLocal
+from managers import export_manager
+from managers.assets_manager import insert_price
+from managers.export_manager import iter_price_history
+from tests.database_case import TemporaryDatabaseTestCase
+
+
+class TestHistoryExport(TemporaryDatabaseTestCase):
+    """
+    Test case for the streaming history export.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.insert_prices([
+            ("SI=F", "2025-01-02", 30.0),
+            ("GC=F", "2025-01-03", 11.0),
+            ("GC=F", "2025-01-02", 10.0),
+            ("BTC-USD", "2025-01-02", 90000.0),
+        ])
+
+    def test_csv_is_streamed_in_partitions(self) -> None:
+        """
+        Ensures that CSV rows are ordered by symbol and date and sent one partition per chunk.
+        """
+        with mock.patch.object(export_manager, "EXPORT_CHUNK_ROWS", 2):
+            chunks = list(iter_price_history(["GC=F", "SI=F"]))
+
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual("".join(chunks).splitlines(), [
+            "symbol,date,price",
+            "GC=F,2025-01-02,10.0",
+            "GC=F,2025-01-03,11.0",
+            "SI=F,2025-01-02,30.0",
+        ])
+
+    def test_prices_written_while_streaming(self) -> None:
+        """
+        Ensures that a paused export does not block price writes, and resumes after the last row sent.
+        """
+        with mock.patch.object(export_manager, "EXPORT_CHUNK_ROWS", 2):
+            chunks = iter_price_history()
+            self.assertEqual(next(chunks), "symbol,date,price\n")
+            self.assertEqual(next(chunks), "BTC-USD,2025-01-02,90000.0\nGC=F,2025-01-02,10.0\n")
+
+            with SessionLocal() as db:
+                self.assertTrue(insert_price(db, "GC=F", 12.0, "2025-01-06"))
+
+            rest = "".join(chunks).splitlines()
+
+        self.assertEqual(rest, ["GC=F,2025-01-03,11.0", "GC=F,2025-01-06,12.0", "SI=F,2025-01-02,30.0"])
+
+    def test_chunks_seek_the_index(self) -> None:
+        """
+        Ensures that every chunk query, with and without filters, seeks the (symbol, date) index.
+        """
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany) -> None:
+            if statement.lstrip().startswith("SELECT symbol, date, price"):
+                statements.append((statement, parameters))
+
+        event.listen(self.engine, "before_cursor_execute", capture)
+        try:
+            with mock.patch.object(export_manager, "EXPORT_CHUNK_ROWS", 1):
+                every = "".join(iter_price_history(start="2025-01-03"))
+                list(iter_price_history(["GC=F", "SI=F"], start="2025-01-01"))
+        finally:
+            event.remove(self.engine, "before_cursor_execute", capture)
+
+        self.assertEqual(every.splitlines()[1:], ["GC=F,2025-01-03,11.0"])
+        self.assertGreater(len(statements), 4)
+        with self.engine.connect() as conn:
+            for statement, parameters in statements[1:]:
+                plan = " ".join(str(row[-1]) for row in conn.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                ).fetchall())
+                self.assertIn("SEARCH assets USING", plan)
+
+    def test_ndjson_date_range(self) -> None:
+        """
+        Ensures that NDJSON rows are filtered by date range across every stored asset.
+        """
+        lines = "".join(iter_price_history(start="2025-01-02", end="2025-01-02", export_format="ndjson"))
+        rows = [json.loads(line) for line in lines.splitlines()]
+
+        self.assertEqual([row["symbol"] for row in rows], ["BTC-USD", "GC=F", "SI=F"])
+        self.assertEqual(rows[1], {"symbol": "GC=F", "date": "2025-01-02", "price": 10.0})
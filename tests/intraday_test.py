@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from db.database import SessionLocal
+from managers.assets_manager import update_single_price
+from managers.intraday_manager import get_intraday_prices, record_intraday_prices, rollup_intraday_prices
+from tests.database_case import TemporaryDatabaseTestCase
+
+
+class TestIntradayPrices(TemporaryDatabaseTestCase):
+    """
+    Test case for the intraday timestamped price series.
+    """
+
+    def test_range_query_uses_primary_key(self) -> None:
+        """
+        Ensures that range queries by symbol and time are answered from the clustered primary key.
+        """
+        with SessionLocal() as db:
+            record_intraday_prices(db, [("BTC-USD", 1000 + i * 60, 100.0 + i) for i in range(10)])
+
+        prices = get_intraday_prices("BTC-USD", 1060, 1180)
+        self.assertEqual([price["price"] for price in prices], [101.0, 102.0, 103.0])
+
+        with self.engine.connect() as conn:
+            plan = conn.execute(text(
+                "EXPLAIN QUERY PLAN SELECT ts, price FROM intraday_prices "
+                "WHERE symbol = 'BTC-USD' AND ts BETWEEN 1060 AND 1180 ORDER BY ts"
+            )).fetchall()
+        self.assertIn("PRIMARY KEY", " ".join(str(row[-1]) for row in plan))
+
+    def test_single_price_updates_are_recorded(self) -> None:
+        """
+        Ensures that prices stored one at a time on forced updates also reach the intraday series.
+        """
+        today = datetime.now().strftime('%Y-%m-%d')
+        self.assertTrue(update_single_price("GC=F", 3300.0, today))
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(text("SELECT symbol, price FROM intraday_prices")).fetchall()
+            daily = conn.execute(text("SELECT symbol, date, price FROM assets")).fetchall()
+        self.assertEqual(rows, [("GC=F", 3300.0)])
+        self.assertEqual(daily, [("GC=F", today, 3300.0)])
+
+    def test_rollup_keeps_last_price_of_each_day(self) -> None:
+        """
+        Ensures that intraday data past the retention window becomes daily closes and is deleted.
+        """
+        old_day = (datetime.now() - timedelta(days=10)).replace(hour=9, minute=0, second=0, microsecond=0)
+        recent = datetime.now().replace(hour=0, minute=0, second=1, microsecond=0)
+
+        with SessionLocal() as db:
+            record_intraday_prices(db, [
+                ("BTC-USD", int(old_day.timestamp()), 100.0),
+                ("BTC-USD", int((old_day + timedelta(hours=12)).timestamp()), 105.0),
+                ("BTC-USD", int(recent.timestamp()), 110.0),
+            ])
+
+        result = rollup_intraday_prices(retention_days=7)
+        self.assertEqual((result["daily_closes"], result["deleted_rows"]), (1, 2))
+
+        with self.engine.connect() as conn:
+            daily = conn.execute(text("SELECT date, price FROM assets")).fetchall()
+            remaining = conn.execute(text("SELECT price FROM intraday_prices")).fetchall()
+
+        self.assertEqual(daily, [(old_day.strftime('%Y-%m-%d'), 105.0)])
+        self.assertEqual(remaining, [(110.0,)])
+
+    def test_rollup_keeps_stored_daily_closes(self) -> None:
+        """
+        Ensures that the rollup does not overwrite a daily close that was already stored, e.g. by a backfill.
+        """
+        old_day = (datetime.now() - timedelta(days=10)).replace(hour=9, minute=0, second=0, microsecond=0)
+        other_day = old_day - timedelta(days=1)
+        self.insert_prices([("BTC-USD", old_day.strftime('%Y-%m-%d'), 104.0)])
+
+        with SessionLocal() as db:
+            record_intraday_prices(db, [
+                ("BTC-USD", int(other_day.timestamp()), 99.0),
+                ("BTC-USD", int(old_day.timestamp()), 100.0),
+                ("BTC-USD", int((old_day + timedelta(hours=12)).timestamp()), 105.0),
+            ])
+
+        result = rollup_intraday_prices(retention_days=7)
+        self.assertEqual((result["daily_closes"], result["deleted_rows"]), (1, 3))
+
+        with self.engine.connect() as conn:
+            daily = conn.execute(text("SELECT date, price FROM assets ORDER BY date")).fetchall()
+            remaining = conn.execute(text("SELECT COUNT(*) FROM intraday_prices")).scalar()
+
+        self.assertEqual(daily, [(other_day.strftime('%Y-%m-%d'), 99.0), (old_day.strftime('%Y-%m-%d'), 104.0)])
+        self.assertEqual(remaining, 0)
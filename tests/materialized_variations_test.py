@@ -0,0 +1,86 @@
+from sqlalchemy import text
+
+from db.database import SessionLocal
+from managers.assets_manager import calculate_variations_multi, insert_price
+from managers.variations_manager import get_materialized_variations, rebuild_variations
+from tests.database_case import TemporaryDatabaseTestCase, days_ago
+
+
+class TestMaterializedVariations(TemporaryDatabaseTestCase):
+    """
+    Test case for the materialized variations table.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.insert_prices([
+            ("GC=F", days_ago(40), 100.0),
+            ("GC=F", days_ago(8), 200.0),
+            ("GC=F", days_ago(1), 300.0),
+        ])
+
+    def stored_variation(self, symbol: str, horizon: int) -> tuple | None:
+        with self.engine.connect() as conn:
+            return conn.execute(
+                text("SELECT as_of_date, base_price, variation FROM variations WHERE symbol = :symbol AND horizon = :horizon"),
+                {"symbol": symbol, "horizon": horizon},
+            ).fetchone()
+
+    def test_ingest_refreshes_variations(self) -> None:
+        """
+        Ensures that storing a price refreshes the variations of that asset in the same transaction.
+        """
+        with SessionLocal() as db:
+            insert_price(db, "GC=F", 330.0, days_ago(0))
+
+        self.assertEqual(self.stored_variation("GC=F", 1)[:2], (days_ago(0), 300.0))
+        self.assertAlmostEqual(self.stored_variation("GC=F", 1)[2], 10.0)
+        self.assertAlmostEqual(self.stored_variation("GC=F", 30)[2], 230.0)
+
+    def test_reads_match_computed_variations(self) -> None:
+        """
+        Ensures that materialized reads, including never materialized assets, match the computation.
+        """
+        assets = ["GC=F", "ZW=F"]
+        materialized = get_materialized_variations(assets, [1, 7, 30, 3])
+        computed = calculate_variations_multi(assets, [1, 7, 30, 3])
+
+        for days in (1, 7, 30, 3):
+            self.assertEqual(
+                [(item["symbol"], item["variation"] is None) for item in materialized[days]],
+                [(item["symbol"], item["variation"] is None) for item in computed[days]],
+            )
+            for got, want in zip(materialized[days], computed[days]):
+                if want["variation"] is not None:
+                    self.assertAlmostEqual(got["variation"], want["variation"])
+
+    def test_stale_reads_do_not_write(self) -> None:
+        """
+        Ensures that missing horizons, outdated rows and assets without prices are computed, not stored.
+        """
+        rebuild_variations()
+        with self.engine.begin() as conn:
+            conn.execute(text("DELETE FROM variations WHERE horizon = 7"))
+            conn.execute(text("UPDATE variations SET variation = 1.5 WHERE horizon = 1"))
+            conn.execute(text("UPDATE variations SET as_of_date = :day, variation = 2.5 WHERE horizon = 30"),
+                         {"day": days_ago(1)})
+
+        variations = get_materialized_variations(["GC=F", "ZW=F"], [1, 7, 30])
+
+        self.assertEqual(variations[1][0]["variation"], 1.5)
+        self.assertAlmostEqual(variations[7][0]["variation"], 50.0)
+        self.assertAlmostEqual(variations[30][0]["variation"], 200.0)
+        self.assertEqual([item["variation"] for item in variations[1][1:]], [None])
+        self.assertIsNone(self.stored_variation("GC=F", 7))
+        self.assertIsNone(self.stored_variation("ZW=F", 1))
+        self.assertEqual(self.stored_variation("GC=F", 30)[0], days_ago(1))
+
+    def test_rebuild(self) -> None:
+        """
+        Ensures that a rebuild materializes every stored asset and horizon.
+        """
+        result = rebuild_variations()
+
+        self.assertEqual(result["total_assets"], 1)
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.execute(text("SELECT COUNT(*) FROM variations")).scalar(), 3)
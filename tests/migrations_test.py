@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine
+
+from db.database import Base
+from db.migrations import MIGRATIONS, get_schema_version, run_migrations
+
+# Schema of the database files created before the ORM models declared their indexes
+LEGACY_SCHEMA = [
+    "CREATE TABLE assets (id INTEGER PRIMARY KEY AUTOINCREMENT, symbol VARCHAR NOT NULL, "
+    "date DATE NOT NULL, price FLOAT NOT NULL)",
+    "CREATE TABLE alerts (id INTEGER PRIMARY KEY AUTOINCREMENT, symbol VARCHAR NOT NULL, "
+    "date DATE NOT NULL, message VARCHAR NOT NULL)",
+]
+
+
+class TestMigrations(unittest.TestCase):
+    """
+    Test case for the schema migration runner.
+    """
+
+    def setUp(self) -> None:
+        fd, self.database_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.engine = create_engine(f"sqlite:///{self.database_path}")
+
+    def tearDown(self) -> None:
+        self.engine.dispose()
+        os.remove(self.database_path)
+
+    def index_names(self, table: str) -> set[str]:
+        with self.engine.connect() as conn:
+            return {row[1] for row in conn.exec_driver_sql(f"PRAGMA index_list('{table}')").fetchall()}
+
+    def test_upgrades_legacy_database(self) -> None:
+        """
+        Ensures that a legacy file is deduplicated and indexed in place, and that the upgrade is idempotent.
+        """
+        with self.engine.begin() as conn:
+            for statement in LEGACY_SCHEMA:
+                conn.exec_driver_sql(statement)
+            conn.exec_driver_sql(
+                "INSERT INTO assets (symbol, date, price) VALUES (?, ?, ?)",
+                [("GC=F", "2025-01-02", 1.0), ("GC=F", "2025-01-02", 2.0), ("GC=F", "2025-01-03", 3.0)],
+            )
+            conn.exec_driver_sql(
+                "INSERT INTO alerts (symbol, date, message) VALUES (?, ?, ?)",
+                [("GC=F", "2025-02-18", "legacy"), ("GC=F", "2025-02-18 09:30:00", "legacy"),
+                 ("GC=F", "2025-02-18 10:00:00.250000", "current")],
+            )
+
+        self.assertEqual(run_migrations(self.engine), len(MIGRATIONS))
+        self.assertEqual(run_migrations(self.engine), len(MIGRATIONS))
+        self.assertEqual(get_schema_version(self.engine), len(MIGRATIONS))
+
+        self.assertTrue({"uq_assets_symbol_date", "ix_assets_symbol_date_price"} <= self.index_names("assets"))
+        self.assertTrue({"ix_alerts_date", "uq_alerts_dedupe"} <= self.index_names("alerts"))
+        with self.engine.connect() as conn:
+            rows = conn.exec_driver_sql("SELECT date, price FROM assets ORDER BY date").fetchall()
+        self.assertEqual([tuple(row) for row in rows], [("2025-01-02", 2.0), ("2025-01-03", 3.0)])
+
+        # Legacy date-only alerts are compared in the same format as current ones
+        with self.engine.connect() as conn:
+            dates = [row[0] for row in conn.exec_driver_sql(
+                "SELECT date FROM alerts WHERE date >= '2025-02-18 00:00:00.000000' ORDER BY date"
+            ).fetchall()]
+        self.assertEqual(dates, ["2025-02-18 00:00:00.000000", "2025-02-18 09:30:00.000000",
+                                 "2025-02-18 10:00:00.250000"])
+
+    def test_latest_price_uses_covering_index(self) -> None:
+        """
+        Ensures that latest price lookups on a fresh database are answered from the covering index.
+        """
+        Base.metadata.create_all(bind=self.engine)
+        run_migrations(self.engine)
+
+        with self.engine.connect() as conn:
+            plan = " ".join(str(row[-1]) for row in conn.exec_driver_sql(
+                "EXPLAIN QUERY PLAN SELECT price FROM assets WHERE symbol = 'GC=F' ORDER BY date DESC LIMIT 1"
+            ).fetchall())
+        self.assertIn("COVERING INDEX ix_assets_symbol_date_price", plan)
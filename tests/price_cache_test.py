@@ -0,0 +1,59 @@
+from db.database import SessionLocal
+from managers.assets_manager import get_current_price_db, get_price_by_date, insert_price
+from managers.price_cache import PriceCache, price_cache
+from tests.database_case import TemporaryDatabaseTestCase, days_ago
+
+
+class TestPriceCache(TemporaryDatabaseTestCase):
+    """
+    Test case for the in-memory latest-price and history cache.
+    """
+
+    def test_reads_are_cached_and_invalidated_on_write(self) -> None:
+        """
+        Ensures that repeated reads hit the cache and that storing a price invalidates it.
+        """
+        self.insert_prices([("GC=F", days_ago(2), 3300.0), ("GC=F", days_ago(1), 3310.0)])
+        initial = price_cache.stats()
+
+        self.assertEqual(get_current_price_db("GC=F"), 3310.0)
+        with SessionLocal() as db:
+            self.assertEqual(get_price_by_date(db, "GC=F", days_ago(2)), 3300.0)
+        self.assertEqual(price_cache.stats()["misses"] - initial["misses"], 1)
+        self.assertEqual(price_cache.stats()["hits"] - initial["hits"], 1)
+
+        with SessionLocal() as db:
+            insert_price(db, "GC=F", 3320.0, days_ago(0))
+
+        self.assertEqual(get_current_price_db("GC=F"), 3320.0)
+        self.assertEqual(price_cache.stats()["misses"] - initial["misses"], 2)
+
+    def test_dates_before_cached_window_use_database(self) -> None:
+        """
+        Ensures that as-of lookups older than the cached history fall back to the database.
+        """
+        self.insert_prices([("SI=F", days_ago(400), 25.0), ("SI=F", days_ago(1), 33.0)])
+
+        with SessionLocal() as db:
+            self.assertEqual(get_price_by_date(db, "SI=F", days_ago(300)), 25.0)
+            self.assertEqual(get_price_by_date(db, "SI=F", days_ago(10)), 25.0)
+            self.assertIsNone(get_price_by_date(db, "SI=F", days_ago(500)))
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        """
+        Ensures that the cache keeps at most max_symbols entries.
+        """
+        self.insert_prices([("GC=F", days_ago(1), 1.0), ("SI=F", days_ago(1), 2.0), ("ZW=F", days_ago(1), 3.0)])
+        cache = PriceCache(max_symbols=2, history_days=30)
+
+        cache.get_latest("GC=F")
+        cache.get_latest("SI=F")
+        cache.get_latest("GC=F")
+        cache.get_latest("ZW=F")
+
+        stats = cache.stats()
+        self.assertEqual((stats["size"], stats["evictions"]), (2, 1))
+
+        # SI=F was the least recently used and must be loaded again
+        cache.get_latest("SI=F")
+        self.assertEqual(cache.stats()["misses"], 4)
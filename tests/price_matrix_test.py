@@ -0,0 +1,133 @@
+import time
+from datetime import datetime, timedelta
+from unittest import mock
+
+import numpy as np
+
+from managers import price_matrix
+from managers.assets_manager import calculate_variations_multi
+from managers.price_matrix import (
+    PriceMatrix,
+    calculate_correlations,
+    calculate_variations_range,
+    calculate_variations_vectorized,
+    invalidate_price_matrix,
+)
+from tests.database_case import TemporaryDatabaseTestCase, days_ago
+
+
+class TestPriceMatrix(TemporaryDatabaseTestCase):
+    """
+    Test case for the NumPy price matrix engine.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.insert_prices([
+            ("GC=F", days_ago(40), 100.0),
+            ("GC=F", days_ago(8), 200.0),
+            ("GC=F", days_ago(1), 150.0),
+            ("GC=F", days_ago(0), 180.0),
+            ("SI=F", days_ago(3), 30.0),
+            ("BTC-USD", days_ago(2), 90000.0),
+        ])
+
+    def test_matches_sql_variations(self) -> None:
+        """
+        Ensures that vectorized variations match the SQL as-of computation.
+        """
+        assets = ["GC=F", "SI=F", "BTC-USD", "ZW=F"]
+        horizons = [1, 2, 7, 30, 365]
+
+        vectorized = calculate_variations_vectorized(assets, horizons)
+        expected = calculate_variations_multi(assets, horizons)
+
+        for days in horizons:
+            for got, want in zip(vectorized[days], expected[days]):
+                self.assertEqual(got["symbol"], want["symbol"])
+                if want["variation"] is None:
+                    self.assertIsNone(got["variation"])
+                else:
+                    self.assertAlmostEqual(got["variation"], want["variation"])
+
+    def test_drawdowns_and_log_returns(self) -> None:
+        """
+        Ensures that drawdowns are measured from the running peak and log returns from as-of prices.
+        """
+        matrix = PriceMatrix.load()
+        row = matrix.row("GC=F")
+
+        drawdowns = matrix.drawdowns()
+        self.assertAlmostEqual(drawdowns["current"][row], -10.0)
+        self.assertAlmostEqual(drawdowns["max"][row], -25.0)
+        self.assertAlmostEqual(matrix.log_returns([30])[row, 0], np.log(1.8))
+
+    def test_thousands_of_symbols(self) -> None:
+        """
+        Ensures that variations for thousands of symbols and several horizons are computed quickly.
+        """
+        rng = np.random.default_rng(0)
+        dates = np.arange(np.datetime64(days_ago(1000)), np.datetime64(days_ago(0)) + 1)
+        symbols = np.repeat(np.arange(2000).astype(str), len(dates))
+        matrix = PriceMatrix.from_rows(
+            symbols, np.tile(dates, 2000), rng.uniform(10, 100, size=len(symbols))
+        )
+
+        start = time.perf_counter()
+        variations = matrix.variations([1, 7, 30, 90, 365])
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(variations.shape, (2000, 5))
+        self.assertLess(elapsed, 0.05)
+
+    def test_variations_range(self) -> None:
+        """
+        Ensures that horizons are measured back from the end date and the range between both dates.
+        """
+        end = datetime.now().date() - timedelta(days=1)
+        start = datetime.now().date() - timedelta(days=30)
+
+        result = calculate_variations_range(["GC=F", "SI=F", "ZW=F"], [7, 365], start, end)
+
+        self.assertEqual(result["GC=F"]["price"], 150.0)
+        self.assertAlmostEqual(result["GC=F"]["variations"][7], -25.0)
+        self.assertIsNone(result["GC=F"]["variations"][365])
+        self.assertAlmostEqual(result["GC=F"]["range"], 50.0)
+        self.assertIsNone(result["SI=F"]["range"])
+        self.assertEqual(result["ZW=F"], {"price": None, "variations": {7: None, 365: None}, "range": None})
+
+    def test_correlations(self) -> None:
+        """
+        Ensures that correlations use returns aligned on common dates and are cached until prices change.
+        """
+        wheat = [10.0, 11.0, 10.5, 12.0, 11.0]
+        self.insert_prices(
+            [("ZW=F", days_ago(6 - day), price) for day, price in enumerate(wheat)]
+            + [("CL=F", days_ago(6 - day), price * 3) for day, price in enumerate(wheat)]
+            + [("CL=F", days_ago(0), 40.0)]
+        )
+        invalidate_price_matrix()
+
+        with mock.patch.object(PriceMatrix, "aligned_returns", autospec=True,
+                               side_effect=PriceMatrix.aligned_returns) as aligned:
+            result = calculate_correlations(["ZW=F", "CL=F", "HG=F"], 10)
+            self.assertEqual(calculate_correlations(["ZW=F", "CL=F", "HG=F"], 10), result)
+            self.assertEqual(aligned.call_count, 1)
+
+        self.assertEqual(result["observations"], 4)
+        self.assertAlmostEqual(result["correlation"]["ZW=F"]["CL=F"], 1.0)
+        self.assertAlmostEqual(result["covariance"]["CL=F"]["CL=F"], result["covariance"]["ZW=F"]["ZW=F"])
+        self.assertIsNone(result["correlation"]["HG=F"]["ZW=F"])
+
+    def test_correlation_cache_is_bounded(self) -> None:
+        """
+        Ensures that only the most recently used correlation results are kept.
+        """
+        self.insert_prices([("ZW=F", days_ago(day), 10.0 + day) for day in range(5)])
+        invalidate_price_matrix()
+
+        with mock.patch.object(price_matrix, "CORRELATION_CACHE_SIZE", 2):
+            for days in (10, 20, 10, 30):
+                calculate_correlations(["ZW=F"], days)
+
+        self.assertEqual([key[0] for key in price_matrix._correlations], [10, 30])
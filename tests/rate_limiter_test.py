@@ -0,0 +1,46 @@
+import asyncio
+import time
+import unittest
+
+from utils.rate_limiter import TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+    """
+    Test case for the asyncio token-bucket rate limiter.
+    """
+
+    def test_burst_then_rate_limited(self) -> None:
+        """
+        Ensures that a burst is served immediately and further acquisitions follow the rate.
+        """
+        async def acquire_all() -> list[float]:
+            bucket = TokenBucket(rate=20, burst=3)
+            start = time.monotonic()
+            times = []
+
+            async def task() -> None:
+                await bucket.acquire()
+                times.append(time.monotonic() - start)
+
+            await asyncio.gather(*(task() for _ in range(5)))
+            return sorted(times)
+
+        times = asyncio.run(acquire_all())
+
+        # The first three tokens are available at once, the remaining two need 1/20 s each
+        self.assertLess(times[2], 0.04)
+        self.assertGreaterEqual(times[4], 0.09)
+
+    def test_invalid_configuration(self) -> None:
+        """
+        Ensures that non-positive rates and bursts are rejected.
+        """
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=1, burst=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
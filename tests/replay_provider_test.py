@@ -0,0 +1,85 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from services.price_providers import GuardedPriceProvider, PriceFetchError, ReplayPriceProvider
+from utils.circuit_breaker import CircuitBreaker, NegativeCache
+
+
+class TestReplayPriceProvider(unittest.TestCase):
+    """
+    Test case for serving recorded quotes from a fixture file.
+    """
+
+    def setUp(self) -> None:
+        fd, self.fixture_path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"GC=F": [["2025-05-30", 3300.0], ["2025-05-31", 3310.5]], "BTC-USD": [104000.0]}, f)
+
+    def tearDown(self) -> None:
+        os.remove(self.fixture_path)
+
+    def test_series_is_replayed_in_order(self) -> None:
+        """
+        Ensures that recorded prices are served in order, wrapping around at the end.
+        """
+        provider = ReplayPriceProvider(self.fixture_path)
+
+        self.assertEqual(
+            [provider.get_current_price("GC=F") for _ in range(3)],
+            [3300.0, 3310.5, 3300.0],
+        )
+        self.assertIsNone(provider.get_current_price("ZW=F"))
+
+    def test_failures_are_deterministic(self) -> None:
+        """
+        Ensures that the same seed reproduces the same failures.
+        """
+        def run() -> list:
+            provider = ReplayPriceProvider(self.fixture_path, failure_rate=0.5, seed=7)
+            outcomes = []
+            for _ in range(20):
+                try:
+                    outcomes.append(provider.get_current_price("BTC-USD"))
+                except PriceFetchError:
+                    outcomes.append("failed")
+            return outcomes
+
+        first = run()
+        self.assertEqual(first, run())
+        self.assertIn("failed", first)
+        self.assertIn(104000.0, first)
+
+    def test_failures_reach_the_circuit_breaker(self) -> None:
+        """
+        Ensures that simulated failures open the circuit of a guarded provider without being negative-cached.
+        """
+        provider = GuardedPriceProvider(
+            ReplayPriceProvider(self.fixture_path, failure_rate=1),
+            CircuitBreaker(failure_threshold=2, cooldown_seconds=300),
+            NegativeCache(ttl_seconds=60),
+        )
+
+        self.assertEqual(provider.get_prices(["BTC-USD"]), ({"BTC-USD": None}, ["BTC-USD"]))
+        self.assertIsNone(asyncio.run(provider.get_prices_async(["BTC-USD"]))["BTC-USD"])
+
+        self.assertTrue(provider.breaker.is_open("BTC-USD"))
+        self.assertNotIn("BTC-USD", provider.negative_cache)
+
+    def test_async_prices(self) -> None:
+        """
+        Ensures that concurrent fetches return one price per symbol and report missing ones.
+        """
+        provider = ReplayPriceProvider(self.fixture_path, latency_ms=5)
+
+        prices = asyncio.run(provider.get_prices_async(["GC=F", "BTC-USD"]))
+        self.assertEqual(prices, {"GC=F": 3300.0, "BTC-USD": 104000.0})
+
+        _, missing = provider.get_prices(["GC=F", "ZW=F"])
+        self.assertEqual(missing, ["ZW=F"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import math
+import unittest
+from datetime import date, timedelta
+
+import numpy as np
+
+from db.database import SessionLocal
+from managers.assets_manager import insert_price
+from managers.rolling_stats import RollingWindow, rolling_stats
+from tests.database_case import TemporaryDatabaseTestCase
+
+
+class TestRollingWindow(unittest.TestCase):
+    """
+    Test case for the incrementally maintained rolling window.
+    """
+
+    def test_matches_full_recomputation(self) -> None:
+        """
+        Ensures that incremental statistics match a recomputation over the window, including
+        evictions and same-day replacements.
+        """
+        rng = np.random.default_rng(1)
+        window = RollingWindow(7)
+        history = []
+        previous = None
+
+        for day in range(30):
+            if day % 6 == 5:
+                continue  # Gaps in the series
+            price = float(rng.uniform(90, 110))
+            log_return = math.log(price / previous) if previous else None
+            window.push(day, price, log_return)
+            history.append((day, price, log_return))
+            previous = price
+
+        # Correct the latest day, as a new intraday price would
+        day, _, _ = history[-1]
+        before_last = history[-2][1]
+        window.replace_last(80.0, math.log(80.0 / before_last))
+        history[-1] = (day, 80.0, math.log(80.0 / before_last))
+
+        in_window = [entry for entry in history if entry[0] > day - 7]
+        prices = np.array([entry[1] for entry in in_window])
+        returns = np.array([entry[2] for entry in in_window])
+        stats = window.stats()
+
+        self.assertEqual(stats["count"], len(in_window))
+        self.assertAlmostEqual(stats["mean"], prices.mean())
+        self.assertAlmostEqual(stats["std"], prices.std(ddof=1))
+        self.assertAlmostEqual(stats["volatility"], returns.std(ddof=1) * math.sqrt(252) * 100)
+        self.assertEqual((stats["min"], stats["max"]), (prices.min(), prices.max()))
+
+    def test_repeated_replacements_keep_extremes(self) -> None:
+        """
+        Ensures that the extremes stay exact when the latest price moves up and down repeatedly.
+        """
+        rng = np.random.default_rng(2)
+        window = RollingWindow(5)
+        prices = {}
+
+        for day in range(40):
+            for refresh in range(4):
+                price = float(rng.uniform(90, 110))
+                if refresh:
+                    window.replace_last(price, None)
+                else:
+                    window.push(day, price, None)
+                prices[day] = price
+
+                in_window = [value for entry_day, value in prices.items() if entry_day > day - 5]
+                stats = window.stats()
+                self.assertEqual((stats["min"], stats["max"]), (min(in_window), max(in_window)))
+
+
+class TestRollingStatsTracker(TemporaryDatabaseTestCase):
+    """
+    Test case for keeping rolling statistics in line with stored prices.
+    """
+
+    def test_stored_prices_update_statistics(self) -> None:
+        """
+        Ensures that prices stored after the first load update the windows incrementally.
+        """
+        today = date.today()
+        self.insert_prices([
+            ("GC=F", (today - timedelta(days=2)).isoformat(), 100.0),
+            ("GC=F", (today - timedelta(days=1)).isoformat(), 110.0),
+        ])
+
+        self.assertEqual(rolling_stats.get_stats("GC=F")[7]["max"], 110.0)
+
+        with SessionLocal() as db:
+            insert_price(db, "GC=F", 120.0, today.isoformat())
+
+        stats = rolling_stats.get_stats("GC=F")[7]
+        self.assertEqual(stats["count"], 3)
+        self.assertAlmostEqual(stats["mean"], 110.0)
+        self.assertEqual(stats["max"], 120.0)
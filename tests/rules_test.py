@@ -0,0 +1,77 @@
+import random
+import time
+
+from managers.alerts_manager import evaluate_alerts
+from managers.rules_manager import RuleIndex, add_rule, delete_rule, get_rule_index, list_rules
+from tests.database_case import TemporaryDatabaseTestCase, days_ago
+
+
+class TestAlertRules(TemporaryDatabaseTestCase):
+    """
+    Test case for the subscribed alert rules and their threshold index.
+    """
+
+    def test_index_matches_by_binary_search(self) -> None:
+        """
+        Ensures that a variation triggers exactly the rules of its direction with lower thresholds.
+        """
+        rules = [
+            {"rule": f"rule:{i}", "symbol": "GC=F", "horizon": 7, "direction": direction, "threshold": threshold}
+            for i, (direction, threshold) in enumerate([("increase", 1.0), ("increase", 3.0), ("increase", 5.0),
+                                                        ("decrease", 2.0)])
+        ]
+        index = RuleIndex(rules)
+
+        self.assertEqual([rule["rule"] for rule in index.match("GC=F", 7, 3.5)], ["rule:0", "rule:1"])
+        self.assertEqual([rule["rule"] for rule in index.match("GC=F", 7, 3.0)], ["rule:0"])
+        self.assertEqual([rule["rule"] for rule in index.match("GC=F", 7, -2.5)], ["rule:3"])
+        self.assertEqual(index.match("GC=F", 1, 10.0), [])
+
+    def test_matching_many_rules_is_fast(self) -> None:
+        """
+        Ensures that matching against tens of thousands of rules finds the same rules as a full
+        scan without scanning them.
+        """
+        rng = random.Random(0)
+        rules = [
+            {"rule": f"rule:{i}", "symbol": "GC=F", "horizon": 1, "direction": "increase",
+             "threshold": rng.uniform(0, 100)}
+            for i in range(50000)
+        ]
+        index = RuleIndex(rules)
+
+        for variation in (0.5, 3.0, -3.0):
+            expected = {rule["rule"] for rule in rules if variation > 0 and rule["threshold"] < variation}
+            self.assertEqual({rule["rule"] for rule in index.match("GC=F", 1, variation)}, expected)
+
+        # A full scan of 50000 rules takes milliseconds per match, so this bound is generous
+        start = time.perf_counter()
+        for _ in range(1000):
+            index.match("GC=F", 1, 0.5)
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_subscribed_rules_trigger_owner_alerts(self) -> None:
+        """
+        Ensures that subscribed rules trigger alerts for their owner and stop once unsubscribed.
+        """
+        self.insert_prices([("GC=F", days_ago(9), 100.0), ("GC=F", days_ago(0), 101.0)])
+        rule = add_rule("chat:1", "gc=f", 7, "up", 0.5)
+        other = add_rule("chat:2", "GC=F", 7, "down", 0.5)
+        self.assertEqual([item["id"] for item in list_rules("chat:1")], [rule["id"]])
+        self.assertFalse(delete_rule("chat:1", other["id"]))
+
+        stored = evaluate_alerts(["GC=F"])
+        self.assertEqual([(alert["rule"], alert["owner"]) for alert in stored], [(f"rule:{rule['id']}", "chat:1")])
+
+        self.assertTrue(delete_rule("chat:1", rule["id"]))
+        self.assertEqual(get_rule_index().horizons("GC=F"), {1, 7, 30})
+        self.assertEqual(list_rules("chat:1"), [])
+
+    def test_invalid_rules_are_rejected(self) -> None:
+        """
+        Ensures that rules on untracked symbols or with invalid parameters raise ValueError.
+        """
+        for args in (("AAPL", 7, "up", 1.0), ("GC=F", 0, "up", 1.0), ("GC=F", 7, "sideways", 1.0),
+                     ("GC=F", 7, "up", -1.0)):
+            with self.assertRaises(ValueError):
+                add_rule("chat:1", *args)
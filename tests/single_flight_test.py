@@ -0,0 +1,72 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from utils.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    """
+    Test case for coalescing concurrent calls with the same key.
+    """
+
+    def test_concurrent_threads_share_one_call(self) -> None:
+        """
+        Ensures that concurrent callers from several threads run the work once and share its result.
+        """
+        flight = SingleFlight()
+        calls = []
+        results = []
+
+        def work() -> dict:
+            calls.append(1)
+            time.sleep(0.1)
+            return {"updated_successfully": 5}
+
+        threads = [threading.Thread(target=lambda: results.append(flight.do("refresh", work))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(result is results[0] for result in results))
+
+        # A later call starts a new flight
+        flight.do("refresh", work)
+        self.assertEqual(len(calls), 2)
+
+    def test_async_caller_joins_thread_call(self) -> None:
+        """
+        Ensures that an asyncio caller joins a call running in another thread, including its exception.
+        """
+        flight = SingleFlight()
+        started = threading.Event()
+
+        def failing_work() -> None:
+            started.set()
+            time.sleep(0.1)
+            raise RuntimeError("upstream down")
+
+        def run_in_thread() -> None:
+            try:
+                flight.do("refresh", failing_work)
+            except RuntimeError:
+                pass
+
+        thread = threading.Thread(target=run_in_thread)
+        thread.start()
+        started.wait()
+
+        async def never_called() -> None:
+            raise AssertionError("The in-flight call should have been joined")
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(flight.do_async("refresh", never_called))
+        thread.join()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import threading
+from unittest import mock
+
+import numpy as np
+
+from db.database import SessionLocal
+from managers.assets_manager import bulk_upsert_prices, insert_price
+from managers.price_matrix import PriceMatrix
+from managers import snapshots_manager
+from managers.snapshots_manager import export_snapshots, load_snapshot, update_snapshots
+from tests.database_case import TemporaryDatabaseTestCase
+
+
+class TestSnapshots(TemporaryDatabaseTestCase):
+    """
+    Test case for the memory-mapped price history snapshots.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.insert_prices([
+            ("GC=F", "2025-01-02", 10.0),
+            ("GC=F", "2025-01-03", 11.0),
+            ("SI=F", "2025-01-03", 30.0),
+        ])
+
+    def test_export_and_memory_map(self) -> None:
+        """
+        Ensures that exported snapshots are memory-mapped int32 days and float64 prices.
+        """
+        self.assertEqual(export_snapshots()["total_prices"], 3)
+
+        days, prices = load_snapshot("GC=F")
+        self.assertIsInstance(days, np.memmap)
+        self.assertEqual(days.dtype, np.int32)
+        self.assertEqual(prices.dtype, np.float64)
+        self.assertEqual(list(days.astype("datetime64[D]").astype(str)), ["2025-01-02", "2025-01-03"])
+        self.assertIsNone(load_snapshot("BTC-USD"))
+
+    def test_incremental_updates(self) -> None:
+        """
+        Ensures that appended and corrected prices reach the snapshots and the price matrix loads them.
+        """
+        export_snapshots()
+        with SessionLocal() as db:
+            insert_price(db, "GC=F", 12.0, "2025-01-06")
+            bulk_upsert_prices(db, [("SI=F", "2025-01-02", 29.0), ("SI=F", "2025-01-03", 31.0)])
+
+        self.assertEqual(list(load_snapshot("GC=F")[1]), [10.0, 11.0, 12.0])
+        self.assertEqual(list(load_snapshot("SI=F")[1]), [29.0, 31.0])
+
+        # Only visible in the matrix if it was read from the snapshots
+        days, prices = load_snapshot("GC=F")
+        snapshots_manager._write_snapshot("GC=F", np.array(days), np.array([10.0, 11.0, 13.0]))
+        matrix = PriceMatrix.load()
+        self.assertEqual(matrix.latest_prices()[matrix.row("GC=F")], 13.0)
+
+    def test_same_day_refresh_is_incremental(self) -> None:
+        """
+        Ensures that refreshing the last day's price does not reload the history from the database.
+        """
+        export_snapshots()
+        with mock.patch.object(snapshots_manager, "write_snapshot", side_effect=AssertionError("reloaded")):
+            update_snapshots({("GC=F", "2025-01-03"): 11.5})
+            self.assertEqual(list(load_snapshot("GC=F")[1]), [10.0, 11.5])
+
+            update_snapshots({("GC=F", "2025-01-03"): 11.8, ("GC=F", "2025-01-06"): 12.0})
+            days, prices = load_snapshot("GC=F")
+            self.assertEqual(list(days.astype("datetime64[D]").astype(str)), ["2025-01-02", "2025-01-03", "2025-01-06"])
+            self.assertEqual(list(prices), [10.0, 11.8, 12.0])
+
+    def test_stale_snapshots_fall_back_to_database(self) -> None:
+        """
+        Ensures that prices written without updating the snapshots are read from the database.
+        """
+        export_snapshots()
+        # Written directly, so the snapshot of GC=F misses it
+        self.insert_prices([("GC=F", "2025-01-07", 99.0)])
+
+        matrix = PriceMatrix.load()
+        self.assertEqual(matrix.latest_prices()[matrix.row("GC=F")], 99.0)
+
+    def test_failed_update_removes_snapshot(self) -> None:
+        """
+        Ensures that a snapshot which could not be updated is removed instead of left stale.
+        """
+        export_snapshots()
+        with mock.patch.object(snapshots_manager, "_write_snapshot", side_effect=OSError("disk full")):
+            update_snapshots({("GC=F", "2025-01-06"): 12.0})
+
+        self.assertIsNone(load_snapshot("GC=F"))
+        self.assertIsNotNone(load_snapshot("SI=F"))
+
+    def test_concurrent_updates(self) -> None:
+        """
+        Ensures that concurrent appends to one snapshot are all kept.
+        """
+        export_snapshots()
+        days = [f"2025-02-{day:02d}" for day in range(1, 21)]
+        self.insert_prices([("GC=F", day, 20.0) for day in days])
+
+        threads = [
+            threading.Thread(target=update_snapshots, args=({("GC=F", day): 20.0},))
+            for day in days
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(load_snapshot("GC=F")[0]), 22)
+        leftovers = [name for name in os.listdir(snapshots_manager.SNAPSHOT_DIR) if name.endswith(".tmp")]
+        self.assertEqual(leftovers, [])
@@ -0,0 +1,50 @@
+from managers.assets_manager import calculate_variations, calculate_variations_multi, get_asset_prices_and_variations
+from tests.database_case import TemporaryDatabaseTestCase, days_ago
+
+
+class TestVariations(TemporaryDatabaseTestCase):
+    """
+    Test case for computing variations over several horizons in one query.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.insert_prices([
+            ("GC=F", days_ago(40), 100.0),
+            ("GC=F", days_ago(8), 200.0),
+            ("GC=F", days_ago(1), 300.0),
+            ("GC=F", days_ago(0), 330.0),
+            ("SI=F", days_ago(3), 30.0),
+        ])
+
+    def test_multiple_horizons(self) -> None:
+        """
+        Ensures that each horizon uses the last price on or before its past date.
+        """
+        variations = calculate_variations_multi(["GC=F", "SI=F", "ZW=F"], [1, 7, 30])
+
+        self.assertAlmostEqual(variations[1][0]["variation"], 10.0)
+        self.assertAlmostEqual(variations[7][0]["variation"], 65.0)
+        self.assertAlmostEqual(variations[30][0]["variation"], 230.0)
+        self.assertAlmostEqual(variations[1][1]["variation"], 0.0)
+        self.assertIsNone(variations[7][1]["variation"])
+        self.assertEqual(variations[30][2], {"symbol": "ZW=F", "variation": None})
+
+    def test_single_horizon_shape_is_unchanged(self) -> None:
+        """
+        Ensures that calculate_variations keeps returning one entry per requested symbol.
+        """
+        self.assertEqual(
+            [item["symbol"] for item in calculate_variations(["SI=F", "GC=F"], 7)],
+            ["SI=F", "GC=F"],
+        )
+
+    def test_prices_and_variations_summary(self) -> None:
+        """
+        Ensures that the summary reports current prices and every horizon.
+        """
+        result = get_asset_prices_and_variations()
+
+        self.assertEqual(result["current_prices"], {"GC=F": 330.0, "SI=F": 30.0})
+        self.assertAlmostEqual(result["weekly_variations"]["GC=F"], 65.0)
+        self.assertIsNone(result["monthly_variations"]["BTC-USD"])
@@ -0,0 +1,150 @@
+"""
+Circuit breaker module.
+
+This module provides a per-key circuit breaker and a short-lived negative cache, used to
+stop calling an upstream service for keys that keep failing or have no data.
+"""
+
+import threading
+import time
+from typing import Callable
+
+
+class CircuitBreaker:
+    """
+    Per-key circuit breaker.
+
+    A key's circuit opens after `failure_threshold` consecutive failures and rejects
+    calls for `cooldown_seconds`. After the cooldown a single trial call is allowed:
+    a success closes the circuit, a failure opens it again.
+
+    Attributes:
+    ----------
+        failure_threshold: Consecutive failures that open the circuit.
+        cooldown_seconds: Time the circuit stays open before a trial call.
+    """
+
+    def __init__(self, failure_threshold: int, cooldown_seconds: float,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._clock = clock
+        self._failures: dict[str, int] = {}
+        self._opened_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key: str) -> bool:
+        """
+        Checks whether a call for the key may go through.
+
+        Args:
+        ----
+            key: Circuit key.
+
+        Returns:
+        -------
+            True if the circuit is closed or ready for a trial call, False if it is open.
+        """
+        with self._lock:
+            opened_at = self._opened_at.get(key)
+            if opened_at is None:
+                return True
+
+            if self._clock() - opened_at >= self.cooldown_seconds:
+                # Half-open: let one trial call through and keep others out until it reports back
+                self._opened_at[key] = self._clock()
+                return True
+
+            return False
+
+    def record_success(self, key: str) -> None:
+        """
+        Records a successful call, closing the circuit.
+
+        Args:
+        ----
+            key: Circuit key.
+        """
+        with self._lock:
+            self._failures.pop(key, None)
+            self._opened_at.pop(key, None)
+
+    def record_failure(self, key: str) -> None:
+        """
+        Records a failed call, opening the circuit when the threshold is reached.
+
+        Args:
+        ----
+            key: Circuit key.
+        """
+        with self._lock:
+            failures = self._failures.get(key, 0) + 1
+            self._failures[key] = failures
+            if failures >= self.failure_threshold:
+                self._opened_at[key] = self._clock()
+
+    def is_open(self, key: str) -> bool:
+        """
+        Checks whether the circuit for the key is currently open.
+
+        Args:
+        ----
+            key: Circuit key.
+
+        Returns:
+        -------
+            True if calls for the key are being rejected.
+        """
+        with self._lock:
+            opened_at = self._opened_at.get(key)
+            return opened_at is not None and self._clock() - opened_at < self.cooldown_seconds
+
+
+class NegativeCache:
+    """
+    Remembers keys with no data for a short time.
+
+    Attributes:
+    ----------
+        ttl_seconds: How long a key is remembered.
+    """
+
+    def __init__(self, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._expires_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, key: str) -> None:
+        """
+        Remembers that the key has no data.
+
+        Args:
+        ----
+            key: Cache key.
+        """
+        with self._lock:
+            self._expires_at[key] = self._clock() + self.ttl_seconds
+
+    def discard(self, key: str) -> None:
+        """
+        Forgets the key.
+
+        Args:
+        ----
+            key: Cache key.
+        """
+        with self._lock:
+            self._expires_at.pop(key, None)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            expires_at = self._expires_at.get(key)
+            if expires_at is None:
+                return False
+
+            if self._clock() >= expires_at:
+                del self._expires_at[key]
+                return False
+
+            return True
@@ -0,0 +1,55 @@
+"""
+Rate limiting module.
+
+This module provides a token-bucket limiter for asyncio tasks that share an upstream quota.
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter for asyncio code.
+
+    Tokens are refilled continuously at `rate` tokens per second up to `burst`.
+    Each call to `acquire` consumes one token, waiting only as long as needed
+    for the next token to become available.
+
+    Attributes:
+    ----------
+        rate: Tokens added per second.
+        burst: Maximum number of tokens that can accumulate.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("Rate must be greater than zero")
+        if burst < 1:
+            raise ValueError("Burst must be at least 1")
+
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        """
+        Waits until a token is available and consumes it.
+
+        Returns:
+        -------
+            None
+        """
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
@@ -0,0 +1,102 @@
+"""
+Single-flight module.
+
+This module coalesces concurrent calls for the same key into one execution whose result
+is shared by every caller, across threads and asyncio event loops.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Hashable
+
+from loguru import logger
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key.
+
+    The first caller for a key runs the work; callers arriving while it is in flight
+    wait for it and receive the same result (or exception). Once the call completes,
+    the next caller starts a new one.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key: Hashable) -> tuple[Future, bool]:
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _finish(self, key: Hashable, future: Future, result: Any = None, error: BaseException | None = None) -> None:
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Runs `fn` unless a call for the same key is already in flight, in which case
+        it waits for that call and returns its result.
+
+        Args:
+        ----
+            key: Identifier of the work.
+            fn: Function performing the work.
+
+        Returns:
+        -------
+            Result of the shared call.
+        """
+        future, leader = self._join(key)
+        if not leader:
+            logger.info(f"Joining in-flight call for {key}")
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+
+        self._finish(key, future, result)
+        return result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Awaits `fn()` unless a call for the same key is already in flight (from any
+        thread or event loop), in which case it waits for that call and returns its result.
+
+        Args:
+        ----
+            key: Identifier of the work.
+            fn: Coroutine function performing the work.
+
+        Returns:
+        -------
+            Result of the shared call.
+        """
+        future, leader = self._join(key)
+        if not leader:
+            logger.info(f"Joining in-flight call for {key}")
+            return await asyncio.wrap_future(future)
+
+        try:
+            result = await fn()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+
+        self._finish(key, future, result)
+        return result